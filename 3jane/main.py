@@ -19,6 +19,7 @@ from utils.chains import Chain
 from utils.formatting import format_usd
 from utils.logging import get_logger
 from utils.telegram import send_telegram_message
+from utils.timeseries import record_metrics
 from utils.web3_wrapper import ChainManager
 
 PROTOCOL = "3jane"
@@ -335,6 +336,16 @@ def main() -> None:
         check_vault_shutdown(client, usd3_vault, susd3_vault)
         check_debt_cap(client)
 
+        # Keep history for rate-of-change checks beyond the previous run
+        record_metrics(
+            [
+                (CACHE_KEY_USD3_PPS, usd3_pps),
+                (CACHE_KEY_SUSD3_PPS, susd3_pps),
+                (CACHE_KEY_USD3_TVL, usd3_tvl),
+                (CACHE_KEY_SUSD3_TVL, susd3_tvl),
+            ]
+        )
+
         logger.info(
             "Monitoring complete — USD3 PPS: %.8f, TVL: %s | sUSD3 PPS: %.8f, TVL: %s",
             usd3_pps,
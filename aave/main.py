@@ -6,7 +6,7 @@ when thresholds are exceeded.
 """
 
 from utils.abi import load_abi
-from utils.alert import Alert, AlertSeverity, send_alert
+from utils.alert import Alert, AlertFingerprint, AlertSeverity, alert_digest, resolve_alert, send_alert
 from utils.chains import Chain
 from utils.logging import get_logger
 from utils.web3_wrapper import ChainManager
@@ -52,9 +52,12 @@ THRESHOLD_UR = 0.99
 
 
 def print_stuff(chain_name: str, token_name: str, ur: float) -> None:
+    fingerprint = AlertFingerprint(PROTOCOL, "utilization", f"{chain_name}+{token_name}")
     if ur > THRESHOLD_UR:
         message = f"**BEEP BOP**\n💎 Market asset: {token_name}\n📊 Utilization rate: {ur:.2%}\n🌐 Chain: {chain_name}"
-        send_alert(Alert(AlertSeverity.LOW, message, PROTOCOL))
+        send_alert(Alert(AlertSeverity.LOW, message, PROTOCOL), fingerprint=fingerprint)
+    else:
+        resolve_alert(fingerprint, f"{token_name} utilization on {chain_name} back to {ur:.2%}")
 
 
 def process_assets(chain: Chain) -> None:
@@ -90,12 +93,14 @@ def process_assets(chain: Chain) -> None:
 
 
 def main() -> None:
-    for chain in [Chain.MAINNET]:
-        logger.info("Processing %s assets...", chain.name)
-        try:
-            process_assets(chain)
-        except Exception as e:
-            logger.error("Error processing %s: %s", chain.name, e)
+    # One digest per run instead of one message per market above the UR threshold
+    with alert_digest():
+        for chain in [Chain.MAINNET]:
+            logger.info("Processing %s assets...", chain.name)
+            try:
+                process_assets(chain)
+            except Exception as e:
+                logger.error("Error processing %s: %s", chain.name, e)
 
 
 if __name__ == "__main__":
@@ -4,7 +4,7 @@ from datetime import datetime
 import requests
 
 from utils.cache import get_last_queued_id_from_file, write_last_queued_id_to_file
-from utils.http import request_with_retry
+from utils.graphql import GraphQLError, get_graphql_client
 from utils.logging import get_logger
 from utils.telegram import send_telegram_message
 
@@ -12,43 +12,19 @@ PROTOCOL = "aave"
 logger = get_logger(PROTOCOL)
 
 
-def run_query(query: str, variables: dict) -> dict | None:
-    """Run a GraphQL query against The Graph API with retry logic.
+SUBGRAPH_URL = "https://gateway-arbitrum.network.thegraph.com/api/{api_key}/subgraphs/id/A7QMszgomC9cnnfpAcqZVLr2DffvkGNfimD8iUSMiurK"
 
-    Args:
-        query: The GraphQL query string.
-        variables: Variables for the GraphQL query.
 
-    Returns:
-        Parsed JSON response dict, or None on failure.
-    """
-    api_key = os.getenv("GRAPH_API_KEY")
-    subgraph_id = "A7QMszgomC9cnnfpAcqZVLr2DffvkGNfimD8iUSMiurK"
-    url = f"https://gateway-arbitrum.network.thegraph.com/api/{api_key}/subgraphs/id/{subgraph_id}"
-    request_body = {"query": query, "variables": variables}
-
-    try:
-        response = request_with_retry("post", url, json=request_body)
-    except requests.RequestException as e:
-        logger.error("Graph API query failed after retries: %s", e)
-        send_telegram_message(f"Graph API query failed after retries: {e}", PROTOCOL, True)
-        return None
-
-    data = response.json()
-    if "errors" in data:
-        logger.error("GraphQL error in response: %s", data["errors"])
-        send_telegram_message(f"GraphQL error in response: {data['errors']}", PROTOCOL, True)
-        return None
-
-    return data
+def fetch_queued_proposals(last_reported_id: int) -> list[dict]:
+    """Fetch proposals queued after ``last_reported_id``, ordered by proposal id.
 
-
-def fetch_queued_proposals(last_reported_id: int):
+    Sends a telegram message and returns an empty list if the query fails.
+    """
     # state: 3 is queued state: https://github.com/bgd-labs/aave-governance-v3/blob/0c14d60ac89d7a9f79d0a1f77de5c99c3ba1201f/src/interfaces/IGovernanceCore.sol#L75
     # queued state is transferred to active state when it's executed, few seconds later so we need to check state 4
     query = """
-        query($lastId: Int!) {
-            proposals(where:{state:4, proposalId_gt:$lastId}) {
+        query($first: Int!, $lastId: Int!) {
+            proposals(first: $first, where:{state:4, proposalId_gt:$lastId}, orderBy: proposalId, orderDirection: asc) {
                 proposalId
                 proposalMetadata{
                     title
@@ -62,14 +38,24 @@ def fetch_queued_proposals(last_reported_id: int):
         }
     """
 
-    # get only last 10 proposals
-    variables = {"lastId": last_reported_id}
-    response = run_query(query, variables)
-    if response is None:
-        return []
-
-    proposals = response["data"]["proposals"]
-    return proposals
+    client = get_graphql_client(SUBGRAPH_URL.format(api_key=os.getenv("GRAPH_API_KEY")), name="aave-governance")
+    try:
+        return list(
+            client.paginate(
+                query,
+                "proposals",
+                {"lastId": last_reported_id},
+                cursor_field="proposalId",
+                cursor_variable="lastId",
+            )
+        )
+    except GraphQLError as e:
+        logger.error("GraphQL error in response: %s", e.errors)
+        send_telegram_message(f"GraphQL error in response: {e.errors}", PROTOCOL, True)
+    except (requests.RequestException, ValueError) as e:
+        logger.error("Graph API query failed after retries: %s", e)
+        send_telegram_message(f"Graph API query failed after retries: {e}", PROTOCOL, True)
+    return []
 
 
 def handle_governance_proposals():
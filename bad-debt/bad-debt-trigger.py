@@ -1,9 +1,9 @@
 import datetime
+import heapq
 import locale
 import os
 
-import requests
-
+from utils.http import get_session, stream_json_items
 from utils.logging import get_logger
 
 logger = get_logger("bad-debt")
@@ -11,14 +11,24 @@ logger = get_logger("bad-debt")
 locale.setlocale(locale.LC_ALL, "en_US.UTF-8")
 
 
+TOP_ACCOUNTS = 5
+
+
+def fetch_data(url: str) -> dict:
+    """Fetch the bad debt report, keeping only the accounts with the most bad debt.
+
+    The report lists every user, so ``users`` is streamed and reduced to the
+    ``TOP_ACCOUNTS`` most negative ``badDebt`` entries instead of loading it whole.
+    """
+    fields: dict = {}
+    users = stream_json_items(url, "users", fields)
+    top_users = heapq.nsmallest(TOP_ACCOUNTS, users, key=lambda x: int(x["badDebt"]))
+    return {**fields, "users": top_users}
+
+
 def get_data():
     url = os.environ["DATA_URL"]
-    response = requests.get(url)
-
-    if response.status_code == 200:
-        data = response.json()
-    else:
-        raise Exception(f"Failed to get data: {response.status_code} - {response.text}")
+    data = fetch_data(url)
 
     total_bad_debt = int(data["total"]) * -1
     decimals = int(data["decimals"])
@@ -66,7 +76,7 @@ def send_telegram_message(message):
     chat_id = os.getenv("BAD_DEBT_TELEGRAM_CHAT_ID")
     url = f"https://api.telegram.org/bot{bot_token}/sendMessage"
     params = {"chat_id": chat_id, "text": message}
-    response = requests.get(url, params=params)
+    response = get_session().get(url, params=params)
     if response.status_code != 200:
         raise Exception(f"Failed to send telegram message: {response.status_code} - {response.text}")
 
@@ -75,7 +85,7 @@ def accounts_with_bad_debt(data) -> str:
     # Sort users by bad debt (most negative first)
     sorted_users = sorted(data["users"], key=lambda x: int(x["badDebt"]))
     # Get top 5 accounts (or all if less than 5)
-    top_accounts = sorted_users[:5]
+    top_accounts = sorted_users[:TOP_ACCOUNTS]
     decimals = int(data["decimals"])
 
     # Format the message
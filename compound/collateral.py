@@ -13,7 +13,7 @@ For each Compound V3 market:
 Sends Telegram alerts when thresholds are exceeded.
 """
 
-from dataclasses import dataclass
+from dataclasses import asdict, dataclass
 
 from utils.abi import load_abi
 from utils.assets import (
@@ -25,6 +25,7 @@ from utils.assets import (
 from utils.chains import Chain
 from utils.formatting import format_usd
 from utils.logging import get_logger
+from utils.snapshots import record_snapshot
 from utils.telegram import send_telegram_message
 from utils.web3_wrapper import ChainManager, Web3Client
 
@@ -208,8 +209,20 @@ def _fetch_markets_data(chain: Chain) -> list[MarketData]:
     return [_fetch_single_market(client, address, name, risk_level) for address, name, risk_level in markets]
 
 
-def _analyze_market(market: MarketData) -> list[str]:
-    """Analyze a single market's collateral risk. Returns list of alert messages."""
+def _analyze_market(
+    market: MarketData,
+    allocation_tiers: dict[int, float] | None = None,
+    max_risk_thresholds: dict[int, float] | None = None,
+) -> list[str]:
+    """Analyze a single market's collateral risk. Returns list of alert messages.
+
+    ``allocation_tiers`` and ``max_risk_thresholds`` override the defaults from
+    ``utils.assets`` so candidate thresholds can be replayed without sending alerts.
+    """
+    if allocation_tiers is None:
+        allocation_tiers = ALLOCATION_TIERS
+    if max_risk_thresholds is None:
+        max_risk_thresholds = MAX_RISK_THRESHOLDS
     alerts: list[str] = []
     total_collateral_usd = market.total_collateral_usd
     base_usd_price = market.base_usd_price
@@ -239,7 +252,7 @@ def _analyze_market(market: MarketData) -> list[str]:
             unknown_assets.append(c.symbol)
 
         allocation_ratio = c.base_value / total_collateral_base
-        allocation_threshold = get_market_allocation_threshold(asset_risk_tier, market.risk_level)
+        allocation_threshold = get_market_allocation_threshold(asset_risk_tier, market.risk_level, allocation_tiers)
 
         if allocation_ratio > allocation_threshold:
             alerts.append(
@@ -254,7 +267,7 @@ def _analyze_market(market: MarketData) -> list[str]:
         logger.debug("%s | %s | %s", c.symbol, format_usd(c_usd), f"{allocation_ratio:.1%}")
 
     # Check total risk level
-    max_risk = MAX_RISK_THRESHOLDS.get(market.risk_level, MAX_RISK_THRESHOLDS[max(ALLOCATION_TIERS.keys())])
+    max_risk = max_risk_thresholds.get(market.risk_level, max_risk_thresholds[max(allocation_tiers.keys())])
     if total_risk_level > max_risk:
         alerts.append(
             f"🔺 High total risk level detected in market {market.name}:\n"
@@ -305,6 +318,7 @@ def check_collateral_risk(chain: Chain) -> None:
     """
     logger.info("Checking on-chain collateral risk for %s...", chain.name)
     markets_data = _fetch_markets_data(chain)
+    record_snapshot(f"compound_markets_{chain.chain_id}", [asdict(market) for market in markets_data])
 
     for market in markets_data:
         alerts = _analyze_market(market)
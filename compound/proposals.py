@@ -4,6 +4,7 @@ import requests
 from dotenv import load_dotenv
 
 from utils.cache import get_last_queued_id_from_file, write_last_queued_id_to_file
+from utils.graphql import get_graphql_client
 from utils.logging import get_logger
 from utils.telegram import send_telegram_message
 
@@ -55,8 +56,6 @@ def extract_summary_from_description(description):
 
 
 def get_proposals():
-    headers = {"Api-Key": TALLY_API_KEY, "Content-Type": "application/json"}
-
     query = """
     query GovernanceProposals($input: ProposalsInput!) {
       proposals(input: $input) {
@@ -84,19 +83,9 @@ def get_proposals():
         }
     }
 
+    client = get_graphql_client(TALLY_API_URL, name="tally", headers={"Api-Key": TALLY_API_KEY})
     try:
-        response = requests.post(
-            TALLY_API_URL,
-            json={"query": query, "variables": variables},
-            headers=headers,
-        )
-        response.raise_for_status()
-        data = response.json()
-
-        if "errors" in data:
-            raise Exception(f"GraphQL errors: {data['errors']}")
-
-        proposals = data["data"]["proposals"]["nodes"]
+        proposals = client.data(query, variables)["proposals"]["nodes"]
         queued_proposals = [p for p in proposals if p["status"] == "queued"]
         if not queued_proposals:
             logger.info("No queued proposals found")
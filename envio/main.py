@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""Run every Envio-driven monitor off one combined indexer query.
+
+The timelock monitor and the Yearn large-flow monitor each describe their next
+page as Envio selections from their own cursors. Those are fetched in a single
+request and each monitor is handed its slice as its first page; only monitors
+with a backlog past that page make further requests. If the combined request
+fails, each monitor fetches and reports on its own as when run standalone. A
+monitor that raises is logged and reported, and the others still run.
+"""
+
+import argparse
+from collections.abc import Callable, Iterable
+
+import requests
+from dotenv import load_dotenv
+
+from timelock import timelock_alerts
+from utils.envio import fetch_combined
+from utils.logging import get_logger
+from utils.outbox import send_or_save
+from yearn import alert_large_flows
+
+load_dotenv()
+
+logger = get_logger("envio")
+
+TIMELOCK_GROUP = "timelock"
+
+
+def _flows_group(chain_id: int) -> str:
+    return f"flows{chain_id}"
+
+
+def run_monitor(name: str, channels: Iterable[str], run: Callable[[], object]) -> bool:
+    """Run one monitor so that its failure cannot stop the others.
+
+    Returns:
+        False if the monitor raised; the error is logged and sent to ``channels``.
+    """
+    try:
+        run()
+        return True
+    except Exception as e:
+        logger.exception("%s monitor failed", name)
+        # Exception text can include indexer or RPC URLs with keys, so only its type is sent
+        msg = f"⚠️ {name} monitor failed ({type(e).__name__}). See the workflow logs."
+        for channel in channels:
+            send_or_save(msg, channel, plain_text=True)
+        return False
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Run the timelock and large-flow monitors off one Envio query.")
+    parser.add_argument("--no-cache", action="store_true", help="Disable the monitors' cursors")
+    args = parser.parse_args()
+    use_cache = not args.no_cache
+
+    timelock_limit = timelock_alerts.DEFAULT_LIMIT
+    timelock_after = timelock_alerts.initial_cursor(use_cache)
+    flows_limit = alert_large_flows.DEFAULT_LIMIT
+    flows_since_ts = alert_large_flows.since_timestamp(alert_large_flows.DEFAULT_SINCE_SECONDS)
+    flows_after = {
+        chain_id: alert_large_flows.get_high_water_mark(chain_id) if use_cache else None
+        for chain_id in alert_large_flows.DEFAULT_CHAIN_IDS
+    }
+
+    groups = {TIMELOCK_GROUP: [timelock_alerts.event_selection(timelock_limit, timelock_after)]}
+    for chain_id, after in flows_after.items():
+        groups[_flows_group(chain_id)] = alert_large_flows.event_selections(
+            flows_limit, chain_id, after, flows_since_ts
+        )
+
+    try:
+        data = fetch_combined(groups)
+        logger.info("Fetched first pages for %s monitors in one request", len(groups))
+    except (requests.RequestException, ValueError) as e:
+        logger.warning("Combined Envio query failed, monitors will query separately: %s", e)
+        data = {}
+
+    def first_page(group: str) -> dict | None:
+        return {"data": data[group]} if group in data else None
+
+    run_monitor(
+        "Timelock",
+        sorted({t.protocol for t in timelock_alerts.TIMELOCK_LIST}),
+        lambda: timelock_alerts.ingest_events(
+            timelock_limit, timelock_after, None, use_cache, first_page(TIMELOCK_GROUP)
+        ),
+    )
+    for chain_id in flows_after:
+        run_monitor(
+            f"Yearn large flow (chain {chain_id})",
+            [alert_large_flows.PROTOCOL],
+            lambda chain_id=chain_id: alert_large_flows.process_chain(
+                chain_id,
+                flows_limit,
+                alert_large_flows.DEFAULT_THRESHOLD_USD,
+                flows_since_ts,
+                use_cache,
+                first_page(_flows_group(chain_id)),
+            ),
+        )
+
+
+if __name__ == "__main__":
+    main()
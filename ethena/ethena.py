@@ -1,10 +1,9 @@
 from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
 
-import requests
-
 from utils.abi import load_abi
 from utils.alert import Alert, AlertSeverity, send_alert
+from utils.http import get_session
 from utils.logging import get_logger
 from utils.web3_wrapper import Chain, ChainManager
 
@@ -50,7 +49,7 @@ class LlamaRiskData:
 def fetch_json(url: str) -> dict | None:
     """Helper that fetches JSON with basic error handling."""
     try:
-        resp = requests.get(url, timeout=REQUEST_TIMEOUT)
+        resp = get_session().get(url, timeout=REQUEST_TIMEOUT)
         if resp.status_code != 200:
             logger.error("HTTP %s for %s", resp.status_code, url)
             logger.error("%s", resp.text)
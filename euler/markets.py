@@ -1,6 +1,7 @@
 from utils.formatting import format_usd
 from utils.gauntlet import (
     fetch_borrow_metrics_from_gauntlet,
+    get_gauntlet_client,
     get_markets_for_protocol,
     get_timestamp_before,
 )
@@ -77,9 +78,9 @@ def fetch_metric_from_gauntlet(max_retries=3):
     return True
 
 
-def analyze_euler_market_allocation(market_key, vault_risk_level):
+def analyze_euler_market_allocation(market_key, vault_risk_level, charts=None):
     """Analyze Euler market allocation and send alerts if needed"""
-    alerts = fetch_borrow_metrics_from_gauntlet(PROTOCOL, market_key, vault_risk_level, DEBT_SUPPLY_RATIO)
+    alerts = fetch_borrow_metrics_from_gauntlet(PROTOCOL, market_key, vault_risk_level, DEBT_SUPPLY_RATIO, charts)
     if alerts:
         message = "\n\n".join(alerts)
         send_telegram_message(message, PROTOCOL)
@@ -92,8 +93,9 @@ def main():
         send_telegram_message("🚨 Euler metrics cannot be fetched", PROTOCOL)
 
     # Implement checks for vault allocations with their respective risk levels
+    charts_by_market = get_gauntlet_client().get_charts_for_markets(PROTOCOL, [vault[0] for vault in EULER_VAULTS_KEYS])
     for vault in EULER_VAULTS_KEYS:
-        analyze_euler_market_allocation(vault[0], vault[1])
+        analyze_euler_market_allocation(vault[0], vault[1], charts_by_market[vault[0]])
 
 
 if __name__ == "__main__":
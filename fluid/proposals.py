@@ -3,6 +3,7 @@ from datetime import datetime
 import requests
 
 from utils.cache import get_last_queued_id_from_file, write_last_queued_id_to_file
+from utils.http import get_session
 from utils.logging import get_logger
 from utils.telegram import send_telegram_message
 
@@ -61,7 +62,7 @@ def get_proposals():
     """Fetch and process Fluid governance proposals"""
     try:
         # Fetch queued proposals
-        response = requests.get(f"{FLUID_API_URL}?status=queued", timeout=30)
+        response = get_session().get(f"{FLUID_API_URL}?status=queued", timeout=30)
         response.raise_for_status()
         data = response.json()
 
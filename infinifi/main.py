@@ -1,10 +1,10 @@
-import requests
 from web3 import Web3
 
 from utils.abi import load_abi
 from utils.alert import Alert, AlertSeverity, send_alert
 from utils.cache import cache_filename, get_last_value_for_key_from_file, write_last_value_to_file
 from utils.chains import Chain
+from utils.http import get_session
 from utils.logging import get_logger
 from utils.web3_wrapper import ChainManager
 
@@ -47,7 +47,7 @@ def fetch_api_data():
         headers = {
             "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
         }
-        response = requests.get(url, headers=headers, timeout=10)
+        response = get_session().get(url, headers=headers, timeout=10)
         if response.status_code == 200:
             return response.json()
         else:
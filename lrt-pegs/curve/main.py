@@ -1,5 +1,5 @@
 from utils.abi import load_abi
-from utils.alert import Alert, AlertSeverity, send_alert
+from utils.alert import Alert, AlertFingerprint, AlertSeverity, resolve_alert, send_alert
 from utils.chains import Chain
 from utils.logging import get_logger
 from utils.web3_wrapper import ChainManager
@@ -39,12 +39,17 @@ def process_pools(chain: Chain = Chain.MAINNET):
             raise ValueError(f"Expected {len(POOL_CONFIGS)} responses from batch, got: {len(responses)}")
 
     # Process results
-    for (pool_name, _, idx_lrt, idx_other_token, peg_threshold, protocol), balances in zip(POOL_CONFIGS, responses):
+    for (pool_name, pool_address, idx_lrt, idx_other_token, peg_threshold, protocol), balances in zip(
+        POOL_CONFIGS, responses
+    ):
         percentage = (balances[idx_lrt] / (balances[idx_lrt] + balances[idx_other_token])) * 100
         logger.info("%s ratio is %s%%", pool_name, f"{percentage:.2f}")
+        fingerprint = AlertFingerprint(protocol, "curve_imbalance", pool_address)
         if percentage > peg_threshold:
             message = f"🚨 Curve Alert! {pool_name} ratio is {percentage:.2f}%"
-            send_alert(Alert(AlertSeverity.HIGH, message, protocol, channel=CHANNEL))
+            send_alert(Alert(AlertSeverity.HIGH, message, protocol, channel=CHANNEL), fingerprint=fingerprint)
+        else:
+            resolve_alert(fingerprint, f"{pool_name} ratio back to {percentage:.2f}%")
 
 
 def main():
@@ -3,6 +3,7 @@ from datetime import datetime
 import requests
 
 from utils.cache import get_last_queued_id_from_file, write_last_queued_id_to_file
+from utils.http import get_session
 from utils.logging import get_logger
 from utils.telegram import send_telegram_message
 
@@ -15,7 +16,7 @@ SKY_EXECUTIVE_URL = "https://vote.sky.money/executive/"
 
 def fetch_executive_proposals() -> list[dict]:
     """Fetch executive proposals from the Sky governance API."""
-    response = requests.get(SKY_EXECUTIVE_API, timeout=30)
+    response = get_session().get(SKY_EXECUTIVE_API, timeout=30)
     response.raise_for_status()
     return response.json()
 
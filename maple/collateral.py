@@ -18,10 +18,9 @@ Monitors:
 
 from datetime import datetime, timezone
 
-import requests
-
 from utils.alert import Alert, AlertSeverity, send_alert
 from utils.formatting import format_usd
+from utils.graphql import GraphQLClient, get_graphql_client
 from utils.logging import get_logger
 
 PROTOCOL = "maple"
@@ -97,6 +96,10 @@ COLLATERAL_QUERY = """
 """ % (SYRUP_USDC_POOL_ID, SYRUP_USDT_POOL_ID)
 
 
+def _maple_client() -> GraphQLClient:
+    return get_graphql_client(MAPLE_GRAPHQL_URL, name="maple", timeout=30)
+
+
 def fetch_collateral_data() -> tuple[list[dict], list[dict]]:
     """Fetch collateral and pool data for both syrupUSDC and syrupUSDT from Maple GraphQL API.
 
@@ -107,22 +110,13 @@ def fetch_collateral_data() -> tuple[list[dict], list[dict]]:
         totalAssets, principalOut, unrealizedLosses, accountedInterest fields.
 
     Raises:
-        ValueError: If the API response is malformed or pools not found.
+        ValueError: If the API returns errors, the response is malformed or pools not found.
         requests.RequestException: If the API request fails.
     """
-    response = requests.post(
-        MAPLE_GRAPHQL_URL,
-        json={"query": COLLATERAL_QUERY},
-        timeout=30,
-    )
-    response.raise_for_status()
-
-    data = response.json()
-    if "errors" in data:
-        raise ValueError(f"Maple GraphQL errors: {data['errors']}")
+    data = _maple_client().data(COLLATERAL_QUERY)
 
     # Log subgraph sync status
-    meta = data.get("data", {}).get("_meta", {})
+    meta = data.get("_meta", {})
     block_info = meta.get("block", {})
     block_number = block_info.get("number")
     block_timestamp = block_info.get("timestamp")
@@ -130,7 +124,7 @@ def fetch_collateral_data() -> tuple[list[dict], list[dict]]:
         sync_time = datetime.fromtimestamp(block_timestamp, tz=timezone.utc)
         logger.info("Subgraph synced to block %s (%s UTC)", block_number, sync_time.strftime("%Y-%m-%d %H:%M:%S"))
 
-    pools = data.get("data", {}).get("poolV2S", [])
+    pools = data.get("poolV2S", [])
     if not pools:
         raise ValueError("No Syrup pools found in Maple API response")
 
@@ -181,21 +175,12 @@ def fetch_syrup_globals() -> dict:
         Dict with collateralRatio (float), collateralValue (float USD), loansValue (float USD).
 
     Raises:
-        ValueError: If the API response is malformed.
+        ValueError: If the API returns errors or the response is malformed.
         requests.RequestException: If the API request fails.
     """
-    response = requests.post(
-        MAPLE_GRAPHQL_URL,
-        json={"query": SYRUP_GLOBALS_QUERY},
-        timeout=30,
-    )
-    response.raise_for_status()
-
-    data = response.json()
-    if "errors" in data:
-        raise ValueError(f"Maple GraphQL errors: {data['errors']}")
+    data = _maple_client().data(SYRUP_GLOBALS_QUERY)
 
-    globals_data = data.get("data", {}).get("syrupGlobals")
+    globals_data = data.get("syrupGlobals")
     if not globals_data:
         raise ValueError("syrupGlobals not found in Maple API response")
 
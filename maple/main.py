@@ -20,6 +20,7 @@ from utils.cache import get_last_value_for_key_from_file, write_last_value_to_fi
 from utils.chains import Chain
 from utils.formatting import format_usd
 from utils.logging import get_logger
+from utils.timeseries import record_metrics
 from utils.web3_wrapper import ChainManager
 
 PROTOCOL = "maple"
@@ -324,6 +325,9 @@ def main() -> None:
         check_collateral_risk()
         check_delegate_cover(client)
 
+        # Keep history for rate-of-change checks beyond the previous run
+        record_metrics([(CACHE_KEY_PPS, pps), (CACHE_KEY_TVL, tvl)])
+
         logger.info(
             "Monitoring complete — PPS: %.8f, TVL: %s",
             pps,
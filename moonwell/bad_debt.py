@@ -1,7 +1,6 @@
 from datetime import datetime, timedelta
 
-import requests
-
+from utils.http import get_session
 from utils.logging import get_logger
 from utils.telegram import send_telegram_message
 
@@ -37,7 +36,7 @@ def fetch_metrics():
     for metric_name, endpoint in endpoints.items():
         url = f"{BASE_URL}/{endpoint}?since={timestamp}"
         try:
-            response = requests.get(url)
+            response = get_session().get(url)
             response.raise_for_status()
             data = response.json()
 
@@ -1,6 +1,7 @@
 import requests
 
 from utils.cache import get_last_queued_id_from_file, write_last_queued_id_to_file
+from utils.http import get_session
 from utils.logging import get_logger
 from utils.telegram import send_telegram_message
 
@@ -41,7 +42,7 @@ def fetch_moonwell_proposals():
     try:
         use_retry_url = False
         try:
-            response = requests.post(url, json=payload)
+            response = get_session().post(url, json=payload)
             response.raise_for_status()
 
             # Check for the specific schema error even when status code is 200
@@ -56,7 +57,7 @@ def fetch_moonwell_proposals():
         except requests.exceptions.RequestException as e:
             if not use_retry_url:
                 logger.info("Primary URL failed with error: %s, trying backup URL: %s", str(e), url_retry)
-            response = requests.post(url_retry, json=payload)
+            response = get_session().post(url_retry, json=payload)
             response.raise_for_status()
 
         data = response.json()
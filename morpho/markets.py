@@ -11,9 +11,11 @@ from typing import Any, Dict, List
 
 import requests
 
+from utils.alert import Alert, AlertFingerprint, AlertSeverity, alert_digest, resolve_alert, send_alert
 from utils.chains import Chain
-from utils.http import request_with_retry
+from utils.graphql import GraphQLError, get_graphql_client
 from utils.logging import get_logger
+from utils.snapshots import record_snapshot
 from utils.telegram import send_telegram_message
 
 # Configuration constants
@@ -395,7 +397,9 @@ MAX_RISK_THRESHOLDS = {
 }
 
 
-def get_market_allocation_threshold(market_risk_level: int, vault_risk_level: int) -> float:
+def get_market_allocation_threshold(
+    market_risk_level: int, vault_risk_level: int, allocation_tiers: dict[int, float] | None = None
+) -> float:
     """
     Get allocation threshold based on market and vault risk levels.
     For higher vault risk levels, thresholds shift up (become more permissive).
@@ -404,13 +408,15 @@ def get_market_allocation_threshold(market_risk_level: int, vault_risk_level: in
     Args:
         market_risk_level: Risk level of the market (1-5)
         vault_risk_level: Risk level of the vault (1-5)
+        allocation_tiers: Overrides ALLOCATION_TIERS (used by threshold backtests)
 
     Returns:
         Allocation threshold as a decimal (0-1)
     """
+    tiers = ALLOCATION_TIERS if allocation_tiers is None else allocation_tiers
     # Shift market risk level down based on vault risk level
     adjusted_risk = max(1, market_risk_level - (vault_risk_level - 1))
-    return ALLOCATION_TIERS[adjusted_risk]
+    return tiers[adjusted_risk]
 
 
 def get_chain_name(chain: Chain) -> str:
@@ -471,12 +477,12 @@ def bad_debt_alert(
             market_name = f"{market['collateralAsset']['symbol']}/{market['loanAsset']['symbol']}"
 
             message = (
-                f"🚨 Bad debt detected in [{vault_name}]({vault_url}) on {chain.name}\n"
+                f"Bad debt detected in [{vault_name}]({vault_url}) on {chain.name}\n"
                 f"💹 Market: [{market_name}]({market_url})\n"
                 f"💸 Bad debt: ${bad_debt:,.2f} ({(bad_debt / borrowed_tvl):.2%} of borrowed)\n"
             )
 
-            send_telegram_message(message, PROTOCOL)
+            send_alert(Alert(AlertSeverity.HIGH, message, PROTOCOL))
 
 
 def check_allocation_and_risk(vault_data):
@@ -485,9 +491,28 @@ def check_allocation_and_risk(vault_data):
     Sends a consolidated alert if any markets exceed allocation thresholds.
     Sends a separate alert if total risk level exceeds the vault's maximum.
     """
+    for message in evaluate_allocation_and_risk(vault_data):
+        send_alert(Alert(AlertSeverity.HIGH, message, PROTOCOL))
+
+
+def evaluate_allocation_and_risk(
+    vault_data: Dict[str, Any],
+    allocation_tiers: dict[int, float] | None = None,
+    max_risk_thresholds: dict[int, float] | None = None,
+) -> List[str]:
+    """
+    Evaluate per-market allocation and total vault risk level without sending anything.
+
+    Returns the alert messages ``check_allocation_and_risk`` would send: one consolidated
+    allocation message and/or one total risk message. Threshold overrides default to
+    ALLOCATION_TIERS and MAX_RISK_THRESHOLDS.
+    """
+    if max_risk_thresholds is None:
+        max_risk_thresholds = MAX_RISK_THRESHOLDS
+    messages: List[str] = []
     total_assets = vault_data.get("state", {}).get("totalAssetsUsd", 0) or 0
     if total_assets == 0:
-        return
+        return messages
 
     vault_name = vault_data["name"]
     vault_url = get_vault_url(vault_data)
@@ -532,7 +557,7 @@ def check_allocation_and_risk(vault_data):
         else:
             market_risk_level = 5
 
-        allocation_threshold = get_market_allocation_threshold(market_risk_level, risk_level)
+        allocation_threshold = get_market_allocation_threshold(market_risk_level, risk_level, allocation_tiers)
         risk_multiplier = market_risk_level
 
         if allocation_ratio > allocation_threshold:
@@ -553,22 +578,23 @@ def check_allocation_and_risk(vault_data):
     if allocation_violations:
         violations_text = "\n".join(allocation_violations)
         message = (
-            f"🔺 High allocation in [{vault_name}]({vault_url}) (risk {risk_level}) on {chain.name}\n"
-            f"{violations_text}\n"
+            f"High allocation in [{vault_name}]({vault_url}) (risk {risk_level}) on {chain.name}\n{violations_text}\n"
         )
-        send_telegram_message(message, PROTOCOL)
+        messages.append(message)
 
     # print total risk level and vault name
     logger.info("Total risk level: %s, vault: %s on %s", f"{total_risk_level:.2f}", vault_name, chain.name)
     # round total_risk_level to 2 decimal places
     total_risk_level = round(total_risk_level, 2)
-    if total_risk_level > MAX_RISK_THRESHOLDS[risk_level]:
+    if total_risk_level > max_risk_thresholds[risk_level]:
         message = (
-            f"⚠️ High risk level in [{vault_name}]({vault_url}) (risk {risk_level}) on {chain.name}\n"
-            f"🔢 Risk level: {total_risk_level:.2f} (max: {MAX_RISK_THRESHOLDS[risk_level]:.2f})\n"
+            f"High risk level in [{vault_name}]({vault_url}) (risk {risk_level}) on {chain.name}\n"
+            f"🔢 Risk level: {total_risk_level:.2f} (max: {max_risk_thresholds[risk_level]:.2f})\n"
             f"🔢 Total assets: ${total_assets:,.2f}\n"
         )
-        send_telegram_message(message, PROTOCOL)
+        messages.append(message)
+
+    return messages
 
 
 def is_yv_collateral_vault(vault_address: str, chain: Chain) -> bool:
@@ -683,6 +709,7 @@ def check_combined_liquidity_threshold(
         return
 
     combined_liquidity_ratio = combined_liquidity / combined_total_assets
+    fingerprint = AlertFingerprint(PROTOCOL, "low_combined_liquidity", f"{chain.chain_id}+{asset_symbol}")
 
     logger.info(
         "Combined %s liquidity check: %s vaults on %s, $%s total assets, %s liquidity ratio",
@@ -696,12 +723,17 @@ def check_combined_liquidity_threshold(
     if combined_liquidity_ratio < LIQUIDITY_THRESHOLD_YV_COLLATERAL:
         vault_list = ", ".join(vault_names)
         message = (
-            f"⚠️ Low combined liquidity for {asset_symbol} YV collateral vaults on {chain.name}\n"
+            f"Low combined liquidity for {asset_symbol} YV collateral vaults on {chain.name}\n"
             f"🏦 Vaults: {vault_list}\n"
             f"💰 Liquidity: ${combined_liquidity:,.2f} ({combined_liquidity_ratio:.1%} of ${combined_total_assets:,.2f})\n"
             f"📊 Min threshold: {LIQUIDITY_THRESHOLD_YV_COLLATERAL:.1%}\n"
         )
-        send_telegram_message(message, PROTOCOL)
+        send_alert(Alert(AlertSeverity.HIGH, message, PROTOCOL), fingerprint=fingerprint)
+    else:
+        resolve_alert(
+            fingerprint,
+            f"{asset_symbol} YV collateral liquidity on {chain.name} back to {combined_liquidity_ratio:.1%}",
+        )
 
 
 def check_yv_collateral_liquidity_for_chain(chain: Chain, chain_vaults: List[Dict[str, Any]]) -> None:
@@ -766,6 +798,7 @@ def check_low_liquidity_combined(vaults_data: List[Dict[str, Any]]) -> None:
 def check_low_liquidity(vault_data):
     """
     Send telegram message if low liquidity is detected.
+    Repeats are suppressed across runs; a resolved message is sent once liquidity recovers.
     """
     vault_name = vault_data["name"]
     vault_url = get_vault_url(vault_data)
@@ -780,15 +813,20 @@ def check_low_liquidity(vault_data):
     # Default liquidity to 0 if it's None
     liquidity = liquidity or 0
     liquidity_ratio = liquidity / total_assets
+    fingerprint = AlertFingerprint(PROTOCOL, "low_liquidity", f"{chain.chain_id}+{vault_data['address']}")
 
     # standard liquidity check (YV collateral vaults are handled separately)
     if liquidity_ratio < LIQUIDITY_THRESHOLD:
         message = (
-            f"⚠️ Low liquidity in [{vault_name}]({vault_url}) on {chain.name}\n"
+            f"Low liquidity in [{vault_name}]({vault_url}) on {chain.name}\n"
             f"💰 Liquidity: ${liquidity:,.2f} ({liquidity_ratio:.1%} of ${total_assets:,.2f})\n"
             f"📊 Min threshold: {LIQUIDITY_THRESHOLD:.1%}\n"
         )
-        send_telegram_message(message, PROTOCOL)
+        send_alert(Alert(AlertSeverity.HIGH, message, PROTOCOL), fingerprint=fingerprint)
+    else:
+        resolve_alert(
+            fingerprint, f"[{vault_name}]({vault_url}) liquidity on {chain.name} back to {liquidity_ratio:.1%}"
+        )
 
 
 def main() -> None:
@@ -804,8 +842,8 @@ def main() -> None:
         vault_addresses.extend([vault[1] for vault in vaults])
 
     query = """
-    query GetVaults($addresses: [String!]!) {
-        vaults(where: { address_in: $addresses } ) {
+    query GetVaults($addresses: [String!]!, $first: Int!, $skip: Int!) {
+        vaults(first: $first, skip: $skip, where: { address_in: $addresses } ) {
             items {
                 address
                 name
@@ -857,34 +895,41 @@ def main() -> None:
     }
     """
 
-    json_data = {"query": query, "variables": {"addresses": vault_addresses}}
-
+    # The Morpho API has no keyset filter on vaults, so page with skip
+    client = get_graphql_client(API_URL, name="morpho-api")
     try:
-        response = request_with_retry("post", API_URL, json=json_data)
-    except requests.RequestException as e:
+        vaults_data = list(client.paginate(query, "vaults.items", {"addresses": vault_addresses}, cursor_field=None))
+    except GraphQLError as e:
+        logger.error("GraphQL error when fetching Morpho data: %s", e.errors)
         send_telegram_message(
-            f"🚨 Problem with fetching data for Morpho markets: {e.response.status_code} 🚨",
+            "🚨 GraphQL error when fetching Morpho data 🚨",
             PROTOCOL,
             True,
             True,
         )
         return
-
-    data = response.json()
-    if "errors" in data:
+    except (requests.RequestException, ValueError) as e:
         send_telegram_message(
-            f"🚨 GraphQL error when fetching Morpho data. Response code: {response.status_code} 🚨",
+            f"🚨 Problem with fetching data for Morpho markets: {e} 🚨",
             PROTOCOL,
             True,
             True,
         )
         return
 
-    vaults_data = data.get("data", {}).get("vaults", {}).get("items", [])
     if len(vaults_data) == 0:
         send_telegram_message("🚨 No vaults data found 🚨", PROTOCOL)
         return
 
+    record_snapshot("morpho_vaults", vaults_data)
+
+    # Vault alerts are HIGH and go out immediately; only the LOW resolved messages are batched
+    with alert_digest():
+        run_checks(vaults_data)
+
+
+def run_checks(vaults_data: List[Dict[str, Any]]) -> None:
+    """Run liquidity, allocation/risk and bad debt checks for all fetched vaults."""
     # Check combined liquidity for all vaults (handles YV collateral grouping)
     check_low_liquidity_combined(vaults_data)
 
@@ -14,7 +14,7 @@ import requests
 from dotenv import load_dotenv
 
 from utils.chains import Chain
-from utils.http import request_with_retry
+from utils.graphql import GraphQLError, get_graphql_client
 from utils.logging import get_logger
 from utils.telegram import send_telegram_message
 
@@ -198,11 +198,36 @@ def check_low_liquidity(vault_data, chain: Chain):
         send_telegram_message(message, PROTOCOL)
 
 
-def check_bad_debt(data):
+BAD_DEBT_QUERY = """
+query BadDebt($first: Int!, $cursor: ID!) {
+  badDebtRealizations(first: $first, where: { id_gt: $cursor }, orderBy: id, orderDirection: asc) {
+    id
+    badDebt
+    market {
+      id
+      totalSupply
+      totalBorrow
+      inputToken {
+        symbol
+        name
+        id
+      }
+      borrowedToken {
+        symbol
+        name
+        id
+        decimals
+      }
+    }
+  }
+}
+"""
+
+
+def check_bad_debt(bad_debt_realizations):
     """
     Send telegram message if bad debt is detected in any market.
     """
-    bad_debt_realizations = data.get("data", {}).get("badDebtRealizations", {})
     for realization in bad_debt_realizations:
         bad_debt_value = int(realization["badDebt"])
         market = realization["market"]
@@ -276,26 +301,6 @@ def check_graph_data_for_chain(chain: Chain):
             amount
         }}
       }}
-      badDebtRealizations {{
-        id
-        badDebt
-        market {{
-          id
-          totalSupply
-          totalBorrow
-          inputToken {{
-            symbol
-            name
-            id
-          }}
-          borrowedToken {{
-            symbol
-            name
-            id
-            decimals
-          }}
-        }}
-      }}
     }}
     """
 
@@ -304,34 +309,34 @@ def check_graph_data_for_chain(chain: Chain):
         raise ValueError("GRAPH_API_KEY environment variable is not set")
     api_url = GRAPH_BY_CHAIN[chain].format(api_key=api_key)
 
-    json_data = {"query": query}
+    client = get_graphql_client(api_url, name=f"morpho-subgraph-{chain.name.lower()}")
     try:
-        response = request_with_retry("post", api_url, json=json_data)
-    except requests.RequestException as e:
+        vaults_data = client.data(query).get("metaMorphos", [])
+        # Realizations are unbounded, so read them page by page instead of the default first 100
+        bad_debt_realizations = list(client.paginate(BAD_DEBT_QUERY, "badDebtRealizations"))
+    except GraphQLError as e:
+        logger.error("GraphQL error when fetching Morpho data: %s", e.errors)
         send_telegram_message(
-            f"🚨 Problem with fetching data for Morpho markets: {str(e)} 🚨",
+            "🚨 GraphQL error when fetching Morpho data 🚨",
             PROTOCOL,
             True,
             True,
         )
         return
-
-    data = response.json()
-    if "errors" in data:
+    except (requests.RequestException, ValueError) as e:
         send_telegram_message(
-            f"🚨 GraphQL error when fetching Morpho data. Response code: {response.status_code} 🚨",
+            f"🚨 Problem with fetching data for Morpho markets: {str(e)} 🚨",
             PROTOCOL,
             True,
             True,
         )
         return
 
-    vaults_data = data.get("data", {}).get("metaMorphos", {})
     if len(vaults_data) == 0:
         send_telegram_message("🚨 No vaults data found 🚨", PROTOCOL)
         return
 
-    check_bad_debt(data)
+    check_bad_debt(bad_debt_realizations)
     for vault in vaults_data:
         check_low_liquidity(vault, chain)
         check_high_allocation(vault, chain)
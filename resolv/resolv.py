@@ -3,8 +3,6 @@ import re
 import time
 from datetime import datetime, timedelta
 
-import requests
-
 from utils.abi import load_abi
 from utils.cache import (
     cache_filename,
@@ -12,6 +10,7 @@ from utils.cache import (
     write_last_value_to_file,
 )
 from utils.chains import Chain
+from utils.http import get_session
 from utils.logging import get_logger
 from utils.telegram import send_telegram_message
 from utils.web3_wrapper import ChainManager
@@ -193,7 +192,7 @@ def _parse_reserves_timestamp(text: str) -> datetime | None:
 def fetch_resolv_reserves_html() -> str | None:
     """Fetch Resolv reserves page HTML."""
     try:
-        resp = requests.get(RESOLV_RESERVES_URL, timeout=REQUEST_TIMEOUT)
+        resp = get_session().get(RESOLV_RESERVES_URL, timeout=REQUEST_TIMEOUT)
         if resp.status_code != 200:
             logger.error("HTTP %s for %s", resp.status_code, RESOLV_RESERVES_URL)
             return None
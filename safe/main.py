@@ -2,18 +2,20 @@ import itertools
 import os
 import time
 
-import requests
 from dotenv import load_dotenv
 
 from safe.specific import handle_pendle
 from utils.cache import (
     get_last_executed_nonce_from_file,
+    nonces_filename,
     write_last_executed_nonce_to_file,
 )
 from utils.chains import safe_network_to_chain_id
+from utils.http import get_session
 from utils.llm.ai_explainer import explain_transaction, format_explanation_line
 from utils.logging import get_logger
-from utils.telegram import send_telegram_message
+from utils.outbox import retry_undelivered, send_or_save
+from utils.proxy import prefetch_implementations, upgrade_targets
 
 load_dotenv()
 logger = get_logger("safe")
@@ -214,7 +216,7 @@ def get_safe_transactions(
     }
 
     for attempt in range(max_retries):
-        response = requests.get(endpoint, params=params, headers=headers)
+        response = get_session().get(endpoint, params=params, headers=headers)
 
         if response.status_code == 200:
             return response.json()["results"]
@@ -262,6 +264,12 @@ def check_for_pending_transactions(safe_address: str, network_name: str, protoco
     pending_transactions = get_pending_transactions(safe_address, network_name)
 
     if pending_transactions:
+        # Read current implementations of all upgraded proxies in one batch
+        chain_id = safe_network_to_chain_id(network_name)
+        prefetch_implementations(
+            upgrade_targets((tx["to"], tx.get("data") or "0x", chain_id) for tx in pending_transactions)
+        )
+
         for tx in pending_transactions:
             nonce = int(tx["nonce"])
 
@@ -311,7 +319,6 @@ def check_for_pending_transactions(safe_address: str, network_name: str, protoco
             # AI explanation (best-effort, non-blocking)
             hex_data = tx.get("data", "0x")
             if hex_data and len(hex_data) >= 10:
-                chain_id = safe_network_to_chain_id(network_name)
                 try:
                     explanation = explain_transaction(
                         target=target_contract,
@@ -327,7 +334,14 @@ def check_for_pending_transactions(safe_address: str, network_name: str, protoco
                 except Exception:
                     logger.debug("AI explanation failed for Safe tx nonce=%s", nonce, exc_info=True)
 
-            send_telegram_message(message, protocol, False)  # explicitly enable notification
+            # explicitly enable notification; undelivered alerts are retried next run
+            send_or_save(
+                message,
+                protocol,
+                False,
+                key=f"safe+{network_name}+{safe_address}+{nonce}",
+                filename=nonces_filename,
+            )
             # write the last executed nonce to file
             write_last_executed_nonce_to_file(safe_address, nonce)
     else:
@@ -354,6 +368,8 @@ def run_for_network(network_name: str, safe_address: str, protocol: str) -> None
 def main():
     last_api_call_time = 0
     request_counter = 0
+    # nonces.txt is the cache persisted for this workflow, so the outbox lives there too
+    retry_undelivered(nonces_filename)
     # loop all
     for safe in ALL_SAFE_ADDRESSES:
         logger.info("Running for %s on %s", safe[0], safe[1])
@@ -0,0 +1,206 @@
+"""Tests for yearn/alert_large_flows.py — log-position paging and threshold evaluation."""
+
+import time
+import unittest
+from decimal import Decimal
+from unittest.mock import MagicMock, patch
+
+import requests
+
+from yearn import alert_large_flows
+from yearn.alert_large_flows import (
+    _event_filter,
+    alert_on_large_flows,
+    get_raw_threshold,
+    gql_request,
+    merge_page,
+    prefetch_total_supplies,
+    process_chain,
+)
+
+VAULT = "0xbe53a109b494e5c9f97b9cd39fe969be68bf6204"
+WETH_VAULT = "0xc56413869c6cdf96496f2b1ef801fedbdfa7ddb0"
+WETH = {"symbol": "WETH", "decimals": 18, "chain_id": 1, "token_address": "0xc02a"}
+
+
+def _event(block_number: int, log_index: int, tx: str = "0x01") -> dict:
+    return {
+        "assets": "1",
+        "vaultAddress": VAULT,
+        "chainId": 1,
+        "blockNumber": block_number,
+        "logIndex": log_index,
+        "transactionHash": tx,
+    }
+
+
+def _response(deposits: list[dict], withdrawals: list[dict]) -> dict:
+    return {"data": {"deposits": deposits, "withdrawals": withdrawals}}
+
+
+@patch("yearn.alert_large_flows.send_telegram_message")
+@patch("yearn.alert_large_flows.get_envio_client")
+class TestGqlRequest(unittest.TestCase):
+    SECRET_URL = "https://indexer.example/v1/graphql?key=secret"
+
+    def test_http_error_alert_omits_url(self, mock_client, mock_send) -> None:
+        response = requests.Response()
+        response.status_code = 503
+        mock_client.return_value.execute.side_effect = requests.HTTPError(
+            f"503 for url: {self.SECRET_URL}", response=response
+        )
+
+        self.assertIsNone(gql_request("{ ok }", {}))
+        message = mock_send.call_args.args[0]
+        self.assertIn("HTTP 503", message)
+        self.assertNotIn("secret", message)
+
+    def test_connection_error_alert_names_exception_only(self, mock_client, mock_send) -> None:
+        mock_client.return_value.execute.side_effect = requests.ConnectionError(f"cannot reach {self.SECRET_URL}")
+
+        gql_request("{ ok }", {})
+        message = mock_send.call_args.args[0]
+        self.assertIn("ConnectionError", message)
+        self.assertNotIn("secret", message)
+
+
+class TestMergePage(unittest.TestCase):
+    def test_merges_in_log_order(self) -> None:
+        events, more = merge_page([_event(2, 0)], [_event(1, 5), _event(2, 3)], limit=3)
+        self.assertFalse(more)
+        self.assertEqual(
+            [(e["blockNumber"], e["logIndex"], e["type"]) for e in events],
+            [
+                (1, 5, "withdraw"),
+                (2, 0, "deposit"),
+                (2, 3, "withdraw"),
+            ],
+        )
+
+    def test_full_list_cuts_page_at_its_last_position(self) -> None:
+        # Deposits are full at (5, 0), so withdrawals after it may precede unfetched deposits
+        events, more = merge_page([_event(1, 0), _event(5, 0)], [_event(3, 0), _event(7, 0)], limit=2)
+        self.assertTrue(more)
+        self.assertEqual([(e["blockNumber"], e["logIndex"]) for e in events], [(1, 0), (3, 0), (5, 0)])
+
+    def test_filter_resumes_after_position(self) -> None:
+        self.assertEqual(_event_filter(1, None, 100), {"chainId": {"_eq": 1}, "blockTimestamp": {"_gte": 100}})
+        where = _event_filter(1, (10, 2), 100)
+        self.assertNotIn("blockTimestamp", where)
+        self.assertIn({"blockNumber": {"_eq": 10}, "logIndex": {"_gt": 2}}, where["_or"])
+
+
+@patch("yearn.alert_large_flows.send_large_flow_alert")
+@patch("yearn.alert_large_flows.prefetch_total_supplies", MagicMock())
+@patch("yearn.alert_large_flows.prefetch_prices")
+@patch("yearn.alert_large_flows.get_vault_total_supply")
+@patch("yearn.alert_large_flows.get_token_price_usd")
+class TestRawThresholds(unittest.TestCase):
+    def test_priced_threshold_rounds_up_to_raw_units(self, mock_price, mock_supply, _, __) -> None:
+        mock_price.return_value = Decimal("3")
+        # 10 USD at 3 USD/token is 3.333... tokens, so the smallest alerting amount rounds up
+        self.assertEqual(get_raw_threshold(WETH_VAULT, WETH, Decimal(10)), (3333333333333333334, Decimal(3)))
+        mock_supply.assert_not_called()
+
+    def test_unpriced_vault_uses_supply_ratio(self, mock_price, mock_supply, _, __) -> None:
+        mock_price.side_effect = RuntimeError("no price")
+        mock_supply.return_value = Decimal("50")
+        self.assertEqual(get_raw_threshold(WETH_VAULT, WETH, Decimal(10)), (5 * 10**18, None))
+        mock_supply.return_value = Decimal(0)
+        self.assertIsNone(get_raw_threshold(WETH_VAULT, WETH, Decimal(10)))
+
+    def test_compares_raw_amounts_and_prices_each_vault_once(self, mock_price, mock_supply, _, mock_send) -> None:
+        mock_price.return_value = Decimal("2000")
+        events = [
+            {**_event(1, 0), "vaultAddress": WETH_VAULT, "assets": str(5 * 10**17 - 1), "type": "deposit"},
+            {**_event(1, 1), "vaultAddress": WETH_VAULT, "assets": str(5 * 10**17), "type": "deposit"},
+            {**_event(1, 2), "assets": str(999_999_999), "type": "withdraw"},
+            {**_event(1, 3), "assets": str(1_000_000_000), "type": "withdraw"},
+        ]
+        thresholds: dict = {}
+        alert_on_large_flows(events, Decimal(1000), thresholds)
+        alert_on_large_flows(events[:1], Decimal(1000), thresholds)
+
+        self.assertEqual(mock_price.call_count, 1)
+        self.assertEqual([c.args[0]["logIndex"] for c in mock_send.call_args_list], [1, 3])
+        self.assertEqual(mock_send.call_args_list[0].args[2:], (Decimal("0.5"), Decimal(1000)))
+
+
+class TestPrefetchTotalSupplies(unittest.TestCase):
+    def setUp(self) -> None:
+        for cache in (alert_large_flows._price_cache, alert_large_flows._total_supply_cache):
+            cache.clear()
+            self.addCleanup(cache.clear)
+
+    @patch("yearn.alert_large_flows.ChainManager.get_client")
+    def test_batches_unpriced_vaults_per_chain(self, mock_get_client) -> None:
+        client = MagicMock()
+        client.execute_batch.side_effect = [[5 * 10**18], [7 * 10**8]]
+        mock_get_client.return_value = client
+        wbtc_vault = "0xaa0362ecc584b985056e47812931270b99c91f9d"
+        priced_vault = "0xe007ca01894c863d7898045ed5a3b4abf0b18f37"
+        alert_large_flows._price_cache[(747474, "0xee7d8bcfb72bc1880d0cf19822eb0a2e6577ab62")] = (
+            time.time(),
+            Decimal(1),
+        )
+        events = [{"vaultAddress": v} for v in (WETH_VAULT, WETH_VAULT, VAULT, wbtc_vault, priced_vault)]
+
+        prefetch_total_supplies(events)
+
+        self.assertEqual(client.execute_batch.call_count, 2)
+        self.assertEqual(alert_large_flows._total_supply_cache[(1, WETH_VAULT)], Decimal(5))
+        self.assertEqual(alert_large_flows._total_supply_cache[(747474, wbtc_vault)], Decimal(7))
+        self.assertNotIn((747474, priced_vault), alert_large_flows._total_supply_cache)
+
+        # Cached supplies are not fetched again
+        prefetch_total_supplies(events)
+        self.assertEqual(client.execute_batch.call_count, 2)
+
+
+@patch("yearn.alert_large_flows.alert_on_large_flows")
+@patch("yearn.alert_large_flows.write_last_value_to_file")
+@patch("yearn.alert_large_flows.get_last_value_for_key_from_file")
+@patch("yearn.alert_large_flows.load_events")
+class TestProcessChain(unittest.TestCase):
+    def test_pages_from_high_water_mark_and_commits_each_page(self, mock_load, mock_get, mock_write, mock_alert):
+        mock_get.return_value = "10+2"
+        mock_load.side_effect = [
+            _response([_event(11, 0), _event(12, 0)], []),
+            _response([_event(12, 4)], [_event(13, 1)]),
+        ]
+
+        self.assertEqual(process_chain(1, 2, Decimal(1), 100, use_cache=True), 4)
+        self.assertEqual([c.args[2] for c in mock_load.call_args_list], [(10, 2), (12, 0)])
+        self.assertEqual(
+            [c.args[1:] for c in mock_write.call_args_list],
+            [("yearn_LARGE_FLOW_HWM_1", "12+0"), ("yearn_LARGE_FLOW_HWM_1", "13+1")],
+        )
+        self.assertEqual(mock_alert.call_count, 2)
+
+    def test_first_run_skips_events_already_alerted_by_tx_hash(self, mock_load, mock_get, mock_write, mock_alert):
+        mock_get.side_effect = lambda _, key: "0xaa" if key.endswith("LAST_TX") else 0
+        mock_load.return_value = _response([_event(1, 0, "0xaa"), _event(2, 0, "0xbb")], [])
+
+        process_chain(1, 10, Decimal(1), 100, use_cache=True)
+        self.assertIsNone(mock_load.call_args.args[2])
+        self.assertEqual([e["transactionHash"] for e in mock_alert.call_args.args[0]], ["0xbb"])
+        # The position still covers the whole page
+        self.assertEqual(mock_write.call_args.args[1:], ("yearn_LARGE_FLOW_HWM_1", "2+0"))
+
+    def test_prefetched_first_page_skips_fetch(self, mock_load, mock_get, mock_write, mock_alert):
+        mock_get.return_value = "10+2"
+
+        process_chain(1, 2, Decimal(1), 100, use_cache=True, first_page=_response([_event(11, 0)], []))
+        mock_load.assert_not_called()
+        self.assertEqual(mock_write.call_args.args[1:], ("yearn_LARGE_FLOW_HWM_1", "11+0"))
+
+    def test_failed_page_keeps_committed_position(self, mock_load, mock_get, mock_write, mock_alert):
+        mock_get.return_value = "10+2"
+        mock_load.side_effect = [_response([_event(11, 0)], []), None]
+
+        process_chain(1, 1, Decimal(1), 100, use_cache=True)
+        self.assertEqual(mock_write.call_args.args[1:], ("yearn_LARGE_FLOW_HWM_1", "11+0"))
+
+
+if __name__ == "__main__":
+    unittest.main()
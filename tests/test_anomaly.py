@@ -0,0 +1,73 @@
+"""Tests for utils/anomaly.py — vectorized rolling statistics over metric history."""
+
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+from utils.anomaly import detect_anomalies, ewma, load_history, rolling_mean, rolling_std, zscores
+from utils.timeseries import MetricStore
+
+HOUR = 3600
+
+
+class TestAnomalyDetection(unittest.TestCase):
+    """Tests for history loading and the vectorized statistics."""
+
+    def setUp(self) -> None:
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.store = MetricStore(os.path.join(self.tmpdir.name, "timeseries.bin"), retention_seconds=365 * 86400)
+
+    def tearDown(self) -> None:
+        self.tmpdir.cleanup()
+
+    def test_load_history_right_aligned(self) -> None:
+        for hour in range(5):
+            points = [("A", float(hour))]
+            if hour >= 3:
+                points.append(("B", 10.0 * hour))
+            self.store.append_many(points, timestamp=hour * HOUR)
+
+        history = load_history(self.store, ["A", "B", "MISSING"], points=4)
+        np.testing.assert_array_equal(history[0], [1.0, 2.0, 3.0, 4.0])
+        np.testing.assert_array_equal(history[1], [np.nan, np.nan, 30.0, 40.0])
+        self.assertTrue(np.isnan(history[2]).all())
+
+    def test_rolling_mean_and_std(self) -> None:
+        history = np.array([[1.0, 2.0, 3.0, 4.0], [np.nan, 2.0, 2.0, 4.0]])
+        np.testing.assert_allclose(rolling_mean(history, 2), [[1.5, 2.5, 3.5], [2.0, 2.0, 3.0]])
+        np.testing.assert_allclose(rolling_std(history, 2), [[0.5, 0.5, 0.5], [0.0, 0.0, 1.0]])
+
+    def test_ewma(self) -> None:
+        history = np.array([[np.nan, 1.0, 3.0, np.nan, 5.0]])
+        np.testing.assert_allclose(ewma(history, 0.5), [[np.nan, 1.0, 2.0, 2.0, 3.5]])
+        with self.assertRaises(ValueError):
+            ewma(history, 0.0)
+
+    def test_zscores_requires_baseline(self) -> None:
+        history = np.array([[1.0, 2.0, 3.0, 10.0], [np.nan, np.nan, 3.0, 10.0], [5.0, 5.0, 5.0, 9.0]])
+        score, mean, _std = zscores(history, window=3)
+        self.assertAlmostEqual(mean[0], 2.0)
+        self.assertAlmostEqual(score[0], 8.0 / np.std([1.0, 2.0, 3.0]))
+        # Too few baseline points, and zero variance, both yield NaN
+        self.assertTrue(np.isnan(score[1]))
+        self.assertTrue(np.isnan(score[2]))
+
+    def test_detect_anomalies_flags_only_outliers(self) -> None:
+        rng = np.random.default_rng(0)
+        metrics = [f"VAULT_{i}_PPS" for i in range(50)]
+        for hour in range(25):
+            values = 1.0 + rng.normal(0, 0.001, len(metrics))
+            if hour == 24:
+                values[7] = 0.9
+            self.store.append_many(zip(metrics, values), timestamp=hour * HOUR)
+
+        anomalies = detect_anomalies(self.store, metrics, window=24, threshold=6.0)
+        self.assertEqual([a.metric for a in anomalies], ["VAULT_7_PPS"])
+        self.assertLess(anomalies[0].zscore, -6.0)
+        self.assertAlmostEqual(anomalies[0].value, 0.9)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,129 @@
+"""Tests for utils/backtest.py and utils/snapshots.py — threshold replay over recorded snapshots."""
+
+import os
+import tempfile
+import unittest
+from dataclasses import asdict
+from unittest.mock import patch
+
+from compound.collateral import CollateralAsset, MarketData
+from utils.backtest import ThresholdSet, _compound_adapter, _morpho_adapter, parse_candidate, run_backtest
+from utils.snapshots import load_snapshots, record_snapshot
+
+STEAKHOUSE_USDC = "0xBEEF01735c132Ada46AA9aA4c54623cAA92A64CB"  # risk level 1 in morpho VAULTS_BY_CHAIN
+
+
+def _vault(unknown_market_ratio: float) -> dict:
+    """Morpho vault snapshot with one unknown (risk 5) market at the given allocation."""
+    total = 1_000_000.0
+
+    def allocation(key: str, supply: float) -> dict:
+        return {
+            "enabled": True,
+            "supplyAssetsUsd": supply,
+            "market": {
+                "uniqueKey": key,
+                "collateralAsset": {"symbol": "XYZ", "chain": {"id": 1}},
+                "loanAsset": {"symbol": "USDC"},
+            },
+        }
+
+    return {
+        "name": "Steakhouse USDC",
+        "address": STEAKHOUSE_USDC,
+        "chain": {"id": 1},
+        "state": {
+            "totalAssetsUsd": total,
+            "allocation": [allocation("0xunknown", total * unknown_market_ratio)],
+        },
+    }
+
+
+def _compound_market(comp_ratio: float) -> dict:
+    """Compound market snapshot (as recorded via ``asdict``) with WETH (tier 1) and COMP (tier 3) collateral."""
+
+    def asset(symbol: str, ratio: float) -> CollateralAsset:
+        # scale 1, price 1e8 → base_value equals total_supply_raw
+        return CollateralAsset(symbol, "0x" + symbol, "0xfeed", 1, 0.8, 0.85, 0, int(1_000_000 * ratio), 10**8)
+
+    market = MarketData(
+        name="cUSDCv3",
+        address="0xc3d688B66703497DAA19211EEdff47f25384cdc3",
+        risk_level=1,
+        base_scale=10**6,
+        base_price_raw=10**8,
+        total_supply_raw=10**12,
+        total_borrow_raw=5 * 10**11,
+        reserves_raw=0,
+        collaterals=[asset("WETH", 1 - comp_ratio), asset("COMP", comp_ratio)],
+    )
+    return asdict(market)
+
+
+class TestBacktest(unittest.TestCase):
+    def test_parse_candidate(self) -> None:
+        base = ThresholdSet("current", {1: 1.0, 2: 0.3}, {1: 1.1})
+        candidate = parse_candidate("tier2=0.25,risk1=1.5", base)
+        self.assertEqual(candidate.allocation_tiers, {1: 1.0, 2: 0.25})
+        self.assertEqual(candidate.max_risk_thresholds, {1: 1.5})
+        self.assertEqual(base.allocation_tiers[2], 0.3)
+        with self.assertRaises(ValueError):
+            parse_candidate("lltv=0.9", base)
+
+    def test_morpho_replay_counts_alerts_per_candidate(self) -> None:
+        adapter = _morpho_adapter()
+        current = ThresholdSet("current", adapter.default_allocation_tiers, adapter.default_max_risk_thresholds)
+        relaxed = parse_candidate("tier5=0.10", current)
+        snapshots = [(float(hour), [_vault(ratio)]) for hour, ratio in enumerate([0.005, 0.05, 0.3])]
+
+        results, replayed = run_backtest(adapter, snapshots, [current, relaxed])
+
+        self.assertEqual(replayed, 3)
+        # current: 0.05 and 0.3 exceed the 1% tier-5 allocation; 0.3 * 5 also exceeds max risk 1.1
+        self.assertEqual(results[0].alerts, 3)
+        self.assertEqual(results[0].snapshots_alerting, 2)
+        # relaxed: only 0.3 exceeds 10% allocation (plus the risk alert)
+        self.assertEqual(results[1].alerts, 2)
+        self.assertEqual(results[1].snapshots_alerting, 1)
+        self.assertEqual(results[1].alerts_by_entity, {"Steakhouse USDC": 2})
+
+    def test_compound_replay_decodes_recorded_markets(self) -> None:
+        adapter = _compound_adapter()
+        current = ThresholdSet("current", adapter.default_allocation_tiers, adapter.default_max_risk_thresholds)
+        relaxed = parse_candidate("tier3=0.25,risk1=1.5", current)
+        with tempfile.TemporaryDirectory() as tmpdir, patch.dict(os.environ, {"SNAPSHOT_DIR": tmpdir}):
+            for hour, ratio in enumerate([0.04, 0.2]):
+                record_snapshot("compound_markets_1", [_compound_market(ratio)], timestamp=float(hour))
+            snapshots = list(load_snapshots(os.path.join(tmpdir, "compound_markets_1.jsonl.gz")))
+
+        results, replayed = run_backtest(adapter, snapshots, [current, relaxed])
+
+        self.assertEqual(replayed, 2)
+        # current: 20% COMP exceeds the 10% tier-3 allocation, and 0.8 + 0.2 * 3 exceeds max risk 1.1
+        self.assertEqual(results[0].alerts, 2)
+        self.assertEqual(results[0].snapshots_alerting, 1)
+        self.assertEqual(results[0].alerts_by_entity, {"cUSDCv3": 2})
+        self.assertEqual(results[1].alerts, 0)
+
+    def test_snapshot_roundtrip(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir, patch.dict(os.environ, {"SNAPSHOT_DIR": tmpdir}):
+            record_snapshot("morpho_vaults", [_vault(0.01)], timestamp=1.0)
+            record_snapshot("morpho_vaults", [_vault(0.02)], timestamp=2.0)
+            snapshots = list(load_snapshots(os.path.join(tmpdir, "morpho_vaults.jsonl.gz")))
+
+        self.assertEqual([ts for ts, _ in snapshots], [1.0, 2.0])
+        self.assertEqual(snapshots[1][1][0]["state"]["allocation"][0]["supplyAssetsUsd"], 20_000.0)
+
+    def test_record_snapshot_disabled_without_dir(self) -> None:
+        with patch.dict(os.environ, {"SNAPSHOT_DIR": ""}), patch("utils.snapshots.gzip.open") as mock_open:
+            record_snapshot("morpho_vaults", [])
+        mock_open.assert_not_called()
+
+    def test_unserializable_snapshot_is_skipped(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir, patch.dict(os.environ, {"SNAPSHOT_DIR": tmpdir}):
+            record_snapshot("morpho_vaults", [object()], timestamp=1.0)
+            self.assertFalse(os.path.exists(os.path.join(tmpdir, "morpho_vaults.jsonl.gz")))
+
+
+if __name__ == "__main__":
+    unittest.main()
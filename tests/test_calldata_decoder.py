@@ -1,5 +1,8 @@
 """Tests for timelock/calldata_decoder.py."""
 
+import os
+import tempfile
+import time
 import unittest
 from unittest.mock import patch
 
@@ -11,8 +14,10 @@ from utils.calldata.decoder import (
     decode_calldata,
     format_call_lines,
     resolve_selector,
+    resolve_selectors,
 )
 from utils.calldata.known_selectors import KNOWN_SELECTORS
+from utils.calldata.selector_cache import SelectorCache
 
 # A selector guaranteed NOT to be in the local table, for testing API fallback.
 _UNKNOWN_SELECTOR = "0x11223344"
@@ -85,11 +90,23 @@ class TestFormatParamValue(unittest.TestCase):
         self.assertEqual(_format_param_value("tuple", (1, 2)), "(1, 2)")
 
 
+def _use_temp_selector_cache(test: unittest.TestCase) -> SelectorCache:
+    """Point resolve_selector at an empty persistent cache in a temp dir for the test."""
+    tmp = tempfile.TemporaryDirectory()
+    test.addCleanup(tmp.cleanup)
+    cache = SelectorCache(os.path.join(tmp.name, "selector-cache.json"), negative_ttl=60)
+    patcher = patch("utils.calldata.decoder.get_selector_cache", return_value=cache)
+    patcher.start()
+    test.addCleanup(patcher.stop)
+    return cache
+
+
 class TestResolveSelector(unittest.TestCase):
     """Tests for resolve_selector."""
 
     def setUp(self):
         _selector_cache.clear()
+        self.persistent = _use_temp_selector_cache(self)
 
     def test_known_selector_no_api_call(self):
         """Selectors in the local table should resolve without any API call."""
@@ -147,6 +164,85 @@ class TestResolveSelector(unittest.TestCase):
         result = resolve_selector(_UNKNOWN_SELECTOR)
         self.assertIsNone(result)
 
+    @patch("utils.calldata.decoder.fetch_json")
+    def test_persistent_cache_survives_restart(self, mock_fetch):
+        mock_fetch.return_value = {"result": {"function": {_UNKNOWN_SELECTOR: [{"name": "rare(uint256)"}]}}}
+        resolve_selector(_UNKNOWN_SELECTOR)
+
+        # A new process: empty runtime cache, same file
+        _selector_cache.clear()
+        with patch("utils.calldata.decoder.get_selector_cache", return_value=SelectorCache(self.persistent.filename)):
+            self.assertEqual(resolve_selector(_UNKNOWN_SELECTOR), "rare(uint256)")
+        mock_fetch.assert_called_once()
+
+    @patch("utils.calldata.decoder.fetch_json")
+    def test_failed_request_is_not_persisted(self, mock_fetch):
+        mock_fetch.return_value = None
+        resolve_selector(_UNKNOWN_SELECTOR)
+        self.assertEqual(self.persistent.get(_UNKNOWN_SELECTOR), (False, None))
+
+
+class TestResolveSelectors(unittest.TestCase):
+    """Tests for bulk resolve_selectors."""
+
+    def setUp(self):
+        _selector_cache.clear()
+        self.persistent = _use_temp_selector_cache(self)
+
+    @patch("utils.calldata.decoder.fetch_json")
+    def test_unknown_selectors_share_one_request(self, mock_fetch):
+        mock_fetch.return_value = {
+            "result": {"function": {"0x11111111": [{"name": "a()"}], "0x22222222": [{"name": "b()"}]}}
+        }
+        _selector_cache["0x44444444"] = "cached()"
+
+        result = resolve_selectors(["0xa9059cbb", "0x11111111", "0x22222222", "0x33333333", "0x44444444", "0x11111111"])
+
+        mock_fetch.assert_called_once()
+        self.assertEqual(mock_fetch.call_args.kwargs["params"], {"function": "0x11111111,0x22222222,0x33333333"})
+        self.assertEqual(
+            result,
+            {
+                "0xa9059cbb": "transfer(address,uint256)",
+                "0x11111111": "a()",
+                "0x22222222": "b()",
+                "0x33333333": None,
+                "0x44444444": "cached()",
+            },
+        )
+        self.assertEqual(self.persistent.get("0x22222222"), (True, "b()"))
+        self.assertEqual(self.persistent.get("0x33333333"), (True, None))
+
+    @patch("utils.calldata.decoder._SELECTOR_BATCH_SIZE", 2)
+    @patch("utils.calldata.decoder.fetch_json")
+    def test_large_lookups_are_chunked(self, mock_fetch):
+        mock_fetch.return_value = {"result": {"function": {}}}
+        resolve_selectors([f"0x0000000{i}" for i in range(5)])
+        self.assertEqual(mock_fetch.call_count, 3)
+
+
+class TestSelectorCache(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.filename = os.path.join(tmp.name, "selector-cache.json")
+
+    def test_positive_entries_never_expire(self):
+        SelectorCache(self.filename, negative_ttl=1).set("0xaabbccdd", "foo(uint256)")
+        with patch("utils.calldata.selector_cache.time.time", return_value=time.time() + 10**9):
+            self.assertEqual(SelectorCache(self.filename).get("0xaabbccdd"), (True, "foo(uint256)"))
+
+    def test_negative_entries_expire_after_ttl(self):
+        SelectorCache(self.filename).set("0xaabbccdd", None)
+        cache = SelectorCache(self.filename, negative_ttl=60)
+        self.assertEqual(cache.get("0xaabbccdd"), (True, None))
+        with patch("utils.calldata.selector_cache.time.time", return_value=time.time() + 61):
+            self.assertEqual(cache.get("0xaabbccdd"), (False, None))
+
+    def test_missing_file_is_a_miss(self):
+        self.assertEqual(SelectorCache(self.filename).get("0xaabbccdd"), (False, None))
+        self.assertFalse(os.path.exists(self.filename))
+
 
 class TestKnownSelectors(unittest.TestCase):
     """Sanity checks for the known_selectors table."""
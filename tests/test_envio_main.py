@@ -0,0 +1,37 @@
+"""Tests for envio/main.py — the combined Envio runner."""
+
+import unittest
+from unittest.mock import patch
+
+from envio import main as envio_main
+from yearn import alert_large_flows
+
+
+@patch("envio.main.send_or_save")
+@patch("envio.main.alert_large_flows.process_chain")
+@patch("envio.main.timelock_alerts.ingest_events")
+@patch("envio.main.fetch_combined", return_value={})
+@patch("sys.argv", ["envio/main.py", "--no-cache"])
+class TestMonitorIsolation(unittest.TestCase):
+    def test_timelock_failure_does_not_stop_large_flows(self, _fetch, mock_ingest, mock_flows, mock_send) -> None:
+        mock_ingest.side_effect = RuntimeError("https://rpc.example/?key=secret timed out")
+
+        envio_main.main()
+
+        self.assertEqual(mock_flows.call_count, len(alert_large_flows.DEFAULT_CHAIN_IDS))
+        messages = {c.args[0] for c in mock_send.call_args_list}
+        self.assertEqual(messages, {"⚠️ Timelock monitor failed (RuntimeError). See the workflow logs."})
+
+    def test_failed_chain_does_not_stop_other_chains(self, _fetch, mock_ingest, mock_flows, mock_send) -> None:
+        mock_flows.side_effect = [ValueError("bad page")] + [None] * (len(alert_large_flows.DEFAULT_CHAIN_IDS) - 1)
+
+        envio_main.main()
+
+        mock_ingest.assert_called_once()
+        self.assertEqual(mock_flows.call_count, len(alert_large_flows.DEFAULT_CHAIN_IDS))
+        mock_send.assert_called_once()
+        self.assertEqual(mock_send.call_args.args[1], alert_large_flows.PROTOCOL)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,172 @@
+import json
+import os
+import unittest
+from unittest.mock import MagicMock, patch
+
+import requests
+
+from utils.envio import EnvioSelection, build_query, fetch_combined
+from utils.graphql import GraphQLClient, GraphQLError, get_envio_client
+
+
+def _response(status: int, body: bytes = b'{"data": {"ok": true}}') -> requests.Response:
+    response = requests.Response()
+    response.status_code = status
+    response._content = body
+    response.url = "https://indexer.example/graphql"
+    return response
+
+
+@patch("utils.graphql.time.sleep")
+@patch("requests.Session.post")
+class TestGraphQLClient(unittest.TestCase):
+    def test_returns_payload_and_records_metrics(self, mock_post, mock_sleep):
+        mock_post.return_value = _response(200)
+        client = GraphQLClient("https://indexer.example/graphql", timeout=5, retries=2)
+
+        self.assertEqual(client.execute("{ ok }", {"a": 1}), {"data": {"ok": True}})
+        kwargs = mock_post.call_args.kwargs
+        self.assertEqual(kwargs["json"], {"query": "{ ok }", "variables": {"a": 1}})
+        self.assertEqual(kwargs["timeout"], 5)
+        self.assertEqual(client.metrics.requests, 1)
+        self.assertEqual(client.metrics.bytes_received, len(b'{"data": {"ok": true}}'))
+        mock_sleep.assert_not_called()
+
+    def test_retries_transient_errors_with_jitter(self, mock_post, mock_sleep):
+        mock_post.side_effect = [_response(503), requests.ConnectionError("reset"), _response(200)]
+        client = GraphQLClient("https://indexer.example/graphql", retries=2, backoff_factor=1.0)
+
+        with patch("utils.graphql.random.uniform", return_value=0.5) as mock_uniform:
+            self.assertEqual(client.execute("{ ok }"), {"data": {"ok": True}})
+        self.assertEqual([c.args for c in mock_uniform.call_args_list], [(0, 2.0), (0, 4.0)])
+        self.assertEqual(mock_sleep.call_count, 2)
+        self.assertEqual(client.metrics.retries, 2)
+        self.assertEqual(client.metrics.failures, 0)
+
+    def test_client_errors_are_not_retried(self, mock_post, mock_sleep):
+        mock_post.return_value = _response(400, b"bad query")
+        client = GraphQLClient("https://indexer.example/graphql", retries=3)
+
+        with self.assertRaises(requests.HTTPError):
+            client.execute("{ ok }")
+        self.assertEqual(mock_post.call_count, 1)
+        self.assertEqual(client.metrics.failures, 1)
+
+    def test_raises_after_retries_exhausted(self, mock_post, mock_sleep):
+        mock_post.return_value = _response(502)
+        client = GraphQLClient("https://indexer.example/graphql", retries=1)
+
+        with self.assertRaises(requests.HTTPError):
+            client.execute("{ ok }")
+        self.assertEqual(mock_post.call_count, 2)
+        self.assertEqual(client.metrics.failures, 1)
+
+    def test_envio_client_requires_url(self, mock_post, mock_sleep):
+        with patch.dict(os.environ, {"ENVIO_GRAPHQL_URL": ""}):
+            with self.assertRaises(RuntimeError):
+                get_envio_client()
+        with patch.dict(os.environ, {"ENVIO_GRAPHQL_URL": "https://envio.example/v1/graphql"}):
+            self.assertIs(get_envio_client(), get_envio_client())
+
+
+def _page(items: list) -> requests.Response:
+    return _response(200, json.dumps({"data": {"things": {"items": items}}}).encode())
+
+
+@patch("requests.Session.post")
+class TestGraphQLPagination(unittest.TestCase):
+    client = GraphQLClient("https://indexer.example/graphql", retries=0)
+
+    def test_keyset_pages_follow_last_cursor(self, mock_post):
+        mock_post.side_effect = [_page([{"id": "a"}, {"id": "b"}]), _page([{"id": "c"}])]
+
+        items = list(self.client.paginate("q", "things.items", {"x": 1}, page_size=2))
+        self.assertEqual([item["id"] for item in items], ["a", "b", "c"])
+        variables = [c.kwargs["json"]["variables"] for c in mock_post.call_args_list]
+        self.assertEqual(variables, [{"x": 1, "first": 2, "cursor": ""}, {"x": 1, "first": 2, "cursor": "b"}])
+
+    def test_int_cursor_stays_int(self, mock_post):
+        mock_post.side_effect = [_page([{"proposalId": "7"}]), _page([])]
+
+        items = list(
+            self.client.paginate(
+                "q", "things.items", {"lastId": 5}, page_size=1, cursor_field="proposalId", cursor_variable="lastId"
+            )
+        )
+        self.assertEqual(len(items), 1)
+        self.assertEqual(mock_post.call_args.kwargs["json"]["variables"]["lastId"], 7)
+
+    def test_offset_pagination(self, mock_post):
+        mock_post.side_effect = [_page([1, 2]), _page([])]
+
+        self.assertEqual(list(self.client.paginate("q", "things.items", page_size=2, cursor_field=None)), [1, 2])
+        self.assertEqual(mock_post.call_args.kwargs["json"]["variables"], {"first": 2, "skip": 2})
+
+    def test_pages_are_fetched_lazily(self, mock_post):
+        mock_post.side_effect = [_page([{"id": "a"}]), _page([])]
+
+        pages = self.client.paginate("q", "things.items", page_size=1)
+        next(pages)
+        self.assertEqual(mock_post.call_count, 1)
+
+    def test_errors_raise(self, mock_post):
+        mock_post.return_value = _response(200, b'{"errors": [{"message": "bad"}]}')
+
+        with self.assertRaises(GraphQLError) as ctx:
+            list(self.client.paginate("q", "things.items"))
+        self.assertEqual(ctx.exception.errors, [{"message": "bad"}])
+
+    def test_batch_posts_one_request_when_supported(self, mock_post):
+        mock_post.return_value = _response(200, b'[{"data": {"a": 1}}, {"data": {"b": 2}}]')
+        client = GraphQLClient("https://indexer.example/graphql", retries=0, batching=True)
+
+        responses = client.execute_batch([("{ a }", None), ("{ b }", {"v": 1})])
+        self.assertEqual(responses, [{"data": {"a": 1}}, {"data": {"b": 2}}])
+        self.assertEqual(mock_post.call_count, 1)
+        self.assertEqual(mock_post.call_args.kwargs["json"][1], {"query": "{ b }", "variables": {"v": 1}})
+
+    def test_batch_falls_back_to_one_request_per_operation(self, mock_post):
+        mock_post.return_value = _response(200)
+
+        self.assertEqual(len(self.client.execute_batch([("{ a }", None), ("{ b }", None)])), 2)
+        self.assertEqual(mock_post.call_count, 2)
+
+
+class TestEnvioQueries(unittest.TestCase):
+    def _selection(self, alias: str, entity: str = "Deposit") -> EnvioSelection:
+        return EnvioSelection(alias, entity, {"chainId": {"_eq": 1}}, 10, ("id", "logIndex"), ("blockNumber",))
+
+    def test_build_query_aliases_each_selection_with_own_variables(self):
+        query, variables = build_query([self._selection("deposits"), self._selection("events", "TimelockEvent")])
+        self.assertIn("$depositsWhere: Deposit_bool_exp!", query)
+        self.assertIn("$eventsWhere: TimelockEvent_bool_exp!", query)
+        self.assertIn(
+            "events: TimelockEvent(where: $eventsWhere order_by: { blockNumber: asc } limit: $eventsLimit)", query
+        )
+        self.assertEqual(variables["depositsLimit"], 10)
+        self.assertEqual(variables["eventsWhere"], {"chainId": {"_eq": 1}})
+        with self.assertRaises(ValueError):
+            build_query([self._selection("deposits"), self._selection("deposits")])
+
+    def test_fetch_combined_splits_one_response_by_group(self):
+        client = MagicMock()
+        client.data.return_value = {"timelock_events": [{"id": "t"}], "flows1_deposits": [{"id": "d"}]}
+
+        data = fetch_combined(
+            {
+                "timelock": [self._selection("events", "TimelockEvent")],
+                "flows1": [self._selection("deposits"), self._selection("withdrawals", "Withdraw")],
+            },
+            client,
+        )
+
+        client.data.assert_called_once()
+        self.assertIn("flows1_withdrawals: Withdraw(", client.data.call_args.args[0])
+        self.assertEqual(
+            data,
+            {"timelock": {"events": [{"id": "t"}]}, "flows1": {"deposits": [{"id": "d"}], "withdrawals": []}},
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
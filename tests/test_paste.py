@@ -13,7 +13,7 @@ class TestUploadToPaste(unittest.TestCase):
         result = upload_to_paste("")
         self.assertEqual(result, "")
 
-    @patch("utils.paste.requests.post")
+    @patch("utils.paste.requests.Session.post")
     def test_successful_upload(self, mock_post: MagicMock) -> None:
         mock_response = MagicMock()
         mock_response.text = '"https://dpaste.com/abc123"\n'
@@ -28,7 +28,7 @@ class TestUploadToPaste(unittest.TestCase):
         self.assertEqual(call_kwargs[1]["data"]["title"], "Test")
         self.assertEqual(call_kwargs[1]["data"]["expiry_days"], 7)
 
-    @patch("utils.paste.requests.post")
+    @patch("utils.paste.requests.Session.post")
     def test_custom_expiry(self, mock_post: MagicMock) -> None:
         mock_response = MagicMock()
         mock_response.text = "https://dpaste.com/xyz789"
@@ -40,7 +40,7 @@ class TestUploadToPaste(unittest.TestCase):
         self.assertEqual(call_kwargs[1]["data"]["expiry_days"], 15)
         self.assertEqual(result, "https://dpaste.com/xyz789")
 
-    @patch("utils.paste.requests.post")
+    @patch("utils.paste.requests.Session.post")
     def test_request_failure_returns_empty(self, mock_post: MagicMock) -> None:
         import requests
 
@@ -48,7 +48,7 @@ class TestUploadToPaste(unittest.TestCase):
         result = upload_to_paste("Some content")
         self.assertEqual(result, "")
 
-    @patch("utils.paste.requests.post")
+    @patch("utils.paste.requests.Session.post")
     def test_no_title(self, mock_post: MagicMock) -> None:
         mock_response = MagicMock()
         mock_response.text = "https://dpaste.com/notitle"
@@ -0,0 +1,80 @@
+"""Tests for utils/proxy.py — upgrade detection and batched implementation lookups."""
+
+import unittest
+from unittest.mock import MagicMock, patch
+
+from utils import proxy
+from utils.proxy import get_current_implementation, prefetch_implementations, upgrade_targets
+
+PROXY_A = "0x" + "aa" * 20
+PROXY_B = "0x" + "bb" * 20
+IMPL = "0x" + "12" * 20
+# upgradeTo(IMPL)
+UPGRADE_CALLDATA = "0x3659cfe6" + "00" * 12 + "12" * 20
+
+
+def _slot(address: str) -> bytes:
+    return bytes(12) + bytes.fromhex(address[2:])
+
+
+def _client(responses: list) -> MagicMock:
+    client = MagicMock()
+    client.batch_requests.return_value.__enter__.return_value = MagicMock()
+    client.execute_batch.return_value = responses
+    return client
+
+
+class TestImplementationLookups(unittest.TestCase):
+    def setUp(self) -> None:
+        proxy._implementation_cache.clear()
+        self.addCleanup(proxy._implementation_cache.clear)
+
+    def test_upgrade_targets_filters_upgrade_calls(self) -> None:
+        calls = [(PROXY_A, UPGRADE_CALLDATA, 1), (PROXY_B, "0xa9059cbb" + "00" * 64, 1), (PROXY_B, UPGRADE_CALLDATA, 0)]
+        self.assertEqual(upgrade_targets(calls), [(PROXY_A, 1)])
+
+    @patch("utils.web3_wrapper.ChainManager.get_client")
+    def test_prefetch_batches_per_chain_and_memoizes(self, mock_get_client) -> None:
+        mainnet = _client([_slot(IMPL), bytes(32)])
+        base = _client([_slot(IMPL)])
+        mock_get_client.side_effect = lambda chain: mainnet if chain.chain_id == 1 else base
+
+        prefetch_implementations(
+            [(PROXY_A, 1), (PROXY_B, 1), (PROXY_A.upper().replace("0X", "0x"), 1), (PROXY_A, 8453)]
+        )
+
+        self.assertEqual(mainnet.execute_batch.call_count, 1)
+        self.assertEqual(mainnet.eth.get_storage_at.call_count, 2)
+        self.assertEqual(base.execute_batch.call_count, 1)
+
+        mainnet.eth.get_storage_at.reset_mock()
+        self.assertEqual(get_current_implementation(PROXY_A, 1).lower(), IMPL)
+        self.assertIsNone(get_current_implementation(PROXY_B, 1))
+        mainnet.eth.get_storage_at.assert_not_called()
+
+        # Already cached, so no new batch
+        prefetch_implementations([(PROXY_A, 1)])
+        self.assertEqual(mainnet.execute_batch.call_count, 1)
+
+    @patch("utils.web3_wrapper.ChainManager.get_client")
+    def test_failed_batch_falls_back_to_single_reads(self, mock_get_client) -> None:
+        client = _client([])
+        client.execute_batch.side_effect = RuntimeError("batch not supported")
+        client.eth.get_storage_at.return_value = _slot(IMPL)
+        mock_get_client.return_value = client
+
+        prefetch_implementations([(PROXY_A, 1)])
+        self.assertEqual(get_current_implementation(PROXY_A, 1).lower(), IMPL)
+
+    @patch("utils.web3_wrapper.ChainManager.get_client")
+    def test_failed_single_read_is_not_cached(self, mock_get_client) -> None:
+        client = _client([])
+        client.eth.get_storage_at.side_effect = [ConnectionError("rpc down"), _slot(IMPL)]
+        mock_get_client.return_value = client
+
+        self.assertIsNone(get_current_implementation(PROXY_A, 1))
+        self.assertEqual(get_current_implementation(PROXY_A, 1).lower(), IMPL)
+
+
+if __name__ == "__main__":
+    unittest.main()
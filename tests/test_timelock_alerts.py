@@ -1,10 +1,21 @@
-"""Tests for timelock/timelock_alerts.py — build_alert_message truncation logic."""
+"""Tests for timelock/timelock_alerts.py — message truncation and paginated ingestion."""
 
+import threading
+import time
 import unittest
 from unittest.mock import patch
 
-from timelock.timelock_alerts import TimelockConfig, build_alert_message
-from utils.telegram import MAX_MESSAGE_LENGTH
+from timelock.timelock_alerts import (
+    CACHE_KEY,
+    EventCursor,
+    TimelockConfig,
+    _complete_operations,
+    build_alert_message,
+    enrich_operations,
+    ingest_events,
+)
+from utils.llm.ai_explainer import simulation_key
+from utils.telegram import MAX_MESSAGE_LENGTH, TelegramError
 
 
 def _make_event(
@@ -112,5 +123,169 @@ class TestBuildAlertMessageTruncation(unittest.TestCase):
         self.assertNotIn("...", msg)
 
 
+def _page_event(ts: int, block: int, log_index: int, operation_id: str = "", timelock_type: str = "Compound") -> dict:
+    return _make_event(
+        timelock_type,
+        id=f"{block}_{log_index}",
+        blockTimestamp=str(ts),
+        blockNumber=str(block),
+        logIndex=str(log_index),
+        operationId=operation_id or f"op-{block}-{log_index}",
+    )
+
+
+class TestEventCursor(unittest.TestCase):
+    def test_round_trip(self) -> None:
+        cursor = EventCursor(1700000000, 18000000, 7)
+        self.assertEqual(EventCursor.parse(str(cursor)), cursor)
+        self.assertEqual(EventCursor.parse("1700000000"), EventCursor(1700000000))
+
+    def test_where_breaks_ties_within_timestamp(self) -> None:
+        self.assertEqual(EventCursor(5).where(), {"blockTimestamp": {"_gt": 5}})
+        clauses = EventCursor(5, 10, 2).where()["_or"]
+        self.assertIn({"blockTimestamp": {"_eq": 5}, "blockNumber": {"_eq": 10}, "logIndex": {"_gt": 2}}, clauses)
+
+
+class TestPaginatedIngestion(unittest.TestCase):
+    def test_trailing_operation_held_back(self) -> None:
+        controller = "TimelockController"
+        events = [
+            _page_event(1, 1, 0, timelock_type=controller),
+            _page_event(1, 1, 1, "batch", controller),
+            _page_event(1, 1, 2, "batch", controller),
+        ]
+        self.assertEqual(_complete_operations(events), events[:1])
+        single = [_page_event(1, 1, 0, "batch", controller), _page_event(1, 1, 1, "batch", controller)]
+        self.assertEqual(_complete_operations(single), single)
+        # Other timelock types emit one event per operation, so nothing is held back
+        self.assertEqual(_complete_operations(events[:1] + [_page_event(1, 1, 3)]), events[:1] + [_page_event(1, 1, 3)])
+
+    @patch("timelock.timelock_alerts.write_last_value_to_file")
+    @patch("timelock.timelock_alerts.process_events")
+    @patch("timelock.timelock_alerts.load_events")
+    def test_pages_until_caught_up_committing_each_page(self, mock_load, mock_process, mock_write) -> None:
+        # Three events share a timestamp, so a timestamp-only cursor would skip the third
+        pages = [
+            [_page_event(100, 1, 0), _page_event(100, 1, 1)],
+            [_page_event(100, 1, 2)],
+        ]
+        mock_load.side_effect = [{"data": {"TimelockEvent": page}} for page in pages]
+
+        self.assertTrue(ingest_events(2, EventCursor(50), use_cache=True))
+        self.assertEqual([c.args[1] for c in mock_load.call_args_list], [EventCursor(50), EventCursor(100, 1, 1)])
+        self.assertEqual(mock_process.call_count, 2)
+        self.assertEqual(
+            [c.args[1:] for c in mock_write.call_args_list],
+            [(CACHE_KEY, "100+1+1"), (CACHE_KEY, "100+1+2")],
+        )
+
+    @patch("timelock.timelock_alerts.write_last_value_to_file")
+    @patch("timelock.timelock_alerts.process_events")
+    @patch("timelock.timelock_alerts.load_events")
+    def test_prefetched_first_page_is_not_fetched_again(self, mock_load, mock_process, mock_write) -> None:
+        first_page = {"data": {"TimelockEvent": [_page_event(100, 1, 0), _page_event(100, 1, 1)]}}
+        mock_load.return_value = {"data": {"TimelockEvent": []}}
+
+        self.assertTrue(ingest_events(2, EventCursor(50), use_cache=False, first_page=first_page))
+        # Only the page after the full prefetched one is requested
+        self.assertEqual([c.args[1] for c in mock_load.call_args_list], [EventCursor(100, 1, 1)])
+        self.assertEqual(mock_process.call_args_list[0].args[0], first_page["data"]["TimelockEvent"])
+
+    @patch("timelock.timelock_alerts.send_or_save")
+    @patch("timelock.timelock_alerts.write_last_value_to_file")
+    @patch("timelock.timelock_alerts.process_events")
+    @patch("timelock.timelock_alerts.load_events")
+    def test_failed_page_keeps_committed_cursor(self, mock_load, mock_process, mock_write, mock_send) -> None:
+        mock_load.side_effect = [{"data": {"TimelockEvent": [_page_event(100, 1, 0)]}}, None]
+
+        self.assertFalse(ingest_events(1, EventCursor(50), [TIMELOCK_INFO]))
+        self.assertEqual(mock_write.call_args.args[1:], (CACHE_KEY, "100+1+0"))
+        mock_send.assert_called_once()
+
+    @patch("utils.outbox.save_undelivered")
+    @patch("utils.outbox.send_telegram_message", side_effect=TelegramError("down"))
+    @patch("timelock.timelock_alerts.load_events")
+    def test_graphql_errors_alert_is_saved_when_telegram_fails(self, mock_load, _mock_send, mock_save) -> None:
+        mock_load.return_value = {"errors": [{"message": "bad query"}]}
+
+        self.assertFalse(ingest_events(1, EventCursor(50), [TIMELOCK_INFO]))
+        self.assertIn("GraphQL errors", mock_save.call_args.args[0])
+
+
+@patch("timelock.timelock_alerts.prefetch_implementations")
+@patch("timelock.timelock_alerts.resolve_selectors")
+class TestEnrichOperations(unittest.TestCase):
+    def _operations(self, count: int) -> dict:
+        return {f"op{i}": ([_page_event(1, 1, i, f"op{i}")], TIMELOCK_INFO) for i in range(count)}
+
+    def test_explanations_run_concurrently(self, mock_resolve, mock_prefetch) -> None:
+        barrier = threading.Barrier(3, timeout=2)
+
+        def explain(events, timelock_info, chain_id, simulations=None):
+            barrier.wait()  # only passes if all three run at once
+            return f"summary {events[0]['operationId']}"
+
+        with patch("timelock.timelock_alerts._get_ai_explanation", side_effect=explain):
+            results = enrich_operations(self._operations(3), deadline=5)
+        self.assertEqual(results, {f"op{i}": f"summary op{i}" for i in range(3)})
+
+    def test_lookups_finish_before_explanations(self, mock_resolve, mock_prefetch) -> None:
+        resolved = threading.Event()
+        mock_resolve.side_effect = lambda selectors: resolved.set()
+        seen = []
+
+        def explain(events, timelock_info, chain_id, simulations=None):
+            seen.append(resolved.is_set())
+
+        operations = {"op": ([_make_event(data="0xa9059cbb" + "00" * 64)], TIMELOCK_INFO)}
+        with patch("timelock.timelock_alerts._get_ai_explanation", side_effect=explain):
+            enrich_operations(operations, deadline=5)
+        self.assertEqual(seen, [True])
+        mock_prefetch.assert_called_once()
+
+    def test_deadline_drops_slow_explanations(self, mock_resolve, mock_prefetch) -> None:
+        release = threading.Event()
+        self.addCleanup(release.set)
+
+        def explain(events, timelock_info, chain_id, simulations=None):
+            if events[0]["operationId"] == "op1":
+                release.wait(5)
+            return "summary"
+
+        started = time.monotonic()
+        with patch("timelock.timelock_alerts._get_ai_explanation", side_effect=explain):
+            results = enrich_operations(self._operations(2), deadline=0.2)
+        self.assertLess(time.monotonic() - started, 2)
+        self.assertEqual(results, {"op0": "summary", "op1": None})
+
+    def test_simulations_run_in_their_own_stage(self, mock_resolve, mock_prefetch) -> None:
+        data = "0xa9059cbb" + "00" * 64
+        event = _make_event(data=data)
+        seen = {}
+
+        def simulate(**kwargs):
+            seen["daemon"] = threading.current_thread().daemon
+            return "simulated"
+
+        def explain(events, timelock_info, chain_id, simulations=None):
+            seen["simulations"] = simulations
+
+        with (
+            patch("timelock.timelock_alerts.simulate_transaction", side_effect=simulate) as mock_simulate,
+            patch("timelock.timelock_alerts._get_ai_explanation", side_effect=explain),
+        ):
+            enrich_operations({"op": ([event], TIMELOCK_INFO)}, deadline=5)
+        mock_simulate.assert_called_once()
+        self.assertEqual(mock_simulate.call_args.kwargs["from_address"], TIMELOCK_INFO.address)
+        self.assertEqual(seen["simulations"], {simulation_key(event["target"], data, int(event["value"])): "simulated"})
+        self.assertTrue(seen["daemon"])
+
+    def test_precomputed_explanation_skips_ai_call(self, mock_resolve, mock_prefetch) -> None:
+        with patch("timelock.timelock_alerts._get_ai_explanation") as mock_ai:
+            msg = build_alert_message([_make_event()], TIMELOCK_INFO, None, explain=False)
+        mock_ai.assert_not_called()
+        self.assertIn("TIMELOCK", msg)
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,86 @@
+"""Tests for utils/timeseries.py — append-only metric history store."""
+
+import os
+import tempfile
+import time
+import unittest
+
+from utils.timeseries import RECORD_SIZE, MetricPoint, MetricStore, record_metrics
+
+HOUR = 3600
+
+
+class TestMetricStore(unittest.TestCase):
+    """Tests for MetricStore reads, writes and retention."""
+
+    def setUp(self) -> None:
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.filename = os.path.join(self.tmpdir.name, "timeseries.bin")
+        self.store = MetricStore(self.filename, retention_seconds=48 * HOUR)
+
+    def tearDown(self) -> None:
+        self.tmpdir.cleanup()
+
+    def test_empty_store(self) -> None:
+        self.assertEqual(self.store.series("PPS"), [])
+        self.assertIsNone(self.store.latest("PPS"))
+        self.assertEqual(self.store.max_drawdown("PPS", HOUR, now=0), 0.0)
+
+    def test_append_and_series_filters_by_metric(self) -> None:
+        for hour in range(5):
+            self.store.append_many([("PPS", 1.0 + hour), ("TVL", 100.0 * hour)], timestamp=hour * HOUR)
+
+        self.assertEqual(os.path.getsize(self.filename), 10 * RECORD_SIZE)
+        self.assertEqual([p.value for p in self.store.series("PPS")], [1.0, 2.0, 3.0, 4.0, 5.0])
+        self.assertEqual(
+            self.store.series("TVL", since=HOUR, until=3 * HOUR),
+            [MetricPoint(HOUR, 100.0), MetricPoint(2 * HOUR, 200.0), MetricPoint(3 * HOUR, 300.0)],
+        )
+
+    def test_value_ago(self) -> None:
+        for hour in range(10):
+            self.store.append("PPS", float(hour), timestamp=hour * HOUR)
+
+        self.assertEqual(self.store.latest("PPS"), MetricPoint(9 * HOUR, 9.0))
+        self.assertEqual(self.store.value_ago("PPS", 3 * HOUR, now=9 * HOUR), MetricPoint(6 * HOUR, 6.0))
+        # Between samples the previous point is returned
+        self.assertEqual(self.store.value_ago("PPS", 90 * 60, now=9 * HOUR), MetricPoint(7 * HOUR, 7.0))
+        self.assertIsNone(self.store.value_ago("PPS", 20 * HOUR, now=9 * HOUR))
+
+    def test_max_drawdown(self) -> None:
+        for hour, value in enumerate([100.0, 120.0, 90.0, 110.0, 60.0, 130.0]):
+            self.store.append("TVL", value, timestamp=hour * HOUR)
+
+        self.assertAlmostEqual(self.store.max_drawdown("TVL", 10 * HOUR, now=5 * HOUR), 0.5)
+        # Window starting after the 120 peak only sees 110 -> 60
+        self.assertAlmostEqual(self.store.max_drawdown("TVL", 2 * HOUR, now=5 * HOUR), 50 / 110)
+
+    def test_record_metrics_logs_storage_errors(self) -> None:
+        self.store.append("PPS", 1.0, timestamp=time.time() + HOUR)
+        with self.assertLogs("utils.timeseries", level="WARNING"):
+            self.assertFalse(record_metrics([("PPS", 2.0)], self.filename))
+        self.assertTrue(record_metrics([("TVL", 3.0)], os.path.join(self.tmpdir.name, "new.bin")))
+
+    def test_out_of_order_append_rejected(self) -> None:
+        self.store.append("PPS", 1.0, timestamp=10 * HOUR)
+        with self.assertRaises(ValueError):
+            self.store.append("PPS", 1.0, timestamp=9 * HOUR)
+
+    def test_compact_drops_expired_records(self) -> None:
+        for hour in range(10):
+            self.store.append("PPS", float(hour), timestamp=hour * HOUR)
+
+        removed = self.store.compact(now=53 * HOUR)
+        self.assertEqual(removed, 5)
+        self.assertEqual([p.value for p in self.store.series("PPS")], [5.0, 6.0, 7.0, 8.0, 9.0])
+
+    def test_append_compacts_past_retention(self) -> None:
+        self.store.append("PPS", 1.0, timestamp=0)
+        self.store.append("PPS", 2.0, timestamp=HOUR)
+        self.store.append("PPS", 3.0, timestamp=60 * HOUR)
+
+        self.assertEqual(self.store.series("PPS"), [MetricPoint(60 * HOUR, 3.0)])
+
+
+if __name__ == "__main__":
+    unittest.main()
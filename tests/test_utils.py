@@ -1,17 +1,49 @@
 """Tests for utility functions."""
 
 import importlib
+import json
 import os
 import sys
+import tempfile
+import time
 import types
 import unittest
 from unittest.mock import MagicMock, patch
 
 import requests
 
-from utils.alert import Alert, AlertSeverity, register_alert_hook, send_alert
+from utils.alert import (
+    Alert,
+    AlertFingerprint,
+    AlertOutbox,
+    AlertSeverity,
+    AlertStateStore,
+    alert_digest,
+    disable_alert_outbox,
+    enable_alert_outbox,
+    flush_alerts,
+    register_alert_hook,
+    resolve_alert,
+    send_alert,
+    set_alert_state_store,
+)
+from utils.cache import (
+    STATE_COMPACT_MIN_LINES,
+    STATE_LOG_HEADER,
+    StateStore,
+    detect_cache_format,
+    get_last_value_for_key_from_file,
+    key_namespace,
+    load_cache_entries,
+    save_cache_entries,
+    write_last_value_to_file,
+)
 from utils.config import Config, ProtocolConfig
-from utils.telegram import TelegramError, send_telegram_message
+from utils.gauntlet import GauntletClient
+from utils.http import cached_get_json, close_sessions, get_session, iter_json_items, stream_json_items
+from utils.outbox import PendingAlert, _encode, pending_alerts, retry_undelivered, save_undelivered, send_or_save
+from utils.outbox import main as outbox_main
+from utils.telegram import MAX_MESSAGE_LENGTH, TelegramError, chunk_messages, send_telegram_message
 
 
 class TestConfig(unittest.TestCase):
@@ -70,7 +102,7 @@ class TestConfig(unittest.TestCase):
 class TestTelegram(unittest.TestCase):
     """Tests for Telegram utility functions."""
 
-    @patch("utils.telegram.requests.post")
+    @patch("utils.telegram.requests.Session.post")
     def test_send_telegram_message_success(self, mock_post):
         # Setup mock response
         mock_response = unittest.mock.Mock()
@@ -108,7 +140,7 @@ class TestTelegram(unittest.TestCase):
             # Verify no request was made
             mock_get.assert_not_called()
 
-    @patch("utils.telegram.requests.post")
+    @patch("utils.telegram.requests.Session.post")
     def test_send_telegram_message_failure(self, mock_post):
         # Setup mock response for failure
         mock_post.side_effect = requests.RequestException("Connection error")
@@ -126,7 +158,7 @@ class TestTelegram(unittest.TestCase):
             with self.assertRaises(TelegramError):
                 send_telegram_message("Test message", "test")
 
-    @patch("utils.telegram.requests.post")
+    @patch("utils.telegram.requests.Session.post")
     def test_send_telegram_message_with_topic(self, mock_post):
         """When TELEGRAM_TOPIC_ID is set, message goes to topics chat with message_thread_id."""
         mock_response = unittest.mock.Mock()
@@ -152,7 +184,7 @@ class TestTelegram(unittest.TestCase):
             self.assertEqual(kwargs["json"]["message_thread_id"], 42)
             self.assertIn("default_token", url)
 
-    @patch("utils.telegram.requests.post")
+    @patch("utils.telegram.requests.Session.post")
     def test_send_telegram_message_topic_uses_default_bot(self, mock_post):
         """Topic routing always uses the default bot, even if protocol-specific bot exists."""
         mock_response = unittest.mock.Mock()
@@ -175,7 +207,7 @@ class TestTelegram(unittest.TestCase):
             self.assertIn("default_token", url)
             self.assertNotIn("aave_specific_token", url)
 
-    @patch("utils.telegram.requests.post")
+    @patch("utils.telegram.requests.Session.post")
     def test_send_telegram_message_no_topic_falls_back(self, mock_post):
         """Without topic ID, uses legacy per-protocol chat routing."""
         mock_response = unittest.mock.Mock()
@@ -197,6 +229,21 @@ class TestTelegram(unittest.TestCase):
             self.assertEqual(kwargs["json"]["chat_id"], "aave_chat_id")
             self.assertNotIn("message_thread_id", kwargs["json"])
 
+    @patch("utils.telegram.requests.Session.post")
+    def test_send_telegram_message_rate_limited(self, mock_post):
+        response = requests.Response()
+        response.status_code = 429
+        response._content = b'{"ok": false, "parameters": {"retry_after": 12}}'
+        mock_post.return_value = response
+
+        with patch.dict(
+            os.environ,
+            {"TELEGRAM_BOT_TOKEN_TEST": "t", "TELEGRAM_CHAT_ID_TEST": "c", "LOG_LEVEL": "INFO"},
+        ):
+            with self.assertRaises(TelegramError) as ctx:
+                send_telegram_message("Test", "test")
+        self.assertEqual(ctx.exception.retry_after, 12)
+
 
 class TestAlert(unittest.TestCase):
     """Tests for the Alert system."""
@@ -337,10 +384,234 @@ class TestAlert(unittest.TestCase):
             register_alert_hook(None)
 
 
+class TestAlertOutbox(unittest.TestCase):
+    """Tests for asynchronous alert delivery."""
+
+    def setUp(self):
+        self.addCleanup(disable_alert_outbox)
+
+    @patch("utils.alert.send_telegram_message")
+    def test_send_alert_enqueues_and_flushes(self, mock_send):
+        outbox = enable_alert_outbox(AlertOutbox(chat_interval=0, global_interval=0))
+        send_alert(Alert(AlertSeverity.HIGH, "queued", "proto"))
+        self.assertTrue(flush_alerts(timeout=5))
+        mock_send.assert_called_once()
+        args, kwargs = mock_send.call_args
+        self.assertEqual(args, ("🚨 queued", "proto", False, False))
+        self.assertIsNotNone(kwargs["session"])
+        self.assertEqual(outbox.sent, 1)
+
+    @patch("utils.alert.time.sleep")
+    @patch("utils.alert.send_telegram_message")
+    def test_honors_retry_after(self, mock_send, mock_sleep):
+        mock_send.side_effect = [TelegramError("429", retry_after=7), None]
+        outbox = enable_alert_outbox(AlertOutbox(chat_interval=0, global_interval=0))
+        send_alert(Alert(AlertSeverity.LOW, "m", "proto"))
+        self.assertTrue(flush_alerts(timeout=5))
+        self.assertEqual(mock_send.call_count, 2)
+        self.assertAlmostEqual(mock_sleep.call_args[0][0], 7, delta=0.5)
+        self.assertEqual(outbox.failed, [])
+
+    @patch("utils.alert.save_undelivered")
+    @patch("utils.alert.send_telegram_message")
+    def test_gives_up_after_max_attempts(self, mock_send, mock_save):
+        mock_send.side_effect = TelegramError("boom")
+        outbox = enable_alert_outbox(AlertOutbox(chat_interval=0, global_interval=0, max_attempts=2))
+        send_alert(Alert(AlertSeverity.MEDIUM, "m", "proto"))
+        self.assertTrue(flush_alerts(timeout=5))
+        self.assertEqual(mock_send.call_count, 2)
+        # Give-ups are moved to the durable outbox on flush
+        mock_save.assert_called_once_with("⚠️ m", "proto", False, False)
+        self.assertEqual(outbox.failed, [])
+
+    @patch("utils.alert.send_telegram_message")
+    def test_paces_messages_per_chat(self, mock_send):
+        sent_at = []
+        mock_send.side_effect = lambda *args, **kwargs: sent_at.append(time.monotonic())
+        with patch.dict(os.environ, {"TELEGRAM_BOT_TOKEN_P": "t", "TELEGRAM_CHAT_ID_P": "chat"}):
+            enable_alert_outbox(AlertOutbox(chat_interval=0.05, global_interval=0))
+            for i in range(3):
+                send_alert(Alert(AlertSeverity.LOW, str(i), "p"))
+            self.assertTrue(flush_alerts(timeout=5))
+        self.assertEqual(len(sent_at), 3)
+        self.assertGreaterEqual(sent_at[2] - sent_at[0], 0.09)
+
+
+class TestAlertDigest(unittest.TestCase):
+    """Tests for per-channel digest batching."""
+
+    def test_chunk_messages_respects_limit(self):
+        messages = [f"{i}" * 1000 for i in range(10)]
+        chunks = chunk_messages(messages)
+        self.assertTrue(all(len(chunk) <= MAX_MESSAGE_LENGTH for chunk in chunks))
+        self.assertEqual("\n\n---\n\n".join(chunks), "\n\n---\n\n".join(messages))
+        self.assertEqual(len(chunks), 3)
+        self.assertEqual(chunk_messages([]), [])
+
+    @patch("utils.alert.send_telegram_message")
+    def test_low_and_medium_are_batched_per_channel_and_severity(self, mock_send):
+        with alert_digest():
+            send_alert(Alert(AlertSeverity.MEDIUM, "a", "morpho"))
+            send_alert(Alert(AlertSeverity.MEDIUM, "b", "morpho"))
+            send_alert(Alert(AlertSeverity.LOW, "c", "morpho"))
+            send_alert(Alert(AlertSeverity.MEDIUM, "d", "aave"))
+            mock_send.assert_not_called()
+        sent = [c.args for c in mock_send.call_args_list]
+        self.assertEqual(
+            sent,
+            [
+                ("⚠️ a\n\n---\n\n⚠️ b", "morpho", False, False),
+                ("ℹ️ c", "morpho", True, False),
+                ("⚠️ d", "aave", False, False),
+            ],
+        )
+
+    @patch("utils.alert.send_telegram_message")
+    def test_high_is_sent_immediately(self, mock_send):
+        with alert_digest():
+            send_alert(Alert(AlertSeverity.HIGH, "bad debt", "morpho"))
+            mock_send.assert_called_once()
+
+    @patch("utils.alert.send_telegram_message")
+    def test_flushes_on_exception(self, mock_send):
+        with self.assertRaises(RuntimeError):
+            with alert_digest():
+                send_alert(Alert(AlertSeverity.LOW, "x", "p"))
+                raise RuntimeError
+        mock_send.assert_called_once()
+
+
+@patch("utils.alert.send_telegram_message")
+class TestAlertDeduplication(unittest.TestCase):
+    """Tests for fingerprinted alerts suppressed across runs."""
+
+    def setUp(self):
+        tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmpdir.cleanup)
+        self.filename = os.path.join(tmpdir.name, "cache-id.txt")
+        with open(self.filename, "w") as f:
+            f.write("OTHER_KEY:1\n")
+        set_alert_state_store(AlertStateStore(self.filename))
+        self.addCleanup(set_alert_state_store, AlertStateStore())
+        self.fingerprint = AlertFingerprint("morpho", "low_liquidity", "1+0xvault")
+
+    def new_run(self):
+        # A fresh store re-reads the file, like the next hourly run
+        set_alert_state_store(AlertStateStore(self.filename))
+
+    def test_repeat_is_suppressed_across_runs(self, mock_send):
+        alert = Alert(AlertSeverity.MEDIUM, "low", "morpho")
+        self.assertTrue(send_alert(alert, fingerprint=self.fingerprint))
+        self.new_run()
+        self.assertFalse(send_alert(alert, fingerprint=self.fingerprint))
+        self.assertEqual(mock_send.call_count, 1)
+        self.assertEqual(get_last_value_for_key_from_file(self.filename, "OTHER_KEY"), "1")
+
+    def test_escalation_and_renotify(self, mock_send):
+        send_alert(Alert(AlertSeverity.MEDIUM, "low", "morpho"), fingerprint=self.fingerprint)
+        self.assertTrue(send_alert(Alert(AlertSeverity.HIGH, "lower", "morpho"), fingerprint=self.fingerprint))
+        self.assertFalse(send_alert(Alert(AlertSeverity.MEDIUM, "low", "morpho"), fingerprint=self.fingerprint))
+        self.assertTrue(
+            send_alert(Alert(AlertSeverity.MEDIUM, "low", "morpho"), fingerprint=self.fingerprint, renotify_after=0)
+        )
+        self.assertEqual(mock_send.call_count, 3)
+
+    def test_resolve_sends_once(self, mock_send):
+        self.assertFalse(resolve_alert(self.fingerprint, "recovered"))
+        send_alert(Alert(AlertSeverity.HIGH, "low", "morpho", channel="pegs"), fingerprint=self.fingerprint)
+        self.new_run()
+        self.assertTrue(resolve_alert(self.fingerprint, "recovered"))
+        self.assertEqual(mock_send.call_args.args, ("✅ Resolved: recovered", "pegs", True, False))
+        self.new_run()
+        self.assertFalse(resolve_alert(self.fingerprint, "recovered"))
+        self.assertTrue(send_alert(Alert(AlertSeverity.HIGH, "low", "morpho"), fingerprint=self.fingerprint))
+
+
+class TestDurableOutbox(unittest.TestCase):
+    """Tests for persisting and retrying undelivered alerts."""
+
+    def setUp(self):
+        tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmpdir.cleanup)
+        self.filename = os.path.join(tmpdir.name, "cache-id.txt")
+        with open(self.filename, "w") as f:
+            f.write("TIMELOCK_LAST_TS:100\n")
+
+    @patch("utils.outbox.send_telegram_message")
+    def test_send_or_save_persists_failures(self, mock_send):
+        mock_send.side_effect = TelegramError("down")
+        delivered = send_or_save("multi\nline: *msg*", "aave", key="timelock+0xop", filename=self.filename)
+        self.assertFalse(delivered)
+        # Saving the same key again does not duplicate it
+        send_or_save("multi\nline: *msg*", "aave", key="timelock+0xop", filename=self.filename)
+
+        pending = pending_alerts(self.filename)
+        self.assertEqual(len(pending), 1)
+        self.assertEqual(pending[0].message, "multi\nline: *msg*")
+        # Other keys stay readable by the plain cache helpers
+        self.assertEqual(get_last_value_for_key_from_file(self.filename, "TIMELOCK_LAST_TS"), "100")
+
+    @patch("utils.outbox.send_telegram_message")
+    def test_retry_delivers_and_removes(self, mock_send):
+        save_undelivered("first", "aave", filename=self.filename)
+        save_undelivered("second", "safe", silent=True, filename=self.filename)
+
+        self.assertEqual(retry_undelivered(self.filename), 2)
+        self.assertEqual(mock_send.call_args_list[1].args, ("second", "safe", True, False))
+        self.assertEqual(pending_alerts(self.filename), [])
+        self.assertEqual(get_last_value_for_key_from_file(self.filename, "TIMELOCK_LAST_TS"), "100")
+
+    @patch("utils.outbox.send_telegram_message")
+    def test_retry_stops_at_first_failure(self, mock_send):
+        save_undelivered("first", "aave", filename=self.filename)
+        save_undelivered("second", "aave", filename=self.filename)
+        mock_send.side_effect = TelegramError("still down")
+
+        self.assertEqual(retry_undelivered(self.filename), 0)
+        self.assertEqual(mock_send.call_count, 1)
+        self.assertEqual([a.attempts for a in pending_alerts(self.filename)], [1, 0])
+
+    @patch("utils.outbox.send_telegram_message")
+    def test_retry_drops_expired(self, mock_send):
+        save_undelivered("old", "aave", filename=self.filename)
+        with patch.dict(os.environ, {"ALERT_OUTBOX_MAX_AGE_HOURS": "0"}):
+            self.assertEqual(retry_undelivered(self.filename), 0)
+        mock_send.assert_not_called()
+        self.assertEqual(pending_alerts(self.filename), [])
+
+    @patch("utils.outbox.send_telegram_message")
+    def test_failed_retry_still_drops_expired(self, mock_send):
+        save_undelivered("first", "aave", filename=self.filename)
+        maxed = PendingAlert("maxed", "maxed", "aave", created_at=time.time() + 60, attempts=24)
+        write_last_value_to_file(self.filename, "OUTBOX+maxed", _encode(maxed))
+        mock_send.side_effect = TelegramError("down")
+
+        self.assertEqual(retry_undelivered(self.filename), 0)
+        self.assertEqual(mock_send.call_count, 1)
+        self.assertEqual([a.message for a in pending_alerts(self.filename)], ["first"])
+
+    @patch("utils.outbox.send_telegram_message")
+    def test_main_drains_outbox_and_legacy_cache_file(self, mock_send):
+        outbox_file = os.path.join(os.path.dirname(self.filename), "alert-outbox.txt")
+        save_undelivered("saved", "aave", filename=outbox_file)
+        save_undelivered("legacy", "aave", filename=self.filename)
+        with patch("utils.outbox.outbox_filename", outbox_file), patch("utils.cache.cache_filename", self.filename):
+            outbox_main()
+        self.assertEqual([c.args[0] for c in mock_send.call_args_list], ["saved", "legacy"])
+        self.assertEqual(pending_alerts(outbox_file) + pending_alerts(self.filename), [])
+
+    @patch("utils.alert.save_undelivered")
+    @patch("utils.alert.send_telegram_message")
+    def test_send_alert_saves_on_failure(self, mock_send, mock_save):
+        mock_send.side_effect = TelegramError("down")
+        send_alert(Alert(AlertSeverity.HIGH, "m", "proto"))
+        mock_save.assert_called_once_with("🚨 m", "proto", False, False)
+
+
 class TestDispatch(unittest.TestCase):
     """Tests for the emergency dispatch utility."""
 
-    @patch("utils.dispatch.requests.post")
+    @patch("utils.dispatch.requests.Session.post")
     @patch("utils.dispatch._record_dispatch")
     @patch("utils.dispatch._is_on_cooldown", return_value=False)
     def test_dispatch_sends_correct_payload(self, mock_cooldown, mock_record, mock_post):
@@ -370,7 +641,7 @@ class TestDispatch(unittest.TestCase):
 
         mock_record.assert_called_once_with("infinifi")
 
-    @patch("utils.dispatch.requests.post")
+    @patch("utils.dispatch.requests.Session.post")
     def test_dispatch_skips_low_severity(self, mock_post):
         from utils.dispatch import dispatch_emergency_withdrawal
 
@@ -378,7 +649,7 @@ class TestDispatch(unittest.TestCase):
         dispatch_emergency_withdrawal(alert)
         mock_post.assert_not_called()
 
-    @patch("utils.dispatch.requests.post")
+    @patch("utils.dispatch.requests.Session.post")
     def test_dispatch_skips_medium_severity(self, mock_post):
         from utils.dispatch import dispatch_emergency_withdrawal
 
@@ -386,7 +657,7 @@ class TestDispatch(unittest.TestCase):
         dispatch_emergency_withdrawal(alert)
         mock_post.assert_not_called()
 
-    @patch("utils.dispatch.requests.post")
+    @patch("utils.dispatch.requests.Session.post")
     @patch("utils.dispatch._is_on_cooldown", return_value=False)
     def test_dispatch_skips_unknown_protocol(self, mock_cooldown, mock_post):
         from utils.dispatch import dispatch_emergency_withdrawal
@@ -398,7 +669,7 @@ class TestDispatch(unittest.TestCase):
 
         mock_post.assert_not_called()
 
-    @patch("utils.dispatch.requests.post")
+    @patch("utils.dispatch.requests.Session.post")
     @patch("utils.dispatch._is_on_cooldown", return_value=True)
     def test_dispatch_skips_on_cooldown(self, mock_cooldown, mock_post):
         from utils.dispatch import dispatch_emergency_withdrawal
@@ -410,7 +681,7 @@ class TestDispatch(unittest.TestCase):
 
         mock_post.assert_not_called()
 
-    @patch("utils.dispatch.requests.post")
+    @patch("utils.dispatch.requests.Session.post")
     @patch("utils.dispatch._is_on_cooldown", return_value=False)
     def test_dispatch_skips_missing_pat(self, mock_cooldown, mock_post):
         from utils.dispatch import dispatch_emergency_withdrawal
@@ -422,7 +693,7 @@ class TestDispatch(unittest.TestCase):
 
         mock_post.assert_not_called()
 
-    @patch("utils.dispatch.requests.post")
+    @patch("utils.dispatch.requests.Session.post")
     @patch("utils.dispatch._record_dispatch")
     @patch("utils.dispatch._is_on_cooldown", return_value=False)
     def test_dispatch_critical_sends_critical_severity(self, mock_cooldown, mock_record, mock_post):
@@ -440,7 +711,7 @@ class TestDispatch(unittest.TestCase):
         payload = mock_post.call_args[1]["json"]
         self.assertEqual(payload["client_payload"]["severity"], "CRITICAL")
 
-    @patch("utils.dispatch.requests.post")
+    @patch("utils.dispatch.requests.Session.post")
     @patch("utils.dispatch._record_dispatch")
     @patch("utils.dispatch._is_on_cooldown", return_value=False)
     def test_dispatch_handles_request_exception(self, mock_cooldown, mock_record, mock_post):
@@ -456,7 +727,7 @@ class TestDispatch(unittest.TestCase):
 
         mock_record.assert_not_called()
 
-    @patch("utils.dispatch.requests.post")
+    @patch("utils.dispatch.requests.Session.post")
     @patch("utils.dispatch._record_dispatch")
     @patch("utils.dispatch._is_on_cooldown", return_value=False)
     def test_dispatch_uses_protocol_not_channel(self, mock_cooldown, mock_record, mock_post):
@@ -476,7 +747,7 @@ class TestDispatch(unittest.TestCase):
         self.assertEqual(payload["client_payload"]["protocol"], "origin")
         mock_record.assert_called_once_with("origin")
 
-    @patch("utils.dispatch.requests.post")
+    @patch("utils.dispatch.requests.Session.post")
     @patch("utils.dispatch._is_on_cooldown", return_value=False)
     def test_dispatch_skips_non_dispatchable_channel_protocol(self, mock_cooldown, mock_post):
         """Protocol not in DISPATCHABLE_PROTOCOLS is skipped even with a valid channel."""
@@ -489,7 +760,7 @@ class TestDispatch(unittest.TestCase):
 
         mock_post.assert_not_called()
 
-    @patch("utils.dispatch.requests.post")
+    @patch("utils.dispatch.requests.Session.post")
     def test_dispatch_skips_in_debug_mode(self, mock_post):
         from utils.dispatch import dispatch_emergency_withdrawal
 
@@ -519,6 +790,190 @@ class TestDispatch(unittest.TestCase):
             self.assertFalse(_is_on_cooldown("infinifi", cooldown_seconds=3600))
 
 
+class TestSessionRegistry(unittest.TestCase):
+    """Tests for the pooled session registry in utils.http."""
+
+    def setUp(self):
+        self.addCleanup(close_sessions)
+
+    def test_sessions_are_shared_per_name(self):
+        self.assertIs(get_session(), get_session())
+        self.assertIsNot(get_session(), get_session("other"))
+
+    def test_pool_sizes_from_env(self):
+        close_sessions()
+        with patch.dict(os.environ, {"HTTP_POOL_CONNECTIONS": "3", "HTTP_POOL_MAXSIZE": "7"}):
+            adapter = get_session().get_adapter("https://example.com")
+        self.assertEqual(adapter._pool_connections, 3)
+        self.assertEqual(adapter._pool_maxsize, 7)
+
+    def test_connections_are_reused(self):
+        from utils.http_benchmark import benchmark_url, start_local_server
+
+        server, url = start_local_server(connect_delay=0.05)
+        self.addCleanup(server.shutdown)
+        result = benchmark_url(url, count=3)
+        self.assertGreater(result.saved_per_request, 0.03)
+
+
+@patch("requests.Session.request")
+class TestHttpCache(unittest.TestCase):
+    """Tests for the disk-backed JSON cache with revalidation."""
+
+    url = "https://ydaemon.example/vaults/v3?chainIDs=1"
+
+    def setUp(self):
+        tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmpdir.cleanup)
+        self.cache_dir = tmpdir.name
+
+    @staticmethod
+    def _response(status, body=b"", headers=None):
+        response = requests.Response()
+        response.status_code = status
+        response._content = body
+        response.headers.update(headers or {})
+        return response
+
+    def test_fresh_entry_skips_network(self, mock_request):
+        mock_request.return_value = self._response(200, b'[{"address": "0x1"}]', {"ETag": '"v1"'})
+        first = cached_get_json(self.url, ttl=60, cache_dir=self.cache_dir)
+        second = cached_get_json(self.url, ttl=60, cache_dir=self.cache_dir)
+        self.assertEqual(first, second)
+        self.assertEqual(mock_request.call_count, 1)
+
+    def test_stale_entry_is_revalidated(self, mock_request):
+        mock_request.return_value = self._response(
+            200, b'[{"address": "0x1"}]', {"ETag": '"v1"', "Last-Modified": "Mon, 01 Jan 2024 00:00:00 GMT"}
+        )
+        cached_get_json(self.url, ttl=0, cache_dir=self.cache_dir)
+
+        mock_request.return_value = self._response(304)
+        self.assertEqual(cached_get_json(self.url, ttl=0, cache_dir=self.cache_dir), [{"address": "0x1"}])
+        headers = mock_request.call_args.kwargs["headers"]
+        self.assertEqual(headers["If-None-Match"], '"v1"')
+        self.assertEqual(headers["If-Modified-Since"], "Mon, 01 Jan 2024 00:00:00 GMT")
+
+    def test_changed_resource_replaces_entry(self, mock_request):
+        mock_request.return_value = self._response(200, b"[1]", {"ETag": '"v1"'})
+        cached_get_json(self.url, ttl=0, cache_dir=self.cache_dir)
+        mock_request.return_value = self._response(200, b"[2]", {"ETag": '"v2"'})
+        self.assertEqual(cached_get_json(self.url, ttl=0, cache_dir=self.cache_dir), [2])
+        mock_request.reset_mock()
+        self.assertEqual(cached_get_json(self.url, ttl=60, cache_dir=self.cache_dir), [2])
+        mock_request.assert_not_called()
+
+
+@patch("requests.Session.request")
+class TestGauntletClient(unittest.TestCase):
+    """Tests for build id caching and page fetches in utils.gauntlet."""
+
+    @staticmethod
+    def _response(status, body=b""):
+        response = requests.Response()
+        response.status_code = status
+        response._content = body
+        return response
+
+    def _route(self, pages, build_ids):
+        def request(method, url, **kwargs):
+            if url.endswith("gauntlet.xyz/"):
+                return self._response(200, b'{"buildId":"%s"}' % build_ids.pop(0).encode())
+            for build_id, body in pages.items():
+                if f"/_next/data/{build_id}/" in url:
+                    return self._response(200, body)
+            return self._response(404)
+
+        return request
+
+    def test_build_id_fetched_once(self, mock_request):
+        markets = b'{"pageProps": {"protocolPage": {"markets": [{"key": "m"}]}}}'
+        mock_request.side_effect = self._route({"b1": markets}, ["b1"])
+        client = GauntletClient(build_id_ttl=60)
+        self.assertEqual(client.get_markets("Euler"), [{"key": "m"}])
+        self.assertEqual(client.get_markets("Euler"), [{"key": "m"}])
+        self.assertEqual(mock_request.call_count, 3)
+
+    def test_stale_build_id_refreshed_on_404(self, mock_request):
+        charts = b'{"pageProps": {"chartSections": [{"charts": []}]}}'
+        mock_request.side_effect = self._route({"b2": charts}, ["b1", "b2"])
+        client = GauntletClient(build_id_ttl=60)
+        self.assertEqual(client.get_market_charts("euler", "ethereum-prime"), {"charts": []})
+        self.assertEqual(client.build_id(), "b2")
+
+    def test_charts_for_markets_fetched_concurrently(self, mock_request):
+        charts = b'{"pageProps": {"chartSections": [{"charts": []}]}}'
+        mock_request.side_effect = self._route({"b1": charts}, ["b1"])
+        client = GauntletClient(build_id_ttl=60)
+        result = client.get_charts_for_markets("euler", ["a", "b", "c"])
+        self.assertEqual(result, {"a": {"charts": []}, "b": {"charts": []}, "c": {"charts": []}})
+        # One dashboard fetch shared by all workers
+        homepage_calls = [c for c in mock_request.call_args_list if c.args[1].endswith("gauntlet.xyz/")]
+        self.assertEqual(len(homepage_calls), 1)
+
+    def test_missing_build_id_returns_empty_charts(self, mock_request):
+        mock_request.return_value = self._response(200, b"<html></html>")
+        result = GauntletClient(build_id_ttl=60).get_charts_for_markets("euler", ["a"])
+        self.assertEqual(result, {"a": []})
+
+
+class TestJsonStreaming(unittest.TestCase):
+    """Tests for incremental JSON array parsing in utils.http."""
+
+    doc = {
+        "total": "-12",
+        "users": [{"user": f"0x{i}", "badDebt": str(-i), "ratio": -1.25e-3, "ok": True, "x": None} for i in range(50)],
+        "decimals": 18,
+        "tvl": 1.5e3,
+    }
+
+    @staticmethod
+    def _chunks(text: str, size: int) -> list[bytes]:
+        data = text.encode()
+        return [data[i : i + size] for i in range(0, len(data), size)]
+
+    def test_items_and_fields_across_chunk_sizes(self):
+        text = json.dumps(self.doc)
+        for size in (1, 2, 7, 64, len(text)):
+            fields = {}
+            self.assertEqual(list(iter_json_items(self._chunks(text, size), "users", fields)), self.doc["users"])
+            self.assertEqual(fields, {"total": "-12", "decimals": 18, "tvl": 1500.0})
+
+    def test_numbers_and_multibyte_split_between_chunks(self):
+        chunks = [b"[1, 2", b'3, "\xc3', b'\xa9", 4.', b"5]"]
+        self.assertEqual(list(iter_json_items(chunks)), [1, 23, "é", 4.5])
+
+    def test_nested_path(self):
+        fields = {}
+        chunks = [b'{"data": {"vaults": {"items": [1, 2], "count": 2}}, "extensions": 1}']
+        self.assertEqual(list(iter_json_items(chunks, "data.vaults.items", fields)), [1, 2])
+        self.assertEqual(fields, {"data.vaults.count": 2, "extensions": 1})
+
+    def test_missing_or_null_path_yields_nothing(self):
+        self.assertEqual(list(iter_json_items([b'{"data": null}'], "data.vaults")), [])
+        self.assertEqual(list(iter_json_items([b'{"data": {"other": 1}}'], "data.vaults")), [])
+        self.assertEqual(list(iter_json_items([b" [ ] "])), [])
+
+    def test_malformed_document_raises(self):
+        with self.assertRaises(ValueError):
+            list(iter_json_items([b"[1 2]"]))
+        with self.assertRaises(ValueError):
+            list(iter_json_items([b'[{"a": 1}'], ""))
+
+    @patch("requests.Session.request")
+    def test_stream_json_items_reads_response_in_chunks(self, mock_request):
+        response = requests.Response()
+        response.status_code = 200
+        response._content = json.dumps(self.doc).encode()
+        response._content_consumed = True
+        mock_request.return_value = response
+
+        items = stream_json_items("https://example.com/report.json", "users", chunk_size=16)
+        self.assertEqual(next(items), self.doc["users"][0])
+        self.assertTrue(mock_request.call_args.kwargs["stream"])
+        self.assertEqual(len(list(items)), len(self.doc["users"]) - 1)
+
+
 class TestDefiLlama(unittest.TestCase):
     """Tests for the DeFiLlama stablecoin price helper."""
 
@@ -538,5 +993,183 @@ class TestDefiLlama(unittest.TestCase):
                 sys.modules.pop("utils.defillama", None)
 
 
+class TestStateStore(unittest.TestCase):
+    """Tests for the append-only StateStore."""
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.filename = os.path.join(self.tmpdir.name, "state.json")
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def _line_count(self):
+        with open(self.filename) as f:
+            return sum(1 for _ in f)
+
+    def test_roundtrip_and_partial_update(self):
+        store = StateStore(self.filename)
+        store.set("a", {"x": 1, "y": [1]})
+        store.set("b", {"x": 2})
+        self.assertEqual(store.flush(), 2)
+
+        store = StateStore(self.filename)
+        store.update("a", {"y": [1, 2]})
+        self.assertEqual(store.flush(), 1)
+
+        reloaded = StateStore(self.filename)
+        self.assertEqual(reloaded.get("a"), {"x": 1, "y": [1, 2]})
+        self.assertEqual(reloaded.get("b"), {"x": 2})
+
+    def test_only_changed_keys_written(self):
+        store = StateStore(self.filename)
+        for i in range(50):
+            store.set(f"key{i}", {"value": i})
+        store.flush()
+        lines_after_first_flush = self._line_count()
+
+        store = StateStore(self.filename)
+        for i in range(50):
+            store.set(f"key{i}", {"value": i})  # unchanged
+        store.set("key7", {"value": 700})
+        store.delete("key8")
+        self.assertEqual(store.flush(), 2)
+        self.assertEqual(self._line_count(), lines_after_first_flush + 2)
+
+        reloaded = StateStore(self.filename)
+        self.assertEqual(len(reloaded), 49)
+        self.assertEqual(reloaded.get("key7"), {"value": 700})
+        self.assertNotIn("key8", reloaded)
+
+    def test_get_returns_copy(self):
+        store = StateStore(self.filename)
+        store.set("a", {"items": [1]})
+        store.get("a")["items"].append(2)
+        self.assertEqual(store.get("a"), {"items": [1]})
+
+    def test_compacts_when_log_outgrows_records(self):
+        store = StateStore(self.filename)
+        for i in range(STATE_COMPACT_MIN_LINES + 10):
+            store.set("counter", {"value": i})
+            store.flush()
+        self.assertLessEqual(self._line_count(), STATE_COMPACT_MIN_LINES + 1)
+        self.assertEqual(StateStore(self.filename).get("counter"), {"value": STATE_COMPACT_MIN_LINES + 9})
+
+    def test_imports_legacy_json_object(self):
+        with open(self.filename, "w") as f:
+            json.dump({"1_strategy_report_0xabc": {"triggered": True}}, f)
+
+        store = StateStore(self.filename)
+        self.assertEqual(store.get("1_strategy_report_0xabc"), {"triggered": True})
+        store.flush()
+        with open(self.filename) as f:
+            self.assertEqual(json.loads(f.readline()), STATE_LOG_HEADER)
+        self.assertEqual(StateStore(self.filename).get("1_strategy_report_0xabc"), {"triggered": True})
+
+    def test_ignores_torn_last_line(self):
+        store = StateStore(self.filename)
+        store.set("a", {"x": 1})
+        store.flush()
+        with open(self.filename, "a") as f:
+            f.write('{"k": "b", "v": {"x"')
+        self.assertEqual(StateStore(self.filename).keys(), ["a"])
+
+    def test_trigger_state_records(self):
+        from datetime import datetime, timezone
+
+        from yearn.check_stuck_triggers import TriggerState, load_trigger_cache, save_trigger_cache
+
+        now = datetime(2025, 1, 1, tzinfo=timezone.utc)
+        store = StateStore(self.filename)
+        cache = {
+            "1_strategy_report_0xabc": TriggerState(True, now),
+            "1_strategy_tend_0xdef": TriggerState(True, now),
+        }
+        self.assertEqual(save_trigger_cache(store, cache), 2)
+
+        store = StateStore(self.filename)
+        cache = load_trigger_cache(store)
+        cache["1_strategy_report_0xabc"].alerted_thresholds.append(24)
+        del cache["1_strategy_tend_0xdef"]
+        self.assertEqual(save_trigger_cache(store, cache), 2)
+
+        reloaded = StateStore(self.filename)
+        self.assertEqual(reloaded.keys(), ["1_strategy_report_0xabc"])
+        self.assertEqual(reloaded.get_record("1_strategy_report_0xabc", TriggerState).alerted_thresholds, [24])
+
+    def test_still_triggered_states_are_not_rewritten(self):
+        from datetime import datetime, timedelta, timezone
+
+        from utils.chains import Chain
+        from yearn.check_stuck_triggers import load_trigger_cache, save_trigger_cache, update_cache_with_current_state
+
+        now = datetime(2025, 1, 1, tzinfo=timezone.utc)
+        current = {"strategy_report_0xabc": (True, "stuck"), "strategy_tend_0xdef": (True, "")}
+        store = StateStore(self.filename)
+        cache = load_trigger_cache(store)
+        update_cache_with_current_state(cache, Chain.MAINNET, current, now)
+        self.assertEqual(save_trigger_cache(store, cache), 2)
+
+        store = StateStore(self.filename)
+        cache = load_trigger_cache(store)
+        update_cache_with_current_state(cache, Chain.MAINNET, current, now + timedelta(hours=1))
+        self.assertEqual(save_trigger_cache(store, cache), 0)
+        self.assertEqual(cache["1_strategy_report_0xabc"].first_seen, now)
+
+
+class TestCacheFormats(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+        self.text_file = os.path.join(self.tmpdir.name, "cache-id.txt")
+        with open(self.text_file, "w") as f:
+            f.write("3JANE_USD3_PPS:1.05\nMAPLE_SYRUP_TVL:100\n0xabc:7\n3JANE_USD3_PPS:0.9\n")
+
+    def test_detect_format(self):
+        self.assertEqual(detect_cache_format(self.text_file), "text")
+        self.assertEqual(detect_cache_format(os.path.join(self.tmpdir.name, "missing")), "text")
+        json_file = os.path.join(self.tmpdir.name, "legacy.json")
+        save_cache_entries(json_file, {"a": 1}, "json")
+        self.assertEqual(detect_cache_format(json_file), "json")
+        state_file = os.path.join(self.tmpdir.name, "state.json")
+        save_cache_entries(state_file, {"a": 1}, "state")
+        self.assertEqual(detect_cache_format(state_file), "state")
+
+    def test_text_load_keeps_first_match(self):
+        # Same semantics as get_last_value_for_key_from_file
+        entries = load_cache_entries(self.text_file)
+        self.assertEqual(entries["3JANE_USD3_PPS"], "1.05")
+        self.assertEqual(len(entries), 3)
+
+    def test_round_trip_between_formats(self):
+        entries = load_cache_entries(self.text_file)
+        state_file = os.path.join(self.tmpdir.name, "state.json")
+        save_cache_entries(state_file, entries, "state")
+        self.assertEqual(StateStore(state_file).get("MAPLE_SYRUP_TVL"), "100")
+
+        text_file = os.path.join(self.tmpdir.name, "out.txt")
+        save_cache_entries(text_file, load_cache_entries(state_file), "text")
+        self.assertEqual(load_cache_entries(text_file), entries)
+
+    def test_text_rejects_multiline_values(self):
+        with self.assertRaises(ValueError):
+            save_cache_entries(os.path.join(self.tmpdir.name, "out.txt"), {"a": "x\ny"}, "text")
+
+    def test_text_rejects_colon_in_value(self):
+        out = os.path.join(self.tmpdir.name, "out.txt")
+        with self.assertRaises(ValueError):
+            save_cache_entries(out, {"FOO": "12:30"}, "text")
+        with self.assertRaises(ValueError):
+            save_cache_entries(out, {"FOO": {"a": 1}}, "text")
+        self.assertFalse(os.path.exists(out))
+        self.assertFalse(os.path.exists(out + ".tmp"))
+
+    def test_key_namespace(self):
+        self.assertEqual(key_namespace("3JANE_USD3_PPS"), "3jane")
+        self.assertEqual(key_namespace("0xvault+0xmarket+supply_cap"), "0xvault")
+        self.assertEqual(key_namespace("0xabc"), "address")
+        self.assertEqual(key_namespace("aave"), "aave")
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -2,29 +2,59 @@
 """Monitor all TimelockEvent types and send Telegram alerts."""
 
 import argparse
-import json
 import os
+import queue
 import sys
+import threading
 import time
-import urllib.error
-import urllib.request
+from collections.abc import Callable
+from concurrent.futures import Future, wait
 from dataclasses import dataclass
+from typing import Any
 
+import requests
 from dotenv import load_dotenv
 
 from utils.cache import cache_filename, get_last_value_for_key_from_file, write_last_value_to_file
-from utils.calldata.decoder import format_call_lines
+from utils.calldata.decoder import format_call_lines, resolve_selectors
 from utils.chains import EXPLORER_URLS, Chain
-from utils.llm.ai_explainer import explain_batch_transaction, explain_transaction, format_explanation_line
+from utils.config import Config
+from utils.envio import EnvioSelection, build_query
+from utils.graphql import get_envio_client
+from utils.llm.ai_explainer import (
+    Explanation,
+    Simulations,
+    explain_batch_transaction,
+    explain_transaction,
+    format_explanation_line,
+    simulation_key,
+)
 from utils.logging import get_logger
-from utils.proxy import build_diff_url, detect_proxy_upgrade, get_current_implementation
-from utils.telegram import MAX_MESSAGE_LENGTH, send_telegram_message
+from utils.outbox import send_or_save
+from utils.proxy import (
+    build_diff_url,
+    detect_proxy_upgrade,
+    get_current_implementation,
+    prefetch_implementations,
+    upgrade_targets,
+)
+from utils.telegram import MAX_MESSAGE_LENGTH, chunk_messages
+from utils.tenderly.simulation import simulate_transaction
 
 load_dotenv()
 
-ENVIO_GRAPHQL_URL = os.getenv("ENVIO_GRAPHQL_URL")
 DEFAULT_LOG_LEVEL = os.getenv("TIMELOCK_ALERTS_LOG_LEVEL", "INFO")
-CACHE_KEY = "TIMELOCK_LAST_TS"
+CACHE_KEY = "TIMELOCK_CURSOR"
+LEGACY_CACHE_KEY = "TIMELOCK_LAST_TS"  # timestamp-only cursor written by earlier versions
+DEFAULT_LIMIT = 100  # events per page
+DEFAULT_SINCE_SECONDS = 43200  # lookback when no cursor is cached
+
+# Enrichment pipeline limits, overridable with TIMELOCK_ENRICH_DEADLINE / _SELECTOR_WORKERS /
+# _SIMULATION_WORKERS / _AI_WORKERS
+DEFAULT_ENRICH_DEADLINE = 120.0  # seconds for all lookups, simulations and AI explanations of a page
+DEFAULT_SELECTOR_WORKERS = 8
+DEFAULT_SIMULATION_WORKERS = 4
+DEFAULT_AI_WORKERS = 4
 
 
 @dataclass(frozen=True)
@@ -72,44 +102,65 @@ TIMELOCK_LIST: list[TimelockConfig] = [
 # Lookup by (lowercase address, chain_id) to support same address on multiple chains
 TIMELOCKS: dict[tuple[str, int], TimelockConfig] = {(t.address, t.chain_id): t for t in TIMELOCK_LIST}
 
-_logger = get_logger("timelock_alerts")
 
+@dataclass(frozen=True)
+class EventCursor:
+    """Position of the last processed event in query order (blockTimestamp, blockNumber, logIndex).
+
+    A cursor without block number and log index (fallback lookback or a legacy
+    cache value) means "after every event at ``block_timestamp``".
+    """
+
+    block_timestamp: int
+    block_number: int | None = None
+    log_index: int | None = None
+
+    @classmethod
+    def from_event(cls, event: dict) -> "EventCursor":
+        return cls(int(event["blockTimestamp"]), int(event["blockNumber"]), int(event["logIndex"]))
+
+    @classmethod
+    def parse(cls, value: str) -> "EventCursor":
+        """Parse a cache value: ``ts+block+logIndex`` or a bare timestamp."""
+        parts = [int(part) for part in value.split("+")]
+        if len(parts) == 1:
+            return cls(parts[0])
+        block_timestamp, block_number, log_index = parts
+        return cls(block_timestamp, block_number, log_index)
+
+    def __str__(self) -> str:
+        if self.block_number is None or self.log_index is None:
+            return str(self.block_timestamp)
+        return f"{self.block_timestamp}+{self.block_number}+{self.log_index}"
+
+    def where(self) -> dict:
+        """Hasura filter for events strictly after this cursor."""
+        ts = self.block_timestamp
+        if self.block_number is None or self.log_index is None:
+            return {"blockTimestamp": {"_gt": ts}}
+        return {
+            "_or": [
+                {"blockTimestamp": {"_gt": ts}},
+                {"blockTimestamp": {"_eq": ts}, "blockNumber": {"_gt": self.block_number}},
+                {
+                    "blockTimestamp": {"_eq": ts},
+                    "blockNumber": {"_eq": self.block_number},
+                    "logIndex": {"_gt": self.log_index},
+                },
+            ]
+        }
 
-def http_json(url: str, method: str = "GET", body: dict | None = None, headers: dict | None = None) -> dict | None:
-    """Make an HTTP request and return JSON response."""
-    _logger.info("http_json %s %s", method, url)
-    data = None
-    req_headers: dict[str, str] = {"Accept": "application/json"}
-    if headers:
-        req_headers.update(headers)
-    if body is not None:
-        data = json.dumps(body).encode("utf-8")
-        req_headers["Content-Type"] = "application/json"
-    req = urllib.request.Request(url, data=data, headers=req_headers, method=method)
-    max_retries = 3
-    for attempt in range(1, max_retries + 1):
-        try:
-            with urllib.request.urlopen(req, timeout=30) as resp:
-                payload = json.loads(resp.read().decode("utf-8"))
-                _logger.info("http_json status=%s", resp.status)
-                return payload
-        except (urllib.error.URLError, ConnectionError, OSError) as e:
-            _logger.warning("http_json attempt %s/%s failed: %s", attempt, max_retries, e)
-            if attempt < max_retries:
-                time.sleep(2 * attempt)
-    return None
+
+_logger = get_logger("timelock_alerts")
 
 
 def gql_request(query: str, variables: dict) -> dict | None:
-    """Execute a GraphQL query against the Envio indexer."""
-    if not ENVIO_GRAPHQL_URL:
-        raise RuntimeError(
-            "ENVIO_GRAPHQL_URL is not set. Set it to the Envio GraphQL endpoint, "
-            "e.g. export ENVIO_GRAPHQL_URL='https://.../graphql'."
-        )
-    _logger.info("gql_request")
-    payload = {"query": query, "variables": variables}
-    return http_json(ENVIO_GRAPHQL_URL, method="POST", body=payload)
+    """Execute a GraphQL query against the Envio indexer. Returns None if it stays unreachable."""
+    try:
+        return get_envio_client().execute(query, variables)
+    except (requests.RequestException, ValueError) as e:
+        _logger.error("Envio request failed: %s", e)
+        return None
 
 
 def format_delay(seconds: int) -> str:
@@ -129,46 +180,127 @@ def format_delay(seconds: int) -> str:
     return " ".join(parts)
 
 
-def load_events(limit: int, since_ts: int, timelocks: list[TimelockConfig] | None = None) -> dict | None:
-    """Fetch TimelockEvent events from the Envio GraphQL API."""
+EVENT_FIELDS = (
+    "id",
+    "timelockAddress",
+    "timelockType",
+    "eventName",
+    "chainId",
+    "blockNumber",
+    "blockTimestamp",
+    "logIndex",
+    "transactionHash",
+    "operationId",
+    "index",
+    "target",
+    "value",
+    "data",
+    "predecessor",
+    "delay",
+    "signature",
+    "creator",
+    "metadata",
+    "votesFor",
+    "votesAgainst",
+)
+
+
+def event_selection(limit: int, after: EventCursor, timelocks: list[TimelockConfig] | None = None) -> EnvioSelection:
+    """Selection for up to ``limit`` TimelockEvent events after ``after`` on the monitored timelocks."""
     source = timelocks if timelocks is not None else TIMELOCK_LIST
     addresses = [t.address for t in source]
-    _logger.info("load_events limit=%s since_ts=%s addresses=%s", limit, since_ts, len(addresses))
-    query = """
-    query GetTimelockEvents($limit: Int!, $sinceTs: Int!, $addresses: [String!]!) {
-      TimelockEvent(
-        where: {
-          timelockAddress: { _in: $addresses }
-          blockTimestamp: { _gt: $sinceTs }
-        }
-        order_by: { blockTimestamp: asc, blockNumber: asc, logIndex: asc }
-        limit: $limit
-      ) {
-        id
-        timelockAddress
-        timelockType
-        eventName
-        chainId
-        blockNumber
-        blockTimestamp
-        transactionHash
-        operationId
-        index
-        target
-        value
-        data
-        predecessor
-        delay
-        signature
-        creator
-        metadata
-        votesFor
-        votesAgainst
-      }
-    }
+    return EnvioSelection(
+        alias="TimelockEvent",
+        entity="TimelockEvent",
+        where={"_and": [{"timelockAddress": {"_in": addresses}}, after.where()]},
+        limit=limit,
+        fields=EVENT_FIELDS,
+        order_by=("blockTimestamp", "blockNumber", "logIndex"),
+    )
+
+
+def load_events(limit: int, after: EventCursor, timelocks: list[TimelockConfig] | None = None) -> dict | None:
+    """Fetch up to ``limit`` TimelockEvent events after ``after`` from the Envio GraphQL API."""
+    source = timelocks if timelocks is not None else TIMELOCK_LIST
+    _logger.info("load_events limit=%s after=%s addresses=%s", limit, after, len(source))
+    return gql_request(*build_query([event_selection(limit, after, timelocks)], "GetTimelockEvents"))
+
+
+def _operation_key(event: dict) -> str:
+    # Only TimelockController has batch operations (multiple CallScheduled events
+    # sharing the same operationId). All other types emit one event per operation.
+    if event.get("timelockType") == "TimelockController":
+        return event["operationId"]
+    return event["id"]
+
+
+def _complete_operations(events: list[dict]) -> list[dict]:
+    """Drop the trailing operation of a full page, since its remaining calls may be on the next page.
+
+    Only TimelockController batches span several events. A page holding a single
+    operation is returned whole so ingestion always advances.
+    """
+    if events[-1].get("timelockType") != "TimelockController":
+        return events
+    last_key = _operation_key(events[-1])
+    end = len(events)
+    while end > 0 and _operation_key(events[end - 1]) == last_key:
+        end -= 1
+    return events[:end] if end else events
+
+
+def ingest_events(
+    page_size: int,
+    after: EventCursor,
+    timelocks: list[TimelockConfig] | None = None,
+    use_cache: bool = True,
+    first_page: dict | None = None,
+) -> bool:
+    """Fetch and alert on events page by page until caught up.
+
+    The cursor is committed to the cache after each page, so a failure part-way
+    through a backfill resumes from the last completed page. ``first_page`` is an
+    already fetched response for ``event_selection(page_size, after, timelocks)``,
+    e.g. from a combined Envio query; later pages are fetched here.
+
+    Returns:
+        False if a page could not be fetched.
     """
-    variables: dict = {"limit": limit, "sinceTs": since_ts, "addresses": addresses}
-    return gql_request(query, variables)
+    protocols = {t.protocol for t in (timelocks or TIMELOCK_LIST)}
+    total = 0
+    while True:
+        response = first_page if first_page is not None else load_events(page_size, after, timelocks)
+        first_page = None
+        if response is None:
+            msg = "⚠️ Timelock alerts: Envio API is unreachable after 3 retries"
+            _logger.error(msg)
+            for protocol in protocols:
+                send_or_save(msg, protocol)
+            return False
+        if "errors" in response:
+            msg = f"Timelock alerts: GraphQL errors: {response['errors']}"
+            _logger.error(msg)
+            for protocol in protocols:
+                send_or_save(msg, protocol, plain_text=True)
+            return False
+
+        events = (response.get("data") or {}).get("TimelockEvent", [])
+        full_page = len(events) >= page_size
+        if full_page:
+            events = _complete_operations(events)
+        _logger.info("Fetched %s TimelockEvent events after %s", len(events), after)
+        total += len(events)
+
+        process_events(events)
+        if events:
+            after = EventCursor.from_event(events[-1])
+            if use_cache:
+                write_last_value_to_file(cache_filename, CACHE_KEY, str(after))
+                _logger.info("Updated cache: %s = %s", CACHE_KEY, after)
+
+        if not full_page:
+            _logger.info("Caught up after %s events", total)
+            return True
 
 
 def _format_address(address: str, explorer: str | None, prefix: str = "") -> str:
@@ -235,10 +367,20 @@ def _build_call_info(event: dict, explorer: str | None, show_index: bool, chain_
     return lines
 
 
-def _get_ai_explanation(events: list[dict], timelock_info: TimelockConfig, chain_id: int) -> str | None:
+def _ai_calls(events: list[dict]) -> list[dict]:
+    """Events of an operation that carry calldata worth explaining."""
+    return [e for e in events if e.get("target") and e.get("data") and len(e.get("data", "")) >= 10]
+
+
+def _get_ai_explanation(
+    events: list[dict],
+    timelock_info: TimelockConfig,
+    chain_id: int,
+    simulations: Simulations | None = None,
+) -> Explanation | None:
     """Generate AI explanation for timelock events. Returns None on any failure."""
     try:
-        calls_with_data = [e for e in events if e.get("target") and e.get("data") and len(e.get("data", "")) >= 10]
+        calls_with_data = _ai_calls(events)
         if not calls_with_data:
             return None
 
@@ -252,6 +394,7 @@ def _get_ai_explanation(events: list[dict], timelock_info: TimelockConfig, chain
                 protocol=timelock_info.protocol,
                 label=timelock_info.label,
                 from_address=timelock_info.address,
+                simulations=simulations,
             )
 
         # Batch transaction
@@ -262,17 +405,179 @@ def _get_ai_explanation(events: list[dict], timelock_info: TimelockConfig, chain
             protocol=timelock_info.protocol,
             label=timelock_info.label,
             from_address=timelock_info.address,
+            simulations=simulations,
         )
     except Exception:
         _logger.warning("AI explanation failed", exc_info=True)
         return None
 
 
-def build_alert_message(events: list[dict], timelock_info: TimelockConfig) -> str:
+class _DaemonPool:
+    """Runs submitted calls on at most ``max_workers`` daemon threads.
+
+    Unlike ``ThreadPoolExecutor``, whose workers are joined at interpreter exit,
+    a call still running when the pool is shut down cannot keep the process alive.
+    """
+
+    def __init__(self, max_workers: int, name: str) -> None:
+        self.max_workers = max(1, max_workers)
+        self.name = name
+        self._queue: queue.SimpleQueue = queue.SimpleQueue()
+        self._workers: list[threading.Thread] = []
+
+    def submit(self, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Future:
+        future: Future = Future()
+        self._queue.put((future, fn, args, kwargs))
+        if len(self._workers) < self.max_workers:
+            worker = threading.Thread(target=self._run, name=f"{self.name}-{len(self._workers)}", daemon=True)
+            self._workers.append(worker)
+            worker.start()
+        return future
+
+    def _run(self) -> None:
+        while (item := self._queue.get()) is not None:
+            future, fn, args, kwargs = item
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                future.set_result(fn(*args, **kwargs))
+            except BaseException as e:
+                future.set_exception(e)
+
+    def shutdown(self) -> None:
+        """Cancel queued calls and stop idle workers without waiting for running ones."""
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is not None:
+                item[0].cancel()
+        for _ in self._workers:
+            self._queue.put(None)
+
+
+def _result_or_none(future: Future) -> Any:
+    if future.done() and not future.cancelled() and future.exception() is None:
+        return future.result()
+    return None
+
+
+def enrich_operations(
+    operations: dict[str, tuple[list[dict], TimelockConfig]],
+    deadline: float | None = None,
+) -> dict[str, Explanation | None]:
+    """Resolve everything the alert messages need for a set of operations concurrently.
+
+    Stages, each with its own concurrency limit:
+        1. Calldata selectors (Sourcify lookups) on up to ``TIMELOCK_SELECTOR_WORKERS`` threads,
+           and EIP-1967 slots of upgraded proxies in one RPC batch per chain.
+        2. Tenderly simulations of every call on up to ``TIMELOCK_SIMULATION_WORKERS`` threads.
+        3. LLM explanations on up to ``TIMELOCK_AI_WORKERS`` threads. Each starts once stage 1
+           and its operation's simulations are done, so it reuses the cached lookups and results.
+
+    Everything shares one deadline (``TIMELOCK_ENRICH_DEADLINE`` seconds). Explanations not
+    finished by then are dropped; the alerts are sent without an AI summary. Workers are
+    daemon threads, so calls still running at the deadline do not hold the process open.
+
+    Args:
+        operations: Events and timelock config per operation id.
+        deadline: Seconds for the whole pipeline; defaults to ``TIMELOCK_ENRICH_DEADLINE``.
+
+    Returns:
+        Explanation (or None) per operation id.
+    """
+    if not operations:
+        return {}
+    if deadline is None:
+        deadline = Config.get_env_float("TIMELOCK_ENRICH_DEADLINE", DEFAULT_ENRICH_DEADLINE)
+    deadline_at = time.monotonic() + deadline
+
+    def remaining() -> float:
+        return max(0.0, deadline_at - time.monotonic())
+
+    events = [event for op_events, _ in operations.values() for event in op_events]
+    selectors = {event["data"][:10].lower() for event in events if len(event.get("data") or "") >= 10}
+    lookup_pool = _DaemonPool(
+        Config.get_env_int("TIMELOCK_SELECTOR_WORKERS", DEFAULT_SELECTOR_WORKERS), "timelock-lookup"
+    )
+    simulation_pool = _DaemonPool(
+        Config.get_env_int("TIMELOCK_SIMULATION_WORKERS", DEFAULT_SIMULATION_WORKERS), "timelock-sim"
+    )
+    ai_pool = _DaemonPool(Config.get_env_int("TIMELOCK_AI_WORKERS", DEFAULT_AI_WORKERS), "timelock-ai")
+    try:
+        # All selectors of the page in one bulk lookup
+        lookups = [lookup_pool.submit(resolve_selectors, selectors)]
+        lookups.append(
+            lookup_pool.submit(
+                prefetch_implementations,
+                upgrade_targets((e.get("target"), e.get("data") or "0x", int(e["chainId"])) for e in events),
+            )
+        )
+
+        def simulate(op_events: list[dict], timelock_info: TimelockConfig) -> dict[tuple[str, str, int], Future]:
+            futures = {}
+            for event in _ai_calls(op_events):
+                value = int(event.get("value", 0))
+                key = simulation_key(event["target"], event["data"], value)
+                if key not in futures:
+                    futures[key] = simulation_pool.submit(
+                        simulate_transaction,
+                        target=event["target"],
+                        calldata=event["data"],
+                        chain_id=int(event["chainId"]),
+                        value=value,
+                        from_address=timelock_info.address,
+                    )
+            return futures
+
+        def explain(
+            op_events: list[dict], timelock_info: TimelockConfig, simulations: dict[tuple[str, str, int], Future]
+        ) -> Explanation | None:
+            wait([*lookups, *simulations.values()], timeout=remaining())
+            # A simulation that failed or missed the deadline is skipped, not retried
+            results = {key: _result_or_none(future) for key, future in simulations.items()}
+            return _get_ai_explanation(op_events, timelock_info, int(op_events[0]["chainId"]), results)
+
+        explanations = {
+            op_id: ai_pool.submit(explain, op_events, timelock_info, simulate(op_events, timelock_info))
+            for op_id, (op_events, timelock_info) in operations.items()
+        }
+        wait(explanations.values(), timeout=remaining())
+    finally:
+        lookup_pool.shutdown()
+        simulation_pool.shutdown()
+        ai_pool.shutdown()
+
+    results: dict[str, Explanation | None] = {}
+    dropped = 0
+    for op_id, future in explanations.items():
+        if future.done() and not future.cancelled():
+            results[op_id] = future.result()
+        else:
+            results[op_id] = None
+            dropped += 1
+    if dropped:
+        _logger.warning("Enrichment deadline of %.0fs hit, sending %s alerts without AI summary", deadline, dropped)
+    return results
+
+
+def build_alert_message(
+    events: list[dict],
+    timelock_info: TimelockConfig,
+    explanation: Explanation | None = None,
+    explain: bool = True,
+) -> str:
     """Build a Telegram alert message for a group of TimelockEvent events (same operationId).
 
     Priority order when message exceeds Telegram limit:
     header > AI summary > footer > call details (truncated first).
+
+    Args:
+        events: Events of the operation.
+        timelock_info: Config of the timelock that emitted them.
+        explanation: AI explanation computed ahead of time (see ``enrich_operations``).
+        explain: Generate the AI explanation here if ``explanation`` is not given.
     """
     first = events[0]
     chain_id = int(first["chainId"])
@@ -331,7 +636,8 @@ def build_alert_message(events: list[dict], timelock_info: TimelockConfig) -> st
 
     # AI explanation (best-effort, non-blocking)
     ai_line = ""
-    explanation = _get_ai_explanation(events, timelock_info, chain_id)
+    if explanation is None and explain:
+        explanation = _get_ai_explanation(events, timelock_info, chain_id)
     if explanation:
         ai_line = format_explanation_line(explanation)
 
@@ -363,93 +669,71 @@ def build_alert_message(events: list[dict], timelock_info: TimelockConfig) -> st
     return "\n".join(parts)
 
 
-def process_events(events: list[dict], use_cache: bool) -> None:
+def process_events(events: list[dict]) -> None:
     """Process TimelockEvent events, group by operationId, and send alerts."""
     if not events:
         _logger.info("No new events to process")
         return
 
-    # Group events: only TimelockController has batch operations (multiple
-    # CallScheduled events sharing the same operationId). All other types
-    # emit one event per operation, so each is its own group.
+    # Group events into operations (batched TimelockController calls share an operationId)
     operations: dict[str, list[dict]] = {}
     for event in events:
-        if event.get("timelockType") == "TimelockController":
-            key = event["operationId"]
-        else:
-            key = event["id"]
-        if key not in operations:
-            operations[key] = []
-        operations[key].append(event)
+        operations.setdefault(_operation_key(event), []).append(event)
 
     _logger.info("Processing %s operations from %s events", len(operations), len(events))
 
-    messages_by_protocol: dict[str, list[str]] = {}
-    max_timestamp = 0
-
+    known_operations: dict[str, tuple[list[dict], TimelockConfig]] = {}
     for op_id, op_events in operations.items():
         # Events are already ordered by logIndex from the GraphQL query
         # so call order within batch operations is preserved
-
         timelock_addr = op_events[0]["timelockAddress"].lower()
         chain_id = int(op_events[0]["chainId"])
         timelock_info = TIMELOCKS.get((timelock_addr, chain_id))
         if not timelock_info:
             _logger.warning("Unknown timelock address: %s", timelock_addr)
             continue
+        known_operations[op_id] = (op_events, timelock_info)
 
-        protocol = timelock_info.protocol
-        if protocol not in messages_by_protocol:
-            messages_by_protocol[protocol] = []
-        messages_by_protocol[protocol].append(build_alert_message(op_events, timelock_info))
+    explanations = enrich_operations(known_operations)
 
-        # Track max timestamp
-        for event in op_events:
-            ts = int(event["blockTimestamp"])
-            if ts > max_timestamp:
-                max_timestamp = ts
+    messages_by_protocol: dict[str, list[str]] = {}
+    for op_id, (op_events, timelock_info) in known_operations.items():
+        message = build_alert_message(op_events, timelock_info, explanations.get(op_id), explain=False)
+        messages_by_protocol.setdefault(timelock_info.protocol, []).append(message)
 
     # Send alerts grouped by protocol, splitting into chunks that fit Telegram's limit
-    separator = "\n\n---\n\n"
+    # Undelivered chunks go to the outbox, so the cursor can still advance
     for protocol, messages in messages_by_protocol.items():
-        chunks: list[str] = []
-        current_parts: list[str] = []
-        current_len = 0
-
-        for msg in messages:
-            added_len = len(msg) + (len(separator) if current_parts else 0)
-            if current_parts and current_len + added_len > MAX_MESSAGE_LENGTH:
-                chunks.append(separator.join(current_parts))
-                current_parts = [msg]
-                current_len = len(msg)
-            else:
-                current_parts.append(msg)
-                current_len += added_len
+        for chunk in chunk_messages(messages):
+            send_or_save(chunk, protocol)
 
-        if current_parts:
-            chunks.append(separator.join(current_parts))
 
-        for chunk in chunks:
-            try:
-                send_telegram_message(chunk, protocol)
-            except Exception:
-                _logger.exception("Failed to send Telegram alert for protocol %s", protocol)
+def initial_cursor(use_cache: bool, since_seconds: int = DEFAULT_SINCE_SECONDS) -> EventCursor:
+    """Cursor to resume from: the cached one, or ``since_seconds`` ago when there is none."""
+    if use_cache:
+        cached = get_last_value_for_key_from_file(cache_filename, CACHE_KEY)
+        if not cached or str(cached) == "0":
+            cached = get_last_value_for_key_from_file(cache_filename, LEGACY_CACHE_KEY)
+        if cached and str(cached) != "0":
+            after = EventCursor.parse(str(cached))
+            _logger.info("Using cached cursor: %s", after)
+            return after
 
-    if use_cache and max_timestamp > 0:
-        write_last_value_to_file(cache_filename, CACHE_KEY, str(max_timestamp))
-        _logger.info("Updated cache: %s = %s", CACHE_KEY, max_timestamp)
+    after = EventCursor(int(time.time()) - (since_seconds or 24 * 60 * 60))
+    _logger.info("No cached cursor, using fallback: %s", after)
+    return after
 
 
 def main() -> None:
     parser = argparse.ArgumentParser(description="Alert on all TimelockEvent types.")
-    parser.add_argument("--limit", type=int, default=100)
+    parser.add_argument("--limit", type=int, default=DEFAULT_LIMIT, help="Events fetched per page (default: 100)")
     parser.add_argument(
         "--since-seconds",
         type=int,
-        default=43200,
+        default=DEFAULT_SINCE_SECONDS,
         help="Fallback lookback window in seconds when no cache exists (default: 12h)",
     )
-    parser.add_argument("--no-cache", action="store_true", help="Disable caching of last processed timestamp")
+    parser.add_argument("--no-cache", action="store_true", help="Disable caching of the last processed event")
     parser.add_argument(
         "--protocol",
         type=str,
@@ -476,43 +760,8 @@ def main() -> None:
         _logger.info("Filtering to protocol %s: %s timelocks", protocol_filter, len(filtered_timelocks))
 
     use_cache = not args.no_cache
-
-    # Determine the starting timestamp
-    since_ts = 0
-    if use_cache:
-        cached_ts = get_last_value_for_key_from_file(cache_filename, CACHE_KEY)
-        if cached_ts and str(cached_ts) != "0":
-            since_ts = int(cached_ts)
-            _logger.info("Using cached timestamp: %s", since_ts)
-
-    if since_ts == 0:
-        since_ts = args.since_seconds or 24 * 60 * 60
-        since_ts = int(time.time()) - since_ts
-        _logger.info("No cached timestamp, using fallback: %s", since_ts)
-
-    _logger.info("Fetching TimelockEvent events since timestamp %s", since_ts)
-
-    response = load_events(args.limit, since_ts, filtered_timelocks)
-    if response is None:
-        msg = "⚠️ Timelock alerts: Envio API is unreachable after 3 retries"
-        _logger.error(msg)
-        for protocol in {t.protocol for t in (filtered_timelocks or TIMELOCK_LIST)}:
-            try:
-                send_telegram_message(msg, protocol)
-            except Exception:
-                _logger.exception("Failed to send Envio error alert for protocol %s", protocol)
-        return
-    if "errors" in response:
-        msg = f"Timelock alerts: GraphQL errors: {response['errors']}"
-        _logger.error(msg)
-        send_telegram_message(msg, protocol, plain_text=True)
-        return
-
-    data = response.get("data", {})
-    events = data.get("TimelockEvent", [])
-    _logger.info("Fetched %s TimelockEvent events", len(events))
-
-    process_events(events, use_cache)
+    after = initial_cursor(use_cache, args.since_seconds)
+    ingest_events(args.limit, after, filtered_timelocks, use_cache)
 
 
 if __name__ == "__main__":
@@ -29,14 +29,49 @@ Hooks (optional):
     if no hook is set yet (lazy import at end of module avoids cycles with ``dispatch``).
     Override with ``register_alert_hook(fn)``, or ``None`` to clear (tests). Hook
     exceptions are logged and swallowed.
+
+Outbox (optional):
+    With ``ALERT_OUTBOX=true`` (or after ``enable_alert_outbox()``), ``send_alert``
+    enqueues the Telegram message and returns immediately. A background worker
+    delivers it through a pooled session, spacing messages per chat
+    (``TELEGRAM_CHAT_INTERVAL``, default 1s) and globally (``TELEGRAM_GLOBAL_INTERVAL``,
+    default 1/30s), and waits out ``retry_after`` on HTTP 429. Pending alerts are
+    flushed at interpreter exit. Hooks still run synchronously.
+
+Deduplication (optional):
+    Pass ``fingerprint=AlertFingerprint(protocol, check, entity)`` for conditions
+    that persist across runs. The first alert is sent; repeats are suppressed
+    until severity escalates or ``ALERT_RENOTIFY_HOURS`` (default 24) pass. Call
+    ``resolve_alert(fingerprint, ...)`` when the condition is healthy to send a
+    "resolved" message once and clear the state. State lives in the cache file as
+    ``ALERT+<protocol>+<check>+<entity>:<severity>;<last sent>;<channel>``.
+
+Digests (optional):
+    Inside ``with alert_digest():`` LOW and MEDIUM alerts (and resolved messages)
+    are buffered per (channel, severity) and sent on exit as few messages as fit
+    ``MAX_MESSAGE_LENGTH``. HIGH and CRITICAL alerts are still sent immediately.
+
+Undelivered alerts:
+    If Telegram rejects or cannot be reached, the message is saved to the
+    durable outbox file (``utils.outbox``) instead of raising, and is resent
+    when the next run drains the outbox.
 """
 
+import atexit
+import queue
+import threading
+import time
+from contextlib import contextmanager
 from dataclasses import dataclass
 from enum import Enum
-from typing import Callable
+from typing import Callable, Iterator
 
+from utils import cache
+from utils.config import Config
+from utils.http import get_session
 from utils.logging import get_logger
-from utils.telegram import send_telegram_message
+from utils.outbox import save_undelivered
+from utils.telegram import TelegramError, chunk_messages, resolve_telegram_route, send_telegram_message
 
 logger = get_logger("utils.alert")
 
@@ -56,6 +91,12 @@ _SEVERITY_SILENT_DEFAULT = {
     "CRITICAL": False,
 }
 
+# Ordering used to detect escalation of a deduplicated alert
+_SEVERITY_RANK = {"LOW": 0, "MEDIUM": 1, "HIGH": 2, "CRITICAL": 3}
+
+DEFAULT_RENOTIFY_HOURS = 24.0
+ALERT_STATE_PREFIX = "ALERT+"
+
 # Module-level hook storage
 _alert_hook: Callable[["Alert"], None] | None = None
 
@@ -84,6 +125,277 @@ class Alert:
     channel: str = ""
 
 
+@dataclass
+class _OutboxItem:
+    message: str
+    channel: str
+    silent: bool
+    plain_text: bool
+    attempts: int = 0
+
+
+class AlertOutbox:
+    """Queue of Telegram messages delivered by a background thread, rate-limit aware.
+
+    Telegram allows roughly one message per second per chat and 30 per second per
+    bot. Topics share their group's budget, so pacing is keyed on ``chat_id``. The
+    worker sends in FIFO order, sleeping until the target chat's next slot.
+
+    Args:
+        chat_interval: Minimum seconds between messages to the same chat.
+        global_interval: Minimum seconds between any two messages.
+        max_attempts: Deliveries tried per message before it is recorded as failed.
+        max_retry_after: Upper bound on a single flood-control wait.
+    """
+
+    def __init__(
+        self,
+        chat_interval: float = 1.0,
+        global_interval: float = 1 / 30,
+        max_attempts: int = 3,
+        max_retry_after: float = 60.0,
+    ) -> None:
+        self.chat_interval = chat_interval
+        self.global_interval = global_interval
+        self.max_attempts = max_attempts
+        self.max_retry_after = max_retry_after
+        self.failed: list[_OutboxItem] = []
+        self.sent = 0
+        self._queue: queue.Queue[_OutboxItem] = queue.Queue()
+        self._session = get_session()
+        self._next_chat_slot: dict[str, float] = {}
+        self._next_global_slot = 0.0
+        self._thread: threading.Thread | None = None
+        self._lock = threading.Lock()
+
+    def submit(self, message: str, channel: str, silent: bool, plain_text: bool) -> None:
+        """Enqueue a message and make sure the worker is running."""
+        self._queue.put(_OutboxItem(message, channel, silent, plain_text))
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="alert-outbox", daemon=True)
+                self._thread.start()
+
+    def pending(self) -> int:
+        """Number of messages not yet delivered or given up on."""
+        return self._queue.unfinished_tasks
+
+    def flush(self, timeout: float | None = None) -> bool:
+        """Block until the queue drains. Returns False if ``timeout`` expired first."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._queue.all_tasks_done:
+            while self._queue.unfinished_tasks:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._queue.all_tasks_done.wait(remaining)
+        return True
+
+    def _run(self) -> None:
+        while True:
+            item = self._queue.get()
+            try:
+                self._deliver(item)
+            except Exception:
+                logger.exception("Alert outbox worker failed on %s message", item.channel)
+                self.failed.append(item)
+            finally:
+                self._queue.task_done()
+
+    def _wait_for_slot(self, chat_key: str) -> None:
+        now = time.monotonic()
+        ready = max(self._next_chat_slot.get(chat_key, 0.0), self._next_global_slot)
+        if ready > now:
+            time.sleep(ready - now)
+            now = ready
+        self._next_chat_slot[chat_key] = now + self.chat_interval
+        self._next_global_slot = now + self.global_interval
+
+    def _deliver(self, item: _OutboxItem) -> None:
+        route = resolve_telegram_route(item.channel)
+        chat_key = route[1] if route else item.channel
+        while True:
+            self._wait_for_slot(chat_key)
+            item.attempts += 1
+            try:
+                send_telegram_message(item.message, item.channel, item.silent, item.plain_text, session=self._session)
+                self.sent += 1
+                return
+            except TelegramError as e:
+                if item.attempts >= self.max_attempts:
+                    logger.error("Giving up on %s alert after %d attempts: %s", item.channel, item.attempts, e)
+                    self.failed.append(item)
+                    return
+                wait = min(e.retry_after if e.retry_after is not None else self.chat_interval, self.max_retry_after)
+                logger.warning("Telegram send for %s failed (%s), retrying in %.1fs", item.channel, e, wait)
+                # Flood control applies to the chat, so later messages to it must wait too
+                self._next_chat_slot[chat_key] = time.monotonic() + wait
+
+
+@dataclass(frozen=True)
+class AlertFingerprint:
+    """Identity of a persistent condition, e.g. ``("morpho", "low_liquidity", vault_address)``."""
+
+    protocol: str
+    check: str
+    entity: str
+
+    def cache_key(self) -> str:
+        # The cache file is key:value per line
+        parts = (self.protocol, self.check, self.entity)
+        return ALERT_STATE_PREFIX + "+".join(p.replace(":", "_").replace("\n", " ") for p in parts)
+
+
+@dataclass
+class _AlertState:
+    severity: str
+    last_sent: float
+    channel: str
+
+    def encode(self) -> str:
+        return f"{self.severity};{self.last_sent:.0f};{self.channel}"
+
+    @classmethod
+    def decode(cls, value: str) -> "_AlertState | None":
+        severity, _, rest = value.partition(";")
+        last_sent, _, channel = rest.partition(";")
+        if severity not in _SEVERITY_RANK:
+            return None
+        try:
+            return cls(severity, float(last_sent), channel)
+        except ValueError:
+            return None
+
+
+class AlertStateStore:
+    """Dedup state for fingerprinted alerts, indexed in memory and written through to a cache file.
+
+    The file is read once on first use; writes go through the key:value cache helpers
+    so keys owned by other code in the same file are preserved.
+
+    Args:
+        filename: Cache file to keep state in (defaults to ``CACHE_FILENAME``).
+    """
+
+    def __init__(self, filename: str | None = None) -> None:
+        self.filename = filename
+        self._states: dict[str, _AlertState] | None = None
+
+    @property
+    def path(self) -> str:
+        return self.filename or cache.cache_filename
+
+    def _index(self) -> dict[str, _AlertState]:
+        if self._states is None:
+            self._states = {}
+            for key, value in cache.load_cache_entries(self.path, "text").items():
+                if key.startswith(ALERT_STATE_PREFIX):
+                    state = _AlertState.decode(value)
+                    if state is not None:
+                        self._states[key] = state
+        return self._states
+
+    def get(self, fingerprint: AlertFingerprint) -> _AlertState | None:
+        return self._index().get(fingerprint.cache_key())
+
+    def put(self, fingerprint: AlertFingerprint, state: _AlertState) -> None:
+        self._index()[fingerprint.cache_key()] = state
+        cache.write_last_value_to_file(self.path, fingerprint.cache_key(), state.encode())
+
+    def clear(self, fingerprint: AlertFingerprint) -> None:
+        if self._index().pop(fingerprint.cache_key(), None) is not None:
+            cache.delete_key_from_file(self.path, fingerprint.cache_key())
+
+
+_alert_states = AlertStateStore()
+
+
+def set_alert_state_store(store: AlertStateStore) -> None:
+    """Replace the dedup state store (e.g. per workflow cache file, or in tests)."""
+    global _alert_states
+    _alert_states = store
+
+
+_outbox: AlertOutbox | None = None
+
+# Buffered digest messages per (channel, severity, silent, plain_text); None outside alert_digest()
+_digest: dict[tuple[str, str, bool, bool], list[str]] | None = None
+_DIGEST_SEVERITIES = ("LOW", "MEDIUM")
+
+
+@contextmanager
+def alert_digest() -> Iterator[None]:
+    """Buffer LOW/MEDIUM alerts for the duration of the block and send them as digests.
+
+    Nested blocks join the outermost one. The buffer is flushed even if the block raises.
+    """
+    global _digest
+    if _digest is not None:
+        yield
+        return
+    _digest = {}
+    try:
+        yield
+    finally:
+        buffered, _digest = _digest, None
+        _flush_digest(buffered)
+
+
+def _flush_digest(buffered: dict[tuple[str, str, bool, bool], list[str]]) -> None:
+    for (channel, severity, silent, plain_text), messages in buffered.items():
+        chunks = chunk_messages(messages)
+        logger.info("Sending %d %s alerts to %s as %d message(s)", len(messages), severity, channel, len(chunks))
+        for chunk in chunks:
+            _send(chunk, channel, silent, plain_text)
+
+
+def enable_alert_outbox(outbox: AlertOutbox | None = None) -> AlertOutbox:
+    """Route ``send_alert`` through a background outbox and flush it at exit.
+
+    Args:
+        outbox: Outbox to use; by default one is built from ``TELEGRAM_CHAT_INTERVAL``
+                and ``TELEGRAM_GLOBAL_INTERVAL``.
+    """
+    global _outbox
+    if outbox is None:
+        outbox = AlertOutbox(
+            chat_interval=Config.get_env_float("TELEGRAM_CHAT_INTERVAL", 1.0),
+            global_interval=Config.get_env_float("TELEGRAM_GLOBAL_INTERVAL", 1 / 30),
+        )
+    if _outbox is None:
+        atexit.register(flush_alerts)
+    _outbox = outbox
+    return outbox
+
+
+def disable_alert_outbox() -> None:
+    """Flush and detach the outbox; later alerts are sent synchronously again."""
+    global _outbox
+    if _outbox is not None:
+        flush_alerts()
+    _outbox = None
+
+
+def flush_alerts(timeout: float | None = None) -> bool:
+    """Wait for queued alerts to be delivered. Returns False if some are still pending.
+
+    Args:
+        timeout: Seconds to wait; defaults to ``ALERT_OUTBOX_FLUSH_TIMEOUT`` (120).
+    """
+    if _outbox is None:
+        return True
+    if timeout is None:
+        timeout = Config.get_env_float("ALERT_OUTBOX_FLUSH_TIMEOUT", 120.0)
+    drained = _outbox.flush(timeout)
+    if not drained:
+        logger.error("Alert outbox flush timed out with %d alerts pending", _outbox.pending())
+    # Persist give-ups from the main thread so cache file writes never race the monitor's own
+    while _outbox.failed:
+        item = _outbox.failed.pop(0)
+        save_undelivered(item.message, item.channel, item.silent, item.plain_text)
+    return drained
+
+
 def _ensure_default_dispatch_hook() -> None:
     """Install emergency dispatch hook if nothing registered (production default)."""
     global _alert_hook
@@ -112,7 +424,9 @@ def send_alert(
     *,
     silent: bool | None = None,
     plain_text: bool = False,
-) -> None:
+    fingerprint: AlertFingerprint | None = None,
+    renotify_after: float | None = None,
+) -> bool:
     """Send an alert via Telegram with auto-emoji prefix and severity-based defaults.
 
     Args:
@@ -121,6 +435,12 @@ def send_alert(
         silent: Override notification silencing. None uses severity default
                 (LOW/MEDIUM=silent, HIGH/CRITICAL=loud).
         plain_text: If True, send without Markdown formatting.
+        fingerprint: Identity of the condition; repeats are suppressed across runs.
+        renotify_after: Seconds after which a suppressed condition is re-sent
+                        (default ``ALERT_RENOTIFY_HOURS``).
+
+    Returns:
+        False if the alert was suppressed as a repeat, else True.
     """
     emoji = _SEVERITY_EMOJI[alert.severity.value]
     message = f"{emoji} {alert.message}"
@@ -128,7 +448,16 @@ def send_alert(
     if silent is None:
         silent = _SEVERITY_SILENT_DEFAULT[alert.severity.value]
 
-    send_telegram_message(message, alert.channel or alert.protocol, silent, plain_text)
+    channel = alert.channel or alert.protocol
+    sent = True
+    if fingerprint is not None:
+        sent = _should_notify(alert, fingerprint, renotify_after)
+        if sent:
+            _alert_states.put(fingerprint, _AlertState(alert.severity.value, time.time(), channel))
+        else:
+            logger.debug("Suppressing repeated %s alert for %s", alert.severity.value, fingerprint)
+    if sent:
+        _deliver(message, channel, silent, plain_text, alert.severity.value)
 
     # Invoke hook for HIGH and CRITICAL alerts
     if alert.severity in (AlertSeverity.HIGH, AlertSeverity.CRITICAL) and _alert_hook is not None:
@@ -136,7 +465,57 @@ def send_alert(
             _alert_hook(alert)
         except Exception:
             logger.exception("Alert hook failed for %s alert", alert.severity.value)
+    return sent
+
+
+def resolve_alert(fingerprint: AlertFingerprint, message: str, *, silent: bool = True) -> bool:
+    """Send a "resolved" message if ``fingerprint`` has an active alert, then clear it.
+
+    Safe to call every run for healthy entities: nothing is sent unless an alert
+    was previously raised.
+
+    Returns:
+        True if a resolved message was sent.
+    """
+    state = _alert_states.get(fingerprint)
+    if state is None:
+        return False
+    _alert_states.clear(fingerprint)
+    _deliver(f"✅ Resolved: {message}", state.channel, silent, False, AlertSeverity.LOW.value)
+    return True
+
+
+def _should_notify(alert: Alert, fingerprint: AlertFingerprint, renotify_after: float | None) -> bool:
+    state = _alert_states.get(fingerprint)
+    if state is None:
+        return True
+    if _SEVERITY_RANK[alert.severity.value] > _SEVERITY_RANK[state.severity]:
+        return True
+    if renotify_after is None:
+        renotify_after = Config.get_env_float("ALERT_RENOTIFY_HOURS", DEFAULT_RENOTIFY_HOURS) * 3600
+    return time.time() - state.last_sent >= renotify_after
+
+
+def _deliver(message: str, channel: str, silent: bool, plain_text: bool, severity: str) -> None:
+    if _digest is not None and severity in _DIGEST_SEVERITIES:
+        _digest.setdefault((channel, severity, silent, plain_text), []).append(message)
+        return
+    _send(message, channel, silent, plain_text)
+
+
+def _send(message: str, channel: str, silent: bool, plain_text: bool) -> None:
+    if _outbox is not None:
+        _outbox.submit(message, channel, silent, plain_text)
+        return
+    try:
+        send_telegram_message(message, channel, silent, plain_text)
+    except TelegramError as e:
+        logger.error("Failed to send alert for %s: %s", channel, e)
+        save_undelivered(message, channel, silent, plain_text)
 
 
 # After AlertSeverity / Alert exist so utils.dispatch can import this module safely.
 _ensure_default_dispatch_hook()
+
+if Config.get_env_bool("ALERT_OUTBOX", False):
+    enable_alert_outbox()
@@ -111,12 +111,17 @@ MAX_RISK_THRESHOLDS: dict[int, float] = {
 }
 
 
-def get_market_allocation_threshold(market_risk_level: int, vault_risk_level: int) -> float:
+def get_market_allocation_threshold(
+    market_risk_level: int, vault_risk_level: int, allocation_tiers: dict[int, float] | None = None
+) -> float:
     """Get allocation threshold based on market and vault risk levels.
 
     For higher vault risk levels, thresholds shift up (become more permissive).
     For example, if vault risk level is 2, then market risk level 2 assets
     get the tier-1 threshold (1.01) instead of tier-2 (0.30).
+
+    ``allocation_tiers`` overrides ``ALLOCATION_TIERS`` (used by threshold backtests).
     """
+    tiers = ALLOCATION_TIERS if allocation_tiers is None else allocation_tiers
     adjusted_risk = max(1, market_risk_level - (vault_risk_level - 1))
-    return ALLOCATION_TIERS[adjusted_risk]
+    return tiers[adjusted_risk]
@@ -1,10 +1,16 @@
+import copy
+import json
 import os
-from typing import Union
+from typing import IO, Any, Iterator, Protocol, Self, TypeVar, Union
 
 from dotenv import load_dotenv
 
+from utils.logging import get_logger
+
 load_dotenv()
 
+logger = get_logger("utils.cache")
+
 # format of the data: "protocol:value"
 cache_filename: str = os.getenv("CACHE_FILENAME", "cache-id.txt")
 # format of the data: "address:nonce"
@@ -76,3 +82,405 @@ def write_last_value_to_file(filename: str, write_key: str, write_value: Union[i
         lines = [f"{write_key}:{write_value}\n"]
         with open(filename, "w") as f:
             f.writelines(lines)
+
+
+def delete_key_from_file(filename: str, delete_key: str) -> None:
+    if not os.path.exists(filename):
+        return
+    with open(filename, "r") as f:
+        lines = f.readlines()
+    remaining = [line for line in lines if line.split(":", 1)[0] != delete_key]
+    if len(remaining) != len(lines):
+        with open(filename, "w") as f:
+            f.writelines(remaining)
+
+
+class StateRecord(Protocol):
+    """Structured record storable in a ``StateStore`` (e.g. ``TriggerState``)."""
+
+    def to_dict(self) -> dict: ...
+
+    @classmethod
+    def from_dict(cls, data: dict) -> Self: ...
+
+
+R = TypeVar("R", bound=StateRecord)
+
+# First line of a StateStore log file
+STATE_LOG_HEADER = {"format": "state-log", "version": 1}
+
+# Rewrite the log once it holds this many times more lines than live keys (plus a floor)
+STATE_COMPACT_RATIO = 2.0
+STATE_COMPACT_MIN_LINES = 100
+
+
+class StateStore:
+    """Key -> JSON record store persisted as an append-only log.
+
+    Each ``flush()`` appends one line per key changed since the last flush
+    (``{"k": key, "v": record}`` or ``{"k": key, "d": 1}`` for deletes), so a
+    run that touches a handful of keys writes a handful of lines regardless of
+    store size. Loading replays the log; ``compact()`` rewrites it with only the
+    live records and runs automatically once the log outgrows them.
+
+    A legacy file holding a single JSON object of ``{key: record}`` is imported
+    on load and rewritten in log format on the next flush.
+    """
+
+    def __init__(self, filename: str) -> None:
+        self.filename = filename
+        self._records: dict[str, Any] = {}
+        self._dirty: set[str] = set()
+        self._log_lines = 0
+        self._needs_rewrite = False
+        self._load()
+
+    def _load(self) -> None:
+        if not os.path.exists(self.filename):
+            return
+        with open(self.filename, "r") as f:
+            first_line = f.readline()
+            try:
+                header = json.loads(first_line) if first_line.strip() else None
+            except json.JSONDecodeError:
+                header = None
+
+            if not isinstance(header, dict) or header.get("format") != STATE_LOG_HEADER["format"]:
+                f.seek(0)
+                self._load_legacy(f)
+                return
+
+            for line_no, line in enumerate(f, 2):
+                try:
+                    entry = json.loads(line)
+                    key = entry["k"]
+                except (json.JSONDecodeError, KeyError, TypeError):
+                    # A torn final line from an interrupted write; everything before it is valid
+                    logger.warning("Ignoring malformed state log line %s:%d", self.filename, line_no)
+                    self._needs_rewrite = True
+                    continue
+                if entry.get("d"):
+                    self._records.pop(key, None)
+                else:
+                    self._records[key] = entry.get("v")
+                self._log_lines += 1
+
+    def _load_legacy(self, f: IO[str]) -> None:
+        try:
+            data = json.load(f)
+        except json.JSONDecodeError as e:
+            logger.warning("Failed to load state file %s: %s. Starting fresh.", self.filename, e)
+            data = {}
+        if not isinstance(data, dict):
+            logger.warning("Unexpected state file format in %s. Starting fresh.", self.filename)
+            data = {}
+        self._records = data
+        self._needs_rewrite = True
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._records
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def keys(self) -> list[str]:
+        return list(self._records)
+
+    def items(self) -> Iterator[tuple[str, Any]]:
+        for key in list(self._records):
+            yield key, copy.deepcopy(self._records[key])
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Return a copy of the record for ``key`` (mutating it does not change the store)."""
+        if key not in self._records:
+            return default
+        return copy.deepcopy(self._records[key])
+
+    def set(self, key: str, value: Any) -> None:
+        """Store ``value`` (JSON-serializable). No-op if it equals the stored record."""
+        if key in self._records and self._records[key] == value:
+            return
+        self._records[key] = copy.deepcopy(value)
+        self._dirty.add(key)
+
+    def update(self, key: str, fields: dict) -> None:
+        """Merge ``fields`` into the dict record for ``key``, creating it if missing."""
+        current = self._records.get(key)
+        merged = {**current, **fields} if isinstance(current, dict) else dict(fields)
+        self.set(key, merged)
+
+    def delete(self, key: str) -> None:
+        if key in self._records:
+            del self._records[key]
+            self._dirty.add(key)
+
+    def get_record(self, key: str, record_type: type[R]) -> R | None:
+        """Return the record for ``key`` decoded with ``record_type.from_dict``."""
+        data = self._records.get(key)
+        return record_type.from_dict(copy.deepcopy(data)) if data is not None else None
+
+    def set_record(self, key: str, record: StateRecord) -> None:
+        """Store a structured record via its ``to_dict``."""
+        self.set(key, record.to_dict())
+
+    def flush(self) -> int:
+        """Persist changes since the last flush. Returns the number of keys written."""
+        written = len(self._dirty)
+        if self._needs_rewrite or self._log_lines + written > max(
+            STATE_COMPACT_MIN_LINES, STATE_COMPACT_RATIO * len(self._records)
+        ):
+            self.compact()
+            return written
+        if not self._dirty:
+            return 0
+
+        lines = []
+        for key in sorted(self._dirty):
+            if key in self._records:
+                lines.append(json.dumps({"k": key, "v": self._records[key]}))
+            else:
+                lines.append(json.dumps({"k": key, "d": 1}))
+        new_file = not os.path.exists(self.filename)
+        with open(self.filename, "a") as f:
+            if new_file:
+                f.write(json.dumps(STATE_LOG_HEADER) + "\n")
+            f.write("\n".join(lines) + "\n")
+        self._log_lines += len(lines)
+        self._dirty.clear()
+        return written
+
+    def compact(self) -> None:
+        """Rewrite the log with one line per live key."""
+        tmp_filename = f"{self.filename}.tmp"
+        with open(tmp_filename, "w") as f:
+            f.write(json.dumps(STATE_LOG_HEADER) + "\n")
+            for key, value in self._records.items():
+                f.write(json.dumps({"k": key, "v": value}) + "\n")
+        os.replace(tmp_filename, self.filename)
+        self._log_lines = len(self._records)
+        self._dirty.clear()
+        self._needs_rewrite = False
+
+
+# --- Inspection / conversion helpers (used by the ``python -m utils.cache`` CLI) ---
+
+CACHE_FORMATS = ("text", "json", "state")
+
+
+def detect_cache_format(filename: str) -> str:
+    """Return the on-disk format of a cache file: ``text``, ``json`` or ``state``.
+
+    Missing or empty files are reported as ``text``, the default key:value format.
+    """
+    if not os.path.exists(filename):
+        return "text"
+    with open(filename, "r") as f:
+        first_line = f.readline()
+    stripped = first_line.strip()
+    if not stripped.startswith("{"):
+        return "text"
+    try:
+        header = json.loads(stripped)
+    except json.JSONDecodeError:
+        return "json"  # multi-line JSON object
+    if isinstance(header, dict) and header.get("format") == STATE_LOG_HEADER["format"]:
+        return "state"
+    return "json"
+
+
+def load_cache_entries(filename: str, fmt: str | None = None) -> dict[str, Any]:
+    """Load every entry of a cache file in a single read, whatever its format."""
+    fmt = fmt or detect_cache_format(filename)
+    if not os.path.exists(filename):
+        return {}
+    if fmt == "state":
+        store = StateStore(filename)
+        return {key: value for key, value in store.items()}
+    if fmt == "json":
+        with open(filename, "r") as f:
+            data = json.load(f)
+        if not isinstance(data, dict):
+            raise ValueError(f"{filename} does not contain a JSON object")
+        return data
+
+    entries: dict[str, Any] = {}
+    with open(filename, "r") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            key, _, value = line.partition(":")
+            # get_last_value_for_key_from_file returns the first match, so keep the first
+            entries.setdefault(key, value)
+    return entries
+
+
+def save_cache_entries(filename: str, entries: dict[str, Any], fmt: str) -> None:
+    """Atomically write ``entries`` to ``filename`` in the given format."""
+    if fmt not in CACHE_FORMATS:
+        raise ValueError(f"Unknown cache format {fmt!r}, expected one of {CACHE_FORMATS}")
+    text_lines = []
+    if fmt == "text":
+        for key, value in entries.items():
+            text_value = value if isinstance(value, str) else json.dumps(value)
+            # Readers split each line on every ":", so neither side may contain one
+            if ":" in text_value or "\n" in text_value or ":" in key or "\n" in key:
+                raise ValueError(f"Entry {key!r} cannot be stored in the key:value text format")
+            text_lines.append(f"{key}:{text_value}\n")
+
+    tmp_filename = f"{filename}.tmp"
+    with open(tmp_filename, "w") as f:
+        if fmt == "state":
+            f.write(json.dumps(STATE_LOG_HEADER) + "\n")
+            for key, value in entries.items():
+                f.write(json.dumps({"k": key, "v": value}) + "\n")
+        elif fmt == "json":
+            json.dump(entries, f, indent=2)
+        else:
+            f.writelines(text_lines)
+    os.replace(tmp_filename, filename)
+
+
+def key_namespace(key: str) -> str:
+    """Group a cache key by its leading segment (e.g. ``3JANE_USD3_PPS`` -> ``3jane``).
+
+    Keys are split on the first ``_`` or ``+``; bare addresses (nonce files) group as ``address``.
+    """
+    for i, ch in enumerate(key):
+        if ch in "_+":
+            return key[:i].lower()
+    return "address" if key.startswith("0x") else key.lower()
+
+
+def _parse_cli_value(raw: str, fmt: str) -> Any:
+    if fmt == "text":
+        return raw
+    try:
+        return json.loads(raw)
+    except json.JSONDecodeError:
+        return raw
+
+
+def main() -> None:
+    import argparse
+    import sys
+    import time
+
+    parser = argparse.ArgumentParser(description="Inspect, edit, compact and convert monitor cache files.")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p_list = sub.add_parser("list", help="List namespaces and key counts")
+    p_list.add_argument("file")
+
+    p_dump = sub.add_parser("dump", help="Dump entries as JSON")
+    p_dump.add_argument("file")
+    p_dump.add_argument("--namespace", help="Only keys in this namespace")
+    p_dump.add_argument("--prefix", help="Only keys starting with this prefix")
+
+    p_get = sub.add_parser("get", help="Print one entry")
+    p_get.add_argument("file")
+    p_get.add_argument("key")
+
+    p_set = sub.add_parser("set", help="Set one entry (value parsed as JSON for json/state files)")
+    p_set.add_argument("file")
+    p_set.add_argument("key")
+    p_set.add_argument("value")
+
+    p_delete = sub.add_parser("delete", help="Delete one or more entries")
+    p_delete.add_argument("file")
+    p_delete.add_argument("keys", nargs="+")
+
+    p_compact = sub.add_parser("compact", help="Rewrite the file with one line per live key")
+    p_compact.add_argument("file")
+
+    p_export = sub.add_parser("export", help="Write all entries to a new file in another format")
+    p_export.add_argument("file")
+    p_export.add_argument("dest")
+    p_export.add_argument("--format", choices=CACHE_FORMATS, required=True)
+
+    p_import = sub.add_parser("import", help="Merge entries from another cache file (any format)")
+    p_import.add_argument("file")
+    p_import.add_argument("source")
+    p_import.add_argument("--overwrite", action="store_true", help="Replace keys that already exist")
+
+    args = parser.parse_args()
+    fmt = detect_cache_format(args.file)
+    started = time.monotonic()
+
+    if args.command == "list":
+        entries = load_cache_entries(args.file, fmt)
+        counts: dict[str, int] = {}
+        for key in entries:
+            namespace = key_namespace(key)
+            counts[namespace] = counts.get(namespace, 0) + 1
+        sys.stdout.write(f"{args.file} ({fmt}): {len(entries)} keys in {len(counts)} namespaces\n")
+        for namespace, count in sorted(counts.items(), key=lambda kv: (-kv[1], kv[0])):
+            sys.stdout.write(f"{count:>8}  {namespace}\n")
+
+    elif args.command == "dump":
+        entries = load_cache_entries(args.file, fmt)
+        selected = {
+            key: value
+            for key, value in entries.items()
+            if (args.namespace is None or key_namespace(key) == args.namespace.lower())
+            and (args.prefix is None or key.startswith(args.prefix))
+        }
+        json.dump(selected, sys.stdout, indent=2)
+        sys.stdout.write("\n")
+
+    elif args.command == "get":
+        entries = load_cache_entries(args.file, fmt)
+        if args.key not in entries:
+            logger.error("Key %s not found in %s", args.key, args.file)
+            sys.exit(1)
+        json.dump(entries[args.key], sys.stdout, indent=2)
+        sys.stdout.write("\n")
+
+    elif args.command in ("set", "delete"):
+        if fmt == "state":
+            store = StateStore(args.file)
+            if args.command == "set":
+                store.set(args.key, _parse_cli_value(args.value, fmt))
+            else:
+                for key in args.keys:
+                    store.delete(key)
+            store.flush()
+        else:
+            entries = load_cache_entries(args.file, fmt)
+            if args.command == "set":
+                entries[args.key] = _parse_cli_value(args.value, fmt)
+            else:
+                for key in args.keys:
+                    entries.pop(key, None)
+            save_cache_entries(args.file, entries, fmt)
+        logger.info("Updated %s", args.file)
+
+    elif args.command == "compact":
+        size_before = os.path.getsize(args.file) if os.path.exists(args.file) else 0
+        if fmt == "state":
+            StateStore(args.file).compact()
+        else:
+            save_cache_entries(args.file, load_cache_entries(args.file, fmt), fmt)
+        logger.info("Compacted %s: %d -> %d bytes", args.file, size_before, os.path.getsize(args.file))
+
+    elif args.command == "export":
+        entries = load_cache_entries(args.file, fmt)
+        save_cache_entries(args.dest, entries, args.format)
+        logger.info("Exported %d keys from %s (%s) to %s (%s)", len(entries), args.file, fmt, args.dest, args.format)
+
+    elif args.command == "import":
+        entries = load_cache_entries(args.file, fmt)
+        incoming = load_cache_entries(args.source)
+        added = 0
+        for key, value in incoming.items():
+            if args.overwrite or key not in entries:
+                entries[key] = value
+                added += 1
+        save_cache_entries(args.file, entries, fmt)
+        logger.info("Imported %d/%d keys from %s into %s", added, len(incoming), args.source, args.file)
+
+    logger.debug("%s finished in %.3fs", args.command, time.monotonic() - started)
+
+
+if __name__ == "__main__":
+    main()
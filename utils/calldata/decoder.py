@@ -1,10 +1,12 @@
 """Decode raw calldata into human-readable function calls.
 
-Uses a local lookup table for common selectors and falls back to the
-Sourcify 4byte signature database API for unknown ones.
+Uses a local lookup table for common selectors, then the persistent selector
+cache, and falls back to the Sourcify 4byte signature database API for
+selectors not seen before.
 """
 
 import re
+from collections.abc import Iterable
 from dataclasses import dataclass, field
 from typing import Any
 
@@ -12,6 +14,7 @@ from eth_abi import decode
 from eth_utils import to_checksum_address
 
 from utils.calldata.known_selectors import KNOWN_SELECTORS
+from utils.calldata.selector_cache import get_selector_cache
 from utils.http import fetch_json
 from utils.logging import get_logger
 
@@ -22,6 +25,8 @@ _selector_cache: dict[str, str | None] = {}
 
 # Sourcify 4byte signature database (successor to openchain.xyz)
 _SELECTOR_LOOKUP_URL = "https://api.4byte.sourcify.dev/signature-database/v1/lookup"
+# Selectors per lookup request (comma-separated in the query string)
+_SELECTOR_BATCH_SIZE = 100
 
 
 @dataclass(frozen=True)
@@ -33,45 +38,88 @@ class DecodedCall:
     params: list[tuple[str, Any]] = field(default_factory=list)
 
 
-def resolve_selector(selector_hex: str) -> str | None:
-    """Resolve a 4-byte function selector to its text signature.
+def _cached_signature(selector_hex: str) -> tuple[bool, str | None]:
+    """Look up a lowercase selector without network calls. Returns ``(hit, signature)``."""
+    # 1. Local lookup table (no API call needed)
+    if selector_hex in KNOWN_SELECTORS:
+        return True, KNOWN_SELECTORS[selector_hex]
+
+    # 2. In-memory cache from previous lookups in this process
+    if selector_hex in _selector_cache:
+        return True, _selector_cache[selector_hex]
+
+    # 3. Persistent cache from previous runs
+    hit, sig = get_selector_cache().get(selector_hex)
+    if hit:
+        _selector_cache[selector_hex] = sig
+    return hit, sig
 
-    Checks the local known_selectors table first, then the in-memory cache,
-    and finally falls back to the Sourcify 4byte API.
+
+def resolve_selectors(selectors: Iterable[str]) -> dict[str, str | None]:
+    """Resolve several 4-byte selectors, looking up all unknown ones in bulk.
+
+    Selectors not found locally are sent to the Sourcify 4byte API as one
+    comma-separated lookup per ``_SELECTOR_BATCH_SIZE`` selectors, so a batch
+    operation with many inner calls costs one request instead of one per call.
 
     Args:
-        selector_hex: The 4-byte selector including 0x prefix, e.g. "0xabaa1988".
+        selectors: Selectors including 0x prefix; duplicates and case are ignored.
 
     Returns:
-        Function signature like "saveAssets()" or None if lookup fails.
+        Mapping of lowercase selector to signature, or None if the lookup failed.
     """
-    selector_hex = selector_hex.lower()
+    results: dict[str, str | None] = {}
+    missing: list[str] = []
+    for selector_hex in dict.fromkeys(s.lower() for s in selectors):
+        hit, sig = _cached_signature(selector_hex)
+        if hit:
+            results[selector_hex] = sig
+        else:
+            missing.append(selector_hex)
+
+    # 4. Remote API fallback
+    for start in range(0, len(missing), _SELECTOR_BATCH_SIZE):
+        chunk = missing[start : start + _SELECTOR_BATCH_SIZE]
+        data = fetch_json(_SELECTOR_LOOKUP_URL, params={"function": ",".join(chunk)})
+        if not data:
+            # Request failed; only remembered for this process
+            for selector_hex in chunk:
+                _selector_cache[selector_hex] = results[selector_hex] = None
+            continue
+
+        try:
+            functions = data.get("result", {}).get("function", {}) or {}
+        except AttributeError:
+            functions = {}
+        found: dict[str, str | None] = {}
+        for selector_hex in chunk:
+            sig = None
+            try:
+                matches = functions.get(selector_hex)
+                if matches:
+                    sig = matches[0].get("name")
+            except (AttributeError, IndexError, TypeError):
+                pass
+            _selector_cache[selector_hex] = results[selector_hex] = found[selector_hex] = sig
+        get_selector_cache().set_many(found)
+        logger.debug("Resolved %s/%s selectors from Sourcify", sum(1 for v in found.values() if v), len(chunk))
 
-    # 1. Local lookup table (no API call needed)
-    if selector_hex in KNOWN_SELECTORS:
-        return KNOWN_SELECTORS[selector_hex]
+    return results
 
-    # 2. In-memory cache from previous API calls
-    if selector_hex in _selector_cache:
-        return _selector_cache[selector_hex]
 
-    # 3. Remote API fallback
-    data = fetch_json(_SELECTOR_LOOKUP_URL, params={"function": selector_hex})
-    if not data:
-        _selector_cache[selector_hex] = None
-        return None
+def resolve_selector(selector_hex: str) -> str | None:
+    """Resolve a 4-byte function selector to its text signature.
+
+    Checks the local known_selectors table first, then the in-memory cache, then
+    the persistent selector cache, and finally falls back to the Sourcify 4byte API.
 
-    try:
-        results = data.get("result", {}).get("function", {}).get(selector_hex)
-        if results and len(results) > 0:
-            sig = results[0].get("name")
-            _selector_cache[selector_hex] = sig
-            return sig
-    except (AttributeError, IndexError, TypeError):
-        pass
-
-    _selector_cache[selector_hex] = None
-    return None
+    Args:
+        selector_hex: The 4-byte selector including 0x prefix, e.g. "0xabaa1988".
+
+    Returns:
+        Function signature like "saveAssets()" or None if lookup fails.
+    """
+    return resolve_selectors([selector_hex])[selector_hex.lower()]
 
 
 def _parse_param_types(signature: str) -> list[str]:
@@ -0,0 +1,81 @@
+"""Persistent cache of 4-byte selector lookups.
+
+Signatures resolved from the Sourcify API are kept indefinitely, since a
+selector's known signature doesn't change. Selectors the API had no match for
+are remembered for ``SELECTOR_NEGATIVE_TTL`` seconds (default one day) and
+then looked up again, as new signatures get submitted. Lookups that failed
+(network errors) are not persisted.
+
+Entries live in a ``StateStore`` at ``SELECTOR_CACHE_FILENAME`` (default
+``selector-cache.json``) shared by every monitor that decodes calldata.
+"""
+
+import os
+import threading
+import time
+
+from utils.cache import StateStore
+from utils.config import Config
+
+DEFAULT_NEGATIVE_TTL = 86400
+
+
+class SelectorCache:
+    """Selector -> signature cache persisted as a ``StateStore`` log.
+
+    Records are ``{"signature": str}`` for resolved selectors and
+    ``{"signature": None, "checked": unix_ts}`` for selectors without a match.
+    The file is loaded on first use; writes are flushed immediately so
+    concurrent lookups from worker threads are not lost if a run is cut short.
+    """
+
+    def __init__(self, filename: str, negative_ttl: int = DEFAULT_NEGATIVE_TTL) -> None:
+        self.filename = filename
+        self.negative_ttl = negative_ttl
+        self._store: StateStore | None = None
+        self._lock = threading.Lock()
+
+    def _loaded(self) -> StateStore:
+        if self._store is None:
+            self._store = StateStore(self.filename)
+        return self._store
+
+    def get(self, selector: str) -> tuple[bool, str | None]:
+        """Return ``(hit, signature)``; expired negative entries are misses."""
+        with self._lock:
+            record = self._loaded().get(selector)
+        if not isinstance(record, dict):
+            return False, None
+        signature = record.get("signature")
+        if signature:
+            return True, signature
+        if time.time() - record.get("checked", 0) < self.negative_ttl:
+            return True, None
+        return False, None
+
+    def set(self, selector: str, signature: str | None) -> None:
+        """Persist a resolved signature, or that the API had no match for ``selector``."""
+        self.set_many({selector: signature})
+
+    def set_many(self, signatures: dict[str, str | None]) -> None:
+        """Persist several lookup results with a single flush."""
+        checked = int(time.time())
+        with self._lock:
+            store = self._loaded()
+            for selector, signature in signatures.items():
+                store.set(selector, {"signature": signature} if signature else {"signature": None, "checked": checked})
+            store.flush()
+
+
+_default_cache: SelectorCache | None = None
+
+
+def get_selector_cache() -> SelectorCache:
+    """Process-wide cache at ``SELECTOR_CACHE_FILENAME``."""
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = SelectorCache(
+            os.getenv("SELECTOR_CACHE_FILENAME", "selector-cache.json"),
+            Config.get_env_int("SELECTOR_NEGATIVE_TTL", DEFAULT_NEGATIVE_TTL),
+        )
+    return _default_cache
@@ -16,6 +16,7 @@ import requests
 
 from utils.alert import Alert, AlertSeverity
 from utils.cache import cache_filename, get_last_value_for_key_from_file, write_last_value_to_file
+from utils.http import get_session
 from utils.logging import get_logger
 
 logger = get_logger("utils.dispatch")
@@ -92,7 +93,7 @@ def dispatch_emergency_withdrawal(alert: Alert) -> None:
     }
 
     try:
-        response = requests.post(
+        response = get_session().post(
             DISPATCH_URL,
             json=payload,
             headers={
@@ -0,0 +1,104 @@
+"""Combined queries against the Envio indexer.
+
+Monitors describe what they read from Envio as ``EnvioSelection`` values (an
+entity, its filter, ordering, page size and fields). ``build_query`` renders a
+list of them into one GraphQL document with an aliased root field per
+selection, each with its own ``where`` and ``limit`` variables, so monitors
+reading different entities or cursors can share a single request.
+
+``fetch_combined`` does this across monitors: each monitor's selections are
+namespaced by a group name, fetched in one round trip, and handed back per
+group in the same shape a monitor's own query would return.
+
+Usage::
+
+    from utils.envio import EnvioSelection, fetch_combined
+
+    data = fetch_combined({"timelock": [timelock_selection], "flows_1": flow_selections})
+    timelock_events = data["timelock"]["TimelockEvent"]
+"""
+
+from dataclasses import dataclass, field, replace
+from typing import Any
+
+from utils.graphql import GraphQLClient, get_envio_client
+
+
+@dataclass(frozen=True)
+class EnvioSelection:
+    """One aliased root field of an Envio query.
+
+    Attributes:
+        alias: Key of the result under ``data``.
+        entity: Envio entity, e.g. ``"TimelockEvent"`` or ``"Deposit"``.
+        where: Hasura ``<entity>_bool_exp`` filter, passed as a variable.
+        limit: Maximum number of rows.
+        fields: Fields selected on each row.
+        order_by: Fields to sort by, ascending, in priority order.
+    """
+
+    alias: str
+    entity: str
+    where: dict[str, Any]
+    limit: int
+    fields: tuple[str, ...]
+    order_by: tuple[str, ...] = field(default=())
+
+
+def build_query(selections: list[EnvioSelection], name: str = "EnvioEvents") -> tuple[str, dict[str, Any]]:
+    """Render selections into one query document and its variables.
+
+    Raises:
+        ValueError: If two selections share an alias.
+    """
+    aliases = [s.alias for s in selections]
+    if len(set(aliases)) != len(aliases):
+        raise ValueError(f"Duplicate Envio selection aliases: {aliases}")
+
+    declarations: list[str] = []
+    roots: list[str] = []
+    variables: dict[str, Any] = {}
+    for s in selections:
+        where_var, limit_var = f"{s.alias}Where", f"{s.alias}Limit"
+        declarations += [f"${where_var}: {s.entity}_bool_exp!", f"${limit_var}: Int!"]
+        variables[where_var] = s.where
+        variables[limit_var] = s.limit
+        order_by = f" order_by: {{ {', '.join(f'{f}: asc' for f in s.order_by)} }}" if s.order_by else ""
+        fields = "\n    ".join(s.fields)
+        roots.append(
+            f"  {s.alias}: {s.entity}(where: ${where_var}{order_by} limit: ${limit_var}) {{\n    {fields}\n  }}"
+        )
+
+    query = f"query {name}({', '.join(declarations)}) {{\n" + "\n".join(roots) + "\n}"
+    return query, variables
+
+
+def fetch_combined(
+    groups: dict[str, list[EnvioSelection]],
+    client: GraphQLClient | None = None,
+) -> dict[str, dict[str, list[dict]]]:
+    """Fetch every group's selections in one request and split the result by group.
+
+    Selections are aliased ``<group>_<alias>`` on the wire; each group gets back
+    a dict keyed by its own aliases, like the ``data`` of a standalone query.
+
+    Raises:
+        GraphQLError: If the response contains ``errors``.
+        requests.RequestException: When the request fails after retries.
+        ValueError: If the response body is not JSON.
+    """
+    wire: list[EnvioSelection] = []
+    owners: dict[str, tuple[str, str]] = {}
+    for group, selections in groups.items():
+        for s in selections:
+            alias = f"{group}_{s.alias}"
+            wire.append(replace(s, alias=alias))
+            owners[alias] = (group, s.alias)
+
+    query, variables = build_query(wire)
+    data = (client or get_envio_client()).data(query, variables)
+
+    result: dict[str, dict[str, list[dict]]] = {group: {} for group in groups}
+    for alias, (group, own_alias) in owners.items():
+        result[group][own_alias] = data.get(alias) or []
+    return result
@@ -1,4 +1,7 @@
 import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 
 import requests
@@ -8,100 +11,154 @@ from utils.assets import (
     SUPPLY_ASSETS_DICT,
     get_market_allocation_threshold,
 )
+from utils.config import Config
 from utils.formatting import format_usd
+from utils.http import request_with_retry
 from utils.logging import get_logger
 
 logger = get_logger("utils.gauntlet")
 
 
+GAUNTLET_BASE_URL = "https://dashboards.gauntlet.xyz"
+DEFAULT_BUILD_ID_TTL = 3600  # seconds
+DEFAULT_MAX_WORKERS = 4
+
+
+class GauntletClient:
+    """Client for the Next.js data pages behind dashboards.gauntlet.xyz.
+
+    Page data lives under ``/_next/data/<buildId>/...``. The build id is scraped
+    from the dashboard HTML once and reused until ``build_id_ttl`` expires or a
+    data request returns 404 (a new deploy), so data requests don't download the
+    dashboard first. All requests share the pooled session and retry transient errors.
+
+    Args:
+        build_id_ttl: Seconds to reuse a build id. Defaults to ``GAUNTLET_BUILD_ID_TTL`` (3600).
+        max_workers: Concurrent page fetches in ``get_charts_for_markets``.
+    """
+
+    def __init__(self, build_id_ttl: float | None = None, max_workers: int = DEFAULT_MAX_WORKERS) -> None:
+        if build_id_ttl is None:
+            build_id_ttl = Config.get_env_float("GAUNTLET_BUILD_ID_TTL", DEFAULT_BUILD_ID_TTL)
+        self.build_id_ttl = build_id_ttl
+        self.max_workers = max_workers
+        self._build_id: str | None = None
+        self._build_id_fetched_at = 0.0
+        self._lock = threading.Lock()
+
+    def build_id(self, refresh: bool = False) -> str:
+        """Return the current dashboard build id, fetching it if missing, stale or ``refresh`` is set.
+
+        Raises:
+            requests.RequestException: If the dashboard cannot be fetched.
+            ValueError: If no build id is found in the HTML.
+        """
+        with self._lock:
+            expired = time.monotonic() - self._build_id_fetched_at >= self.build_id_ttl
+            if refresh or self._build_id is None or expired:
+                response = request_with_retry("get", f"{GAUNTLET_BASE_URL}/")
+                # It's usually in a script tag with id="__NEXT_DATA__"
+                match = re.search(r'"buildId":"([^"]+)"', response.text)
+                if not match:
+                    raise ValueError("Gauntlet build ID not found in dashboard HTML")
+                self._build_id = match.group(1)
+                self._build_id_fetched_at = time.monotonic()
+                logger.debug("Gauntlet build ID: %s", self._build_id)
+            return self._build_id
+
+    def fetch_page(self, path: str, retries: int | None = None) -> dict:
+        """Fetch ``/_next/data/<buildId>/<path>`` as JSON, refreshing the build id once on 404.
+
+        Raises:
+            requests.RequestException: On request failure after retries.
+            ValueError: If the body is not JSON or no build id is found.
+        """
+        build_id = self.build_id()
+        try:
+            response = request_with_retry("get", f"{GAUNTLET_BASE_URL}/_next/data/{build_id}/{path}", retries=retries)
+        except requests.HTTPError as e:
+            if e.response is None or e.response.status_code != 404:
+                raise
+            logger.info("Gauntlet build ID %s is stale, refreshing", build_id)
+            build_id = self.build_id(refresh=True)
+            response = request_with_retry("get", f"{GAUNTLET_BASE_URL}/_next/data/{build_id}/{path}", retries=retries)
+        return response.json()
+
+    def get_markets(self, protocol: str, retries: int | None = None) -> list[dict]:
+        """Markets listed on a protocol page."""
+        protocol_lower = protocol.lower()
+        data = self.fetch_page(f"protocols/{protocol_lower}.json?protocolSlug={protocol_lower}", retries)
+        return data["pageProps"]["protocolPage"]["markets"]
+
+    def get_market_charts(self, protocol: str, market: str, retries: int | None = None) -> dict:
+        """First chart section of a market page (``scalarCards`` and ``charts``)."""
+        data = self.fetch_page(f"protocols/{protocol.lower()}/markets/{market}.json", retries)
+        # this is used only for euler, if there are more protocols, we need to change this
+        return data["pageProps"]["chartSections"][0]
+
+    def get_charts_for_markets(self, protocol: str, markets: list[str]) -> dict[str, dict | list]:
+        """Fetch several market pages concurrently. Failed markets map to ``[]`` (as ``get_charts_for_protocol_market``)."""
+        if not markets:
+            return {}
+        # Resolve the build id once up front so workers don't race to fetch it
+        try:
+            self.build_id()
+        except (requests.RequestException, ValueError) as e:
+            logger.error("Error fetching Gauntlet build ID: %s", e)
+            return {market: [] for market in markets}
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(markets))) as executor:
+            results = executor.map(
+                lambda market: get_charts_for_protocol_market(protocol, market, client=self), markets
+            )
+            return dict(zip(markets, results))
+
+
+_client: GauntletClient | None = None
+
+
+def get_gauntlet_client() -> GauntletClient:
+    """Process-wide Gauntlet client, so the build id is resolved once per run."""
+    global _client
+    if _client is None:
+        _client = GauntletClient()
+    return _client
+
+
 def get_gauntlet_build_id() -> str | None:
-    """Get the latest build ID from Gauntlet dashboard"""
+    """Get the latest build ID from Gauntlet dashboard (cached, see ``GauntletClient``)"""
     try:
-        # Request the main page first to get the latest build ID
-        response = requests.get("https://dashboards.gauntlet.xyz/")
-        response.raise_for_status()
-
-        # Find the build ID in the HTML
-        # It's usually in a script tag with id="__NEXT_DATA__"
-        build_id = re.search(r'"buildId":"([^"]+)"', response.text)
-        if build_id:
-            return build_id.group(1)
+        return get_gauntlet_client().build_id()
     except Exception as e:
         logger.error("Error fetching Gauntlet build ID: %s", e)
     return None
 
 
-def get_markets_for_protocol(protocol, max_retries=3) -> list[dict]:
-    base_url = "https://dashboards.gauntlet.xyz/_next/data/{}/protocols/{}.json?protocolSlug={}"
+def get_markets_for_protocol(protocol, max_retries=3, client: GauntletClient | None = None) -> list[dict]:
+    try:
+        return (client or get_gauntlet_client()).get_markets(protocol, retries=max_retries - 1)
+    except requests.RequestException as e:
+        logger.error("Error fetching Gauntlet metrics after %s attempts: %s", max_retries, e)
+        return []
+    except ValueError as e:
+        logger.error("Error parsing Gauntlet JSON response: %s", e)
+        return []
+    except Exception as e:
+        logger.error("Unexpected error: %s", e)
+        return []
 
-    for attempt in range(max_retries):
-        try:
-            # Get the latest build ID
-            build_id = get_gauntlet_build_id()
-            if not build_id:
-                # or return []
-                raise Exception("Failed to get build ID")
-
-            # Construct the URL with the latest build ID
-            protocol_lower = protocol.lower()
-            urlHealthMetrics = base_url.format(build_id, protocol_lower, protocol_lower)
-
-            response = requests.get(urlHealthMetrics)
-            response.raise_for_status()
-            data = response.json()
-
-            # If we get here, the request was successful
-            # Continue with the existing logic
-            markets = data["pageProps"]["protocolPage"]["markets"]
-            return markets
-
-        except requests.RequestException as e:
-            if attempt == max_retries - 1:  # Last attempt
-                logger.error("Error fetching Gauntlet metrics after %s attempts: %s", max_retries, e)
-                return []
-            logger.warning("Attempt %s failed, retrying...", attempt + 1)
-            continue
-        except ValueError as e:
-            logger.error("Error parsing Gauntlet JSON response: %s", e)
-            return []
-        except Exception as e:
-            logger.error("Unexpected error: %s", e)
-            return []
-
-
-def get_charts_for_protocol_market(protocol, market, max_retries=3):
-    base_url = "https://dashboards.gauntlet.xyz/_next/data/{}/protocols/{}/markets/{}.json"
-
-    for attempt in range(max_retries):
-        try:
-            # Get the latest build ID
-            build_id = get_gauntlet_build_id()
-            if not build_id:
-                raise Exception("Failed to get build ID")
-
-            protocol_lower = protocol.lower()
-            urlCharts = base_url.format(build_id, protocol_lower, market)
-
-            response = requests.get(urlCharts)
-            response.raise_for_status()
-            data = response.json()
-
-            # this is used only for euler, if there are more protocols, we need to change this
-            # response has ["scalarCards"] and ["charts"]
-            return data["pageProps"]["chartSections"][0]
-
-        except requests.RequestException as e:
-            if attempt == max_retries - 1:  # Last attempt
-                logger.error("Error fetching Gauntlet charts after %s attempts: %s", max_retries, e)
-                return []
-            logger.warning("Attempt %s failed, retrying...", attempt + 1)
-            continue
-        except ValueError as e:
-            logger.error("Error parsing Gauntlet JSON response: %s", e)
-            return []
-        except Exception as e:
-            logger.error("Unexpected error: %s", e)
-            return []
+
+def get_charts_for_protocol_market(protocol, market, max_retries=3, client: GauntletClient | None = None):
+    try:
+        return (client or get_gauntlet_client()).get_market_charts(protocol, market, retries=max_retries - 1)
+    except requests.RequestException as e:
+        logger.error("Error fetching Gauntlet charts after %s attempts: %s", max_retries, e)
+        return []
+    except ValueError as e:
+        logger.error("Error parsing Gauntlet JSON response: %s", e)
+        return []
+    except Exception as e:
+        logger.error("Unexpected error: %s", e)
+        return []
 
 
 def get_timestamp_before(hours: int):
@@ -112,7 +169,11 @@ def get_timestamp_before(hours: int):
 
 
 def fetch_borrow_metrics_from_gauntlet(
-    protocol: str, market_key: str, vault_risk_level: int, debt_supply_ratio: float
+    protocol: str,
+    market_key: str,
+    vault_risk_level: int,
+    debt_supply_ratio: float,
+    charts: dict | list | None = None,
 ) -> list[str]:
     """Fetch and analyze market allocation metrics from Gauntlet.
 
@@ -121,12 +182,14 @@ def fetch_borrow_metrics_from_gauntlet(
         market_key: Market identifier within the protocol.
         vault_risk_level: Risk level used for allocation and max-risk thresholds.
         debt_supply_ratio: Alert when total_borrow / total_supply exceeds this value.
+        charts: Market charts already fetched (e.g. by ``GauntletClient.get_charts_for_markets``).
 
     Returns:
         Alert messages if any thresholds are exceeded.
     """
     alerts = []
-    charts = get_charts_for_protocol_market(protocol, market_key)
+    if charts is None:
+        charts = get_charts_for_protocol_market(protocol, market_key)
     if not charts:
         alerts.append(f"🚨 Market {market_key} charts cannot be fetched")
         return alerts
@@ -0,0 +1,281 @@
+"""GraphQL client over the shared pooled HTTP session.
+
+Each ``GraphQLClient`` targets one endpoint with its own timeout and retry
+policy. Transient failures (connection errors, timeouts, HTTP 429 and 5xx) are
+retried with exponential backoff and full jitter, so monitors hitting the same
+indexer at the top of the hour don't retry in lockstep. Clients record request
+count, retries, failures, response bytes and time per endpoint; the totals are
+logged at exit.
+
+Large collections are read with ``paginate``, a generator that requests one
+page at a time and yields its items, so a monitor only holds a single page in
+memory. Keyset pagination (``<field>_gt: $cursor`` ordered by that field) is
+preferred; offset pagination (``skip``) is available for APIs without it.
+
+Usage::
+
+    from utils.graphql import get_envio_client, get_graphql_client
+
+    response = get_envio_client().execute(query, {"since": since_ts})
+    events = response["data"]["TimelockEvent"]
+
+    # query declares $first and $cursor and filters on id_gt: $cursor, orderBy: id
+    for position in get_graphql_client(url).paginate(query, "siloPositions"):
+        ...
+"""
+
+import atexit
+import os
+import random
+import time
+from collections.abc import Iterator
+from dataclasses import dataclass
+from typing import Any
+
+import requests
+
+from utils.config import Config
+from utils.http import get_session
+from utils.logging import get_logger
+
+logger = get_logger("utils.graphql")
+
+RETRYABLE_STATUS_CODES = frozenset({429, 500, 502, 503, 504})
+DEFAULT_PAGE_SIZE = 100
+
+
+class GraphQLError(ValueError):
+    """The server answered with GraphQL ``errors``."""
+
+    def __init__(self, name: str, errors: list) -> None:
+        super().__init__(f"{name} returned GraphQL errors: {errors}")
+        self.errors = errors
+
+
+def _select(data: dict[str, Any], path: str) -> Any:
+    for field in path.split("."):
+        data = (data or {}).get(field)
+    return data
+
+
+@dataclass
+class EndpointMetrics:
+    """Counters for one GraphQL endpoint."""
+
+    requests: int = 0
+    retries: int = 0
+    failures: int = 0
+    bytes_received: int = 0
+    seconds: float = 0.0
+
+
+class GraphQLClient:
+    """Client for a single GraphQL endpoint.
+
+    Args:
+        url: Endpoint URL.
+        name: Label used in logs and metrics (defaults to the URL).
+        timeout: Per-request timeout in seconds. Defaults to ``Config.get_request_timeout()``.
+        retries: Retry attempts after the first request. Defaults to ``Config.get_retry_count()``.
+        backoff_factor: Base backoff in seconds. Defaults to ``Config.get_backoff_factor()``.
+        headers: Extra headers sent with every request (e.g. API keys).
+        batching: The server accepts a JSON array of operations in one POST.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        *,
+        name: str | None = None,
+        timeout: float | None = None,
+        retries: int | None = None,
+        backoff_factor: float | None = None,
+        headers: dict[str, str] | None = None,
+        batching: bool = False,
+    ) -> None:
+        self.url = url
+        self.name = name or url
+        self.timeout = timeout if timeout is not None else Config.get_request_timeout()
+        self.retries = retries if retries is not None else Config.get_retry_count()
+        self.backoff_factor = backoff_factor if backoff_factor is not None else Config.get_backoff_factor()
+        self.headers = {"Accept": "application/json", **(headers or {})}
+        self.batching = batching
+        self.metrics = EndpointMetrics()
+
+    def execute(self, query: str, variables: dict[str, Any] | None = None) -> dict[str, Any]:
+        """POST a query and return the decoded response body (``data`` and/or ``errors``).
+
+        GraphQL-level ``errors`` are returned to the caller, not raised.
+
+        Raises:
+            requests.RequestException: When retries are exhausted or on non-retryable HTTP errors.
+            ValueError: If the response body is not JSON.
+        """
+        return self._post({"query": query, "variables": variables or {}})
+
+    def data(self, query: str, variables: dict[str, Any] | None = None) -> dict[str, Any]:
+        """Execute a query and return its ``data``.
+
+        Raises:
+            GraphQLError: If the response contains ``errors``.
+            requests.RequestException: As ``execute``.
+            ValueError: As ``execute``.
+        """
+        response = self.execute(query, variables)
+        if response.get("errors"):
+            raise GraphQLError(self.name, response["errors"])
+        return response.get("data") or {}
+
+    def execute_batch(self, operations: list[tuple[str, dict[str, Any] | None]]) -> list[dict[str, Any]]:
+        """Execute several ``(query, variables)`` operations, in one request when ``batching`` is set.
+
+        Servers that don't support batching get one request per operation.
+        Responses are returned in operation order.
+        """
+        if not self.batching or len(operations) < 2:
+            return [self.execute(query, variables) for query, variables in operations]
+        responses = self._post([{"query": query, "variables": variables or {}} for query, variables in operations])
+        if not isinstance(responses, list) or len(responses) != len(operations):
+            raise ValueError(f"{self.name} returned a malformed batch response")
+        return responses
+
+    def paginate(
+        self,
+        query: str,
+        path: str,
+        variables: dict[str, Any] | None = None,
+        *,
+        page_size: int = DEFAULT_PAGE_SIZE,
+        cursor_field: str | None = "id",
+        cursor_variable: str = "cursor",
+    ) -> Iterator[dict[str, Any]]:
+        """Yield the items of a paginated list field, one page per request.
+
+        With ``cursor_field`` set, ``query`` must declare ``$first`` and ``$<cursor_variable>``,
+        filter on ``<cursor_field>_gt`` and order by ``cursor_field`` ascending; the
+        next page starts after the last item seen. The initial cursor comes from
+        ``variables`` (default ``""``); an int cursor stays an int. With
+        ``cursor_field=None`` the query declares ``$first`` and ``$skip`` instead.
+
+        Args:
+            query: Query text.
+            path: Dotted path of the list under ``data`` (e.g. ``"vaults.items"``).
+            variables: Other variables, plus an optional initial cursor.
+            page_size: Items per request.
+            cursor_field: Item field used as the keyset cursor, or None for offset pagination.
+            cursor_variable: Name of the cursor variable.
+
+        Raises:
+            GraphQLError: If a page contains ``errors``.
+            requests.RequestException: As ``execute``.
+        """
+        variables = {**(variables or {}), "first": page_size}
+        if cursor_field:
+            variables.setdefault(cursor_variable, "")
+        else:
+            variables["skip"] = 0
+
+        while True:
+            items = _select(self.data(query, dict(variables)), path) or []
+            yield from items
+            if len(items) < page_size:
+                return
+            if cursor_field:
+                cursor = items[-1][cursor_field]
+                variables[cursor_variable] = int(cursor) if isinstance(variables[cursor_variable], int) else cursor
+            else:
+                variables["skip"] += len(items)
+
+    def _post(self, payload: dict[str, Any] | list[dict[str, Any]]) -> Any:
+        last_exception: requests.RequestException | None = None
+
+        for attempt in range(self.retries + 1):
+            if attempt:
+                self.metrics.retries += 1
+                # Full jitter: uniform in [0, backoff * 2^attempt]
+                wait_time = random.uniform(0, self.backoff_factor * (2**attempt))
+                logger.warning(
+                    "%s request failed (attempt %d/%d): %s. Retrying in %.1fs...",
+                    self.name,
+                    attempt,
+                    self.retries + 1,
+                    last_exception,
+                    wait_time,
+                )
+                time.sleep(wait_time)
+
+            self.metrics.requests += 1
+            started = time.monotonic()
+            try:
+                response = get_session().post(self.url, json=payload, headers=self.headers, timeout=self.timeout)
+                self.metrics.bytes_received += len(response.content)
+                response.raise_for_status()
+            except requests.HTTPError as e:
+                last_exception = e
+                if e.response is None or e.response.status_code not in RETRYABLE_STATUS_CODES:
+                    self.metrics.failures += 1
+                    raise
+                continue
+            except (requests.ConnectionError, requests.Timeout) as e:
+                last_exception = e
+                continue
+            finally:
+                self.metrics.seconds += time.monotonic() - started
+
+            logger.debug(
+                "%s responded %s with %d bytes in %.2fs",
+                self.name,
+                response.status_code,
+                len(response.content),
+                time.monotonic() - started,
+            )
+            return response.json()
+
+        self.metrics.failures += 1
+        logger.error("%s request failed after %d attempts: %s", self.name, self.retries + 1, last_exception)
+        raise last_exception  # type: ignore[misc]
+
+
+_clients: dict[str, GraphQLClient] = {}
+
+
+def get_graphql_client(url: str, **kwargs: Any) -> GraphQLClient:
+    """Return the shared client for ``url``, creating it with ``kwargs`` on first use."""
+    client = _clients.get(url)
+    if client is None:
+        client = _clients[url] = GraphQLClient(url, **kwargs)
+    return client
+
+
+def get_envio_client() -> GraphQLClient:
+    """Client for the Envio indexer at ``ENVIO_GRAPHQL_URL`` (timeout ``ENVIO_GRAPHQL_TIMEOUT``, default 30s).
+
+    Raises:
+        RuntimeError: If ``ENVIO_GRAPHQL_URL`` is not set.
+    """
+    url = os.getenv("ENVIO_GRAPHQL_URL")
+    if not url:
+        raise RuntimeError(
+            "ENVIO_GRAPHQL_URL is not set. Set it to the Envio GraphQL endpoint, "
+            "e.g. export ENVIO_GRAPHQL_URL='https://.../graphql'."
+        )
+    return get_graphql_client(url, name="envio", timeout=Config.get_env_float("ENVIO_GRAPHQL_TIMEOUT", 30.0))
+
+
+def log_metrics() -> None:
+    """Log per-endpoint totals for every client used in this process."""
+    for client in _clients.values():
+        m = client.metrics
+        if m.requests:
+            logger.info(
+                "%s: %d requests (%d retries, %d failed), %.1f KiB in %.2fs",
+                client.name,
+                m.requests,
+                m.retries,
+                m.failures,
+                m.bytes_received / 1024,
+                m.seconds,
+            )
+
+
+atexit.register(log_metrics)
@@ -1,15 +1,86 @@
-"""Simple HTTP helper for fetching JSON from APIs."""
+"""HTTP helpers for fetching JSON from APIs over shared, pooled sessions.
 
+Every outbound call should go through ``get_session()`` (or the helpers below)
+instead of ``requests.get``/``requests.post``, which open a fresh TCP+TLS
+connection per call. Sessions keep connections alive per host, so an hourly run
+hitting the same APIs repeatedly only pays the handshake once per host.
+
+Pool sizes are configurable with ``HTTP_POOL_CONNECTIONS`` (hosts kept per
+session, default 16) and ``HTTP_POOL_MAXSIZE`` (connections per host, default 10).
+
+``cached_get_json`` adds a disk cache (``HTTP_CACHE_DIR``, default ``.http-cache``)
+for slowly changing API data: responses younger than the caller's TTL are served
+from disk, older ones are revalidated with ``If-None-Match``/``If-Modified-Since``
+so an unchanged resource costs a 304 instead of a full download.
+
+``stream_json_items`` parses a large response incrementally and yields the
+items of one array (top level or at a dotted object path) as they arrive, so
+monitors can filter and aggregate without holding the whole body in memory.
+"""
+
+import atexit
+import codecs
+import hashlib
+import json
+import os
+import re
+import threading
 import time
+from collections.abc import Iterable, Iterator
 from typing import Any
 
 import requests
+from requests.adapters import HTTPAdapter
 
 from utils.config import Config
 from utils.logging import get_logger
 
 logger = get_logger("utils.http")
 
+DEFAULT_POOL_CONNECTIONS = 16
+DEFAULT_POOL_MAXSIZE = 10
+STREAM_CHUNK_SIZE = 64 * 1024
+# TTL for the yDaemon vault list: it changes rarely, so monitors reuse it for a while, then revalidate
+YDAEMON_CACHE_TTL = 15 * 60
+
+_sessions: dict[str, requests.Session] = {}
+_sessions_lock = threading.Lock()
+
+
+def get_session(name: str = "default") -> requests.Session:
+    """Return the shared keep-alive session registered under ``name``, creating it on first use.
+
+    Sessions pool connections per host and request gzip responses. Use a separate
+    name only when a caller needs isolated cookies or headers.
+    """
+    session = _sessions.get(name)
+    if session is not None:
+        return session
+    with _sessions_lock:
+        session = _sessions.get(name)
+        if session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(
+                pool_connections=Config.get_env_int("HTTP_POOL_CONNECTIONS", DEFAULT_POOL_CONNECTIONS),
+                pool_maxsize=Config.get_env_int("HTTP_POOL_MAXSIZE", DEFAULT_POOL_MAXSIZE),
+            )
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            session.headers["Accept-Encoding"] = "gzip, deflate"
+            _sessions[name] = session
+    return session
+
+
+def close_sessions() -> None:
+    """Close all pooled sessions (registered to run at exit)."""
+    with _sessions_lock:
+        for session in _sessions.values():
+            session.close()
+        _sessions.clear()
+
+
+atexit.register(close_sessions)
+
 
 def request_with_retry(
     method: str,
@@ -30,7 +101,7 @@ def request_with_retry(
         retries: Number of retry attempts. Defaults to Config.get_retry_count().
         backoff_factor: Multiplier for exponential backoff. Defaults to Config.get_backoff_factor().
         timeout: Request timeout in seconds. Defaults to Config.get_request_timeout().
-        **kwargs: Additional arguments passed to requests.request().
+        **kwargs: Additional arguments passed to Session.request().
 
     Returns:
         The successful Response object (with status already verified).
@@ -48,7 +119,7 @@ def request_with_retry(
     last_exception: Exception | None = None
     for attempt in range(retries + 1):
         try:
-            response = requests.request(method, url, timeout=timeout, **kwargs)
+            response = get_session().request(method, url, timeout=timeout, **kwargs)
             response.raise_for_status()
             return response
         except requests.exceptions.HTTPError as e:
@@ -88,7 +159,7 @@ def fetch_json(
     if timeout is None:
         timeout = Config.get_request_timeout()
     try:
-        resp = requests.request(method, url, timeout=timeout, **kwargs)
+        resp = get_session().request(method, url, timeout=timeout, **kwargs)
         if resp.status_code != 200:
             logger.error("HTTP %s for %s: %s", resp.status_code, url, resp.text[:200])
             return None
@@ -96,3 +167,260 @@ def fetch_json(
     except Exception as e:
         logger.error("Request failed for %s: %s", url, e)
         return None
+
+
+def _http_cache_path(url: str, cache_dir: str | None) -> str:
+    directory = cache_dir or os.getenv("HTTP_CACHE_DIR", ".http-cache")
+    return os.path.join(directory, hashlib.sha256(url.encode()).hexdigest() + ".json")
+
+
+def _read_http_cache(path: str) -> dict | None:
+    try:
+        with open(path, "r") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as e:
+        logger.warning("Ignoring unreadable HTTP cache entry %s: %s", path, e)
+        return None
+
+
+def _write_http_cache(path: str, entry: dict) -> None:
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(entry, f)
+        os.replace(tmp_path, path)
+    except OSError as e:
+        logger.warning("Failed to write HTTP cache entry %s: %s", path, e)
+
+
+def cached_get_json(
+    url: str,
+    ttl: float,
+    timeout: int | None = None,
+    cache_dir: str | None = None,
+    **kwargs: Any,
+) -> Any:
+    """GET a JSON resource through the disk cache.
+
+    Args:
+        url: The URL to fetch (the cache key, including query string).
+        ttl: Seconds a cached response is used without contacting the server. 0 always revalidates.
+        timeout: Request timeout in seconds. Defaults to Config.get_request_timeout().
+        cache_dir: Cache directory; defaults to ``HTTP_CACHE_DIR``.
+        **kwargs: Additional arguments passed to request_with_retry().
+
+    Returns:
+        The decoded JSON body.
+
+    Raises:
+        requests.RequestException: If the resource must be fetched and the request fails.
+    """
+    path = _http_cache_path(url, cache_dir)
+    entry = _read_http_cache(path)
+    now = time.time()
+    if entry is not None and now - entry["fetched_at"] < ttl:
+        logger.debug("HTTP cache hit for %s", url)
+        return json.loads(entry["body"])
+
+    headers = dict(kwargs.pop("headers", None) or {})
+    if entry is not None:
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+
+    response = request_with_retry("get", url, timeout=timeout, headers=headers, **kwargs)
+    if response.status_code == 304 and entry is not None:
+        logger.debug("HTTP cache revalidated %s", url)
+        entry["fetched_at"] = now
+        _write_http_cache(path, entry)
+        return json.loads(entry["body"])
+
+    body = response.text
+    data = json.loads(body)
+    _write_http_cache(
+        path,
+        {
+            "url": url,
+            "fetched_at": now,
+            "etag": response.headers.get("ETag"),
+            "last_modified": response.headers.get("Last-Modified"),
+            "body": body,
+        },
+    )
+    return data
+
+
+_JSON_WHITESPACE = re.compile(r"[ \t\n\r]*")
+_JSON_NUMBER_CHARS = "0123456789.eE+-"
+_json_decoder = json.JSONDecoder()
+
+
+class _JSONReader:
+    """Incremental reader over text or UTF-8 byte chunks that decodes one JSON value at a time."""
+
+    def __init__(self, chunks: Iterable[bytes | str]) -> None:
+        self._chunks = iter(chunks)
+        self._utf8 = codecs.getincrementaldecoder("utf-8")()
+        self.buf = ""
+        self.pos = 0
+        self.eof = False
+
+    def fill(self) -> bool:
+        """Append the next non-empty chunk, dropping consumed text. False at end of input."""
+        while not self.eof:
+            chunk = next(self._chunks, None)
+            if chunk is None:
+                self.eof = True
+                text = self._utf8.decode(b"", final=True)
+            else:
+                text = self._utf8.decode(chunk) if isinstance(chunk, bytes) else chunk
+            if text:
+                self.buf = self.buf[self.pos :] + text
+                self.pos = 0
+                return True
+        return False
+
+    def peek(self) -> str:
+        """Skip whitespace and return the next character ("" at end of input)."""
+        while True:
+            self.pos = _JSON_WHITESPACE.match(self.buf, self.pos).end()
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            if not self.fill():
+                return ""
+
+    def expect(self, char: str) -> None:
+        found = self.peek()
+        if found != char:
+            raise ValueError(f"Expected {char!r} in JSON stream, found {found or 'end of input'!r}")
+        self.pos += 1
+
+    def value(self) -> Any:
+        self.peek()
+        while True:
+            try:
+                value, end = _json_decoder.raw_decode(self.buf, self.pos)
+            except json.JSONDecodeError:
+                # Incomplete value: at least double the buffered text before retrying, so a
+                # value spanning many chunks is decoded O(log n) times rather than once per chunk
+                wanted = 2 * (len(self.buf) - self.pos)
+                if not self.fill():
+                    raise
+                while len(self.buf) - self.pos < wanted and self.fill():
+                    pass
+                continue
+            # A number cut at a chunk boundary ("1." or "12") decodes as a shorter one
+            if (end == len(self.buf) or self.buf[end] in _JSON_NUMBER_CHARS) and self.fill():
+                continue
+            self.pos = end
+            return value
+
+
+def _skip_to_member(reader: _JSONReader, prefix: list[str], key: str | None, fields: dict | None) -> bool:
+    """Read object members until ``key`` (left positioned at its value) or the closing brace.
+
+    Other members are decoded and, if ``fields`` is given, stored under their dotted path.
+    """
+    while True:
+        char = reader.peek()
+        if char == "}":
+            reader.pos += 1
+            return False
+        if char == ",":
+            reader.pos += 1
+            continue
+        name = reader.value()
+        if not isinstance(name, str):
+            raise ValueError(f"Expected an object key in JSON stream, found {name!r}")
+        reader.expect(":")
+        if name == key:
+            return True
+        value = reader.value()
+        if fields is not None:
+            fields[".".join([*prefix, name])] = value
+
+
+def iter_json_items(chunks: Iterable[bytes | str], path: str = "", fields: dict | None = None) -> Iterator[Any]:
+    """Yield the items of a JSON array from a chunked document, decoding one item at a time.
+
+    Args:
+        chunks: Document text as UTF-8 byte or str chunks (e.g. ``response.iter_content()``).
+        path: Dotted object path to the array (``""`` for a top-level array). Arrays along the
+            path are not supported. A missing or null array yields nothing.
+        fields: If given, filled with the other members of the objects along ``path``, keyed
+            by dotted path (e.g. ``"decimals"``). Members after the array are only read
+            once the generator is exhausted.
+
+    Raises:
+        ValueError: If the document is malformed.
+    """
+    reader = _JSONReader(chunks)
+    keys = path.split(".") if path else []
+    opened = 0  # objects along the path whose remaining members are still unread
+    for depth, key in enumerate(keys):
+        if reader.peek() == "n":
+            break
+        reader.expect("{")
+        if not _skip_to_member(reader, keys[:depth], key, fields):
+            break
+        opened += 1
+    else:
+        if reader.peek() != "n":
+            yield from _iter_array(reader)
+
+    if reader.peek() == "n":
+        reader.value()  # null
+    if fields is not None:
+        for depth in reversed(range(opened)):
+            _skip_to_member(reader, keys[:depth], None, fields)
+
+
+def _iter_array(reader: _JSONReader) -> Iterator[Any]:
+    reader.expect("[")
+    if reader.peek() == "]":
+        reader.pos += 1
+        return
+    while True:
+        yield reader.value()
+        char = reader.peek()
+        reader.pos += 1
+        if char == "]":
+            return
+        if char != ",":
+            raise ValueError(f"Expected ',' or ']' in JSON stream, found {char or 'end of input'!r}")
+
+
+def stream_json_items(
+    url: str,
+    path: str = "",
+    fields: dict | None = None,
+    method: str = "get",
+    chunk_size: int = STREAM_CHUNK_SIZE,
+    **kwargs: Any,
+) -> Iterator[Any]:
+    """Request ``url`` and yield the items of the array at ``path`` while the body downloads.
+
+    Peak memory is one chunk plus one item instead of the whole document. See
+    ``iter_json_items`` for ``path`` and ``fields``.
+
+    Args:
+        url: The URL to request.
+        path: Dotted object path to the array.
+        fields: Filled with the other members along ``path``.
+        method: HTTP method.
+        chunk_size: Bytes read per chunk.
+        **kwargs: Additional arguments passed to request_with_retry().
+
+    Raises:
+        requests.RequestException: If the request fails.
+        ValueError: If the body is not the expected JSON shape.
+    """
+    response = request_with_retry(method, url, stream=True, **kwargs)
+    try:
+        yield from iter_json_items(response.iter_content(chunk_size=chunk_size), path, fields)
+    finally:
+        response.close()
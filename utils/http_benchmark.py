@@ -0,0 +1,150 @@
+"""Measure the latency saved by pooled sessions versus one connection per request.
+
+For each URL, issues ``--requests`` GETs with a fresh connection each time (the
+old ``requests.get`` behaviour) and the same number through ``get_session()``,
+then reports per-request medians and the total saved across all requests. Each
+hourly script runs in its own process, so repeat calls to one host within a
+script are what benefit; pass the URLs a script hits to estimate its run.
+
+``--local`` benchmarks against an in-process HTTP server, with
+``--connect-delay-ms`` simulating the handshake round trips of a remote API.
+
+Usage::
+
+    python -m utils.http_benchmark --requests 20 \\
+        https://ydaemon.yearn.fi/1/vaults/all https://api.morpho.org/graphql
+    python -m utils.http_benchmark --local --connect-delay-ms 60
+"""
+
+import argparse
+import statistics
+import threading
+import time
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+
+from utils.http import get_session
+from utils.logging import get_logger
+
+logger = get_logger("utils.http_benchmark")
+
+
+@dataclass(frozen=True)
+class BenchmarkResult:
+    """Latencies in seconds for one URL."""
+
+    url: str
+    fresh: list[float]
+    pooled: list[float]
+
+    @property
+    def saved_per_request(self) -> float:
+        return statistics.median(self.fresh) - statistics.median(self.pooled)
+
+    @property
+    def saved_total(self) -> float:
+        return sum(self.fresh) - sum(self.pooled)
+
+
+def _timed(fn, url: str, timeout: float) -> float:
+    started = time.perf_counter()
+    fn(url, timeout=timeout).content
+    return time.perf_counter() - started
+
+
+def benchmark_url(url: str, count: int, timeout: float = 30) -> BenchmarkResult:
+    """Time ``count`` fresh-connection GETs and ``count`` pooled GETs of ``url``."""
+    fresh = []
+    for _ in range(count):
+        # A throwaway session per call is what requests.get does internally
+        with requests.Session() as session:
+            fresh.append(_timed(session.get, url, timeout))
+
+    session = get_session("benchmark")
+    session.get(url, timeout=timeout).content  # warm the pool, as the first call in a run would
+    pooled = [_timed(session.get, url, timeout) for _ in range(count)]
+    return BenchmarkResult(url, fresh, pooled)
+
+
+class _SlowAcceptServer(ThreadingHTTPServer):
+    daemon_threads = True
+    connect_delay = 0.0
+
+    def finish_request(self, request, client_address) -> None:
+        time.sleep(self.connect_delay)  # paid once per TCP connection
+        super().finish_request(request, client_address)
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def do_GET(self) -> None:
+        body = b'{"ok": true}'
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args) -> None:
+        pass
+
+
+def start_local_server(connect_delay: float) -> tuple[ThreadingHTTPServer, str]:
+    """Start a keep-alive capable local server; returns it and its URL."""
+    server = _SlowAcceptServer(("127.0.0.1", 0), _Handler)
+    server.connect_delay = connect_delay
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}/"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark pooled HTTP sessions against per-request connections.")
+    parser.add_argument("urls", nargs="*", help="URLs to GET")
+    parser.add_argument("--requests", type=int, default=10, help="Requests per URL and mode")
+    parser.add_argument("--local", action="store_true", help="Benchmark against a local server instead")
+    parser.add_argument("--connect-delay-ms", type=float, default=50.0, help="Simulated handshake cost (--local)")
+    args = parser.parse_args()
+
+    urls = list(args.urls)
+    server = None
+    if args.local:
+        server, url = start_local_server(args.connect_delay_ms / 1000)
+        urls.append(url)
+    if not urls:
+        parser.error("pass at least one URL or --local")
+
+    total_saved = 0.0
+    total_requests = 0
+    for url in urls:
+        try:
+            result = benchmark_url(url, args.requests)
+        except requests.RequestException as e:
+            logger.error("Skipping %s: %s", url, e)
+            continue
+        total_saved += result.saved_total
+        total_requests += len(result.fresh)
+        logger.info(
+            "%s: fresh %.1fms, pooled %.1fms median (%.1fms saved per request)",
+            url,
+            statistics.median(result.fresh) * 1000,
+            statistics.median(result.pooled) * 1000,
+            result.saved_per_request * 1000,
+        )
+
+    if total_requests:
+        logger.info(
+            "Saved %.2fs over %d requests (%.1fms per request)",
+            total_saved,
+            total_requests,
+            total_saved / total_requests * 1000,
+        )
+    if server is not None:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -7,7 +7,7 @@ transactions (timelocks and Safe multisigs).
 
 from dataclasses import dataclass
 
-from utils.calldata.decoder import DecodedCall, decode_calldata
+from utils.calldata.decoder import DecodedCall, decode_calldata, resolve_selectors
 from utils.llm import get_llm_provider
 from utils.llm.base import LLMError
 from utils.logging import get_logger
@@ -39,6 +39,31 @@ DETAIL:
 <your detailed analysis>"""
 
 
+# Precomputed simulations keyed by ``simulation_key``; None means the simulation was unavailable
+Simulations = dict[tuple[str, str, int], SimulationResult | None]
+
+
+def simulation_key(target: str, calldata: str, value: int = 0) -> tuple[str, str, int]:
+    """Key of a call in a ``Simulations`` mapping."""
+    return target.lower(), calldata.lower(), value
+
+
+def _simulate(
+    target: str, calldata: str, chain_id: int, value: int, from_address: str, simulations: Simulations | None
+) -> SimulationResult | None:
+    """Use a precomputed simulation if the caller has one, else simulate now."""
+    key = simulation_key(target, calldata, value)
+    if simulations is not None and key in simulations:
+        return simulations[key]
+    return simulate_transaction(
+        target=target,
+        calldata=calldata,
+        chain_id=chain_id,
+        value=value,
+        from_address=from_address,
+    )
+
+
 @dataclass(frozen=True)
 class Explanation:
     """AI-generated transaction explanation with short and detailed versions."""
@@ -202,6 +227,7 @@ def explain_transaction(
     protocol: str = "",
     label: str = "",
     from_address: str = "0x0000000000000000000000000000000000000000",
+    simulations: Simulations | None = None,
 ) -> Explanation | None:
     """Generate an AI explanation for a governance transaction.
 
@@ -216,6 +242,7 @@ def explain_transaction(
         protocol: Protocol name for context (e.g. "AAVE").
         label: Human-readable label for the contract.
         from_address: Sender address for simulation.
+        simulations: Simulations already run by the caller; calls found here are not simulated again.
 
     Returns:
         Explanation with summary and detail, or None on failure.
@@ -235,13 +262,7 @@ def explain_transaction(
     proxy_upgrade_info = _get_proxy_upgrade_info(calldata, target, chain_id)
 
     # Step 3: Simulate via Tenderly (best-effort)
-    simulation = simulate_transaction(
-        target=target,
-        calldata=calldata,
-        chain_id=chain_id,
-        value=value,
-        from_address=from_address,
-    )
+    simulation = _simulate(target, calldata, chain_id, value, from_address, simulations)
     if simulation:
         logger.info("Simulation completed: success=%s gas=%s", simulation.success, simulation.gas_used)
     else:
@@ -278,6 +299,7 @@ def explain_batch_transaction(
     protocol: str = "",
     label: str = "",
     from_address: str = "0x0000000000000000000000000000000000000000",
+    simulations: Simulations | None = None,
 ) -> Explanation | None:
     """Generate an AI explanation for a batch/multicall governance transaction.
 
@@ -287,6 +309,7 @@ def explain_batch_transaction(
         protocol: Protocol name for context.
         label: Human-readable label for the timelock/safe.
         from_address: Sender address for simulations.
+        simulations: Simulations already run by the caller; calls found here are not simulated again.
 
     Returns:
         Explanation with summary and detail, or None on failure.
@@ -295,7 +318,10 @@ def explain_batch_transaction(
         return None
 
     decoded_calls: list[DecodedCall] = []
-    simulations: list[SimulationResult | None] = []
+    results: list[SimulationResult | None] = []
+
+    # Resolve every inner call's selector in one bulk lookup before decoding
+    resolve_selectors(data[:10] for call in calls if len(data := call.get("data") or "") >= 10)
 
     for call in calls:
         target = call.get("target", "")
@@ -306,20 +332,13 @@ def explain_batch_transaction(
         if decoded:
             decoded_calls.append(decoded)
 
-        sim = simulate_transaction(
-            target=target,
-            calldata=data,
-            chain_id=chain_id,
-            value=value,
-            from_address=from_address,
-        )
-        simulations.append(sim)
+        results.append(_simulate(target, data, chain_id, value, from_address, simulations))
 
     if not decoded_calls:
         return None
 
     # Use the first successful simulation for context, or None
-    simulation = next((s for s in simulations if s is not None), None)
+    simulation = next((s for s in results if s is not None), None)
 
     # Detect proxy upgrades across all calls
     upgrade_parts: list[str] = []
@@ -0,0 +1,212 @@
+"""Durable outbox for alerts that could not be delivered.
+
+When Telegram is unreachable, ``send_or_save`` (and ``send_alert``) stores the
+message in the outbox file (``ALERT_OUTBOX_FILENAME``, default
+``alert-outbox.txt``) instead of dropping it, and ``retry_undelivered`` resends
+it on the next run. Every CI job persists its outbox file and drains it with
+``python -m utils.outbox`` before its monitors start, so monitors can advance
+their own cursors (timestamps, nonces) even when a send fails, and the alert is
+still delivered later (at-least-once).
+
+Entries are stored as ``OUTBOX+<idempotency key>:<base64 JSON>``. Saving the
+same key twice keeps a single entry, so a monitor that re-detects the same
+event does not queue it twice. Retries make one attempt per entry and stop at
+the first failure, so a Telegram outage costs each run one request, not a
+retry loop. Entries older than ``ALERT_OUTBOX_MAX_AGE_HOURS`` or retried
+``ALERT_OUTBOX_MAX_ATTEMPTS`` times are dropped on every drain.
+
+Usage::
+
+    from utils.outbox import send_or_save
+
+    send_or_save(message, PROTOCOL, key=f"timelock+{op_id}")
+    write_last_value_to_file(cache_filename, CACHE_KEY, max_timestamp)
+"""
+
+import base64
+import hashlib
+import json
+import os
+import time
+from dataclasses import asdict, dataclass
+
+from utils import cache
+from utils.config import Config
+from utils.logging import get_logger
+from utils.telegram import TelegramError, send_telegram_message
+
+logger = get_logger("utils.outbox")
+
+OUTBOX_PREFIX = "OUTBOX+"
+outbox_filename: str = os.getenv("ALERT_OUTBOX_FILENAME", "alert-outbox.txt")
+
+# Entries older than this or retried this many times are dropped with an error log
+DEFAULT_MAX_AGE_HOURS = 72
+DEFAULT_MAX_ATTEMPTS = 24
+
+
+@dataclass
+class PendingAlert:
+    """An undelivered Telegram message waiting in the outbox."""
+
+    key: str
+    message: str
+    channel: str
+    silent: bool = False
+    plain_text: bool = False
+    created_at: float = 0.0
+    attempts: int = 0
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "PendingAlert":
+        return cls(**data)
+
+
+def idempotency_key(channel: str, message: str) -> str:
+    """Default key for an alert: a short hash of its channel and text."""
+    return hashlib.sha256(f"{channel}\n{message}".encode()).hexdigest()[:16]
+
+
+def _cache_key(key: str) -> str:
+    # The cache file is key:value per line, so keys must not contain ':' or newlines
+    if ":" in key or "\n" in key:
+        key = hashlib.sha256(key.encode()).hexdigest()[:16]
+    return OUTBOX_PREFIX + key
+
+
+def _encode(alert: PendingAlert) -> str:
+    return base64.urlsafe_b64encode(json.dumps(alert.to_dict()).encode()).decode()
+
+
+def _decode(value: str) -> PendingAlert:
+    return PendingAlert.from_dict(json.loads(base64.urlsafe_b64decode(value)))
+
+
+def save_undelivered(
+    message: str,
+    channel: str,
+    silent: bool = False,
+    plain_text: bool = False,
+    key: str | None = None,
+    filename: str | None = None,
+) -> str:
+    """Store an alert for redelivery on the next run and return its idempotency key.
+
+    Args:
+        message: Telegram message text.
+        channel: Protocol/channel used for routing.
+        silent: Send without notification sound.
+        plain_text: Send without Markdown.
+        key: Idempotency key; defaults to a hash of channel and message.
+        filename: File to store it in (defaults to ``ALERT_OUTBOX_FILENAME``).
+    """
+    key = key or idempotency_key(channel, message)
+    alert = PendingAlert(key, message, channel, silent, plain_text, created_at=time.time())
+    cache.write_last_value_to_file(filename or outbox_filename, _cache_key(key), _encode(alert))
+    logger.warning("Saved undelivered %s alert %s to the outbox", channel, key)
+    return key
+
+
+def pending_alerts(filename: str | None = None) -> list[PendingAlert]:
+    """Return stored alerts, oldest first. Unreadable entries are skipped."""
+    entries = cache.load_cache_entries(filename or outbox_filename, "text")
+    alerts = []
+    for cache_key, value in entries.items():
+        if not cache_key.startswith(OUTBOX_PREFIX):
+            continue
+        try:
+            alerts.append(_decode(value))
+        except (ValueError, TypeError) as e:
+            logger.error("Dropping unreadable outbox entry %s: %s", cache_key, e)
+    return sorted(alerts, key=lambda a: a.created_at)
+
+
+def send_or_save(
+    message: str,
+    channel: str,
+    silent: bool = False,
+    plain_text: bool = False,
+    key: str | None = None,
+    filename: str | None = None,
+) -> bool:
+    """Send a Telegram message, saving it to the outbox if delivery fails.
+
+    Returns:
+        True if delivered now, False if it was saved for the next run.
+    """
+    try:
+        send_telegram_message(message, channel, silent, plain_text)
+        return True
+    except TelegramError as e:
+        logger.error("Failed to send Telegram alert for %s: %s", channel, e)
+        save_undelivered(message, channel, silent, plain_text, key, filename)
+        return False
+
+
+def retry_undelivered(filename: str | None = None) -> int:
+    """Resend stored alerts once each, stopping at the first failure.
+
+    Delivered entries are removed; failed ones keep their place with an increased
+    attempt count. Entries past ``ALERT_OUTBOX_MAX_AGE_HOURS`` or
+    ``ALERT_OUTBOX_MAX_ATTEMPTS`` are dropped, also after a failed send.
+
+    Returns:
+        Number of alerts delivered.
+    """
+    filename = filename or outbox_filename
+    alerts = pending_alerts(filename)
+    if not alerts:
+        return 0
+
+    max_age = Config.get_env_float("ALERT_OUTBOX_MAX_AGE_HOURS", DEFAULT_MAX_AGE_HOURS) * 3600
+    max_attempts = Config.get_env_int("ALERT_OUTBOX_MAX_ATTEMPTS", DEFAULT_MAX_ATTEMPTS)
+    now = time.time()
+    done: set[str] = set()
+    updated: dict[str, PendingAlert] = {}
+    delivered = 0
+    failed = False
+
+    for alert in alerts:
+        if now - alert.created_at > max_age or alert.attempts >= max_attempts:
+            logger.error("Dropping %s alert %s after %d attempts", alert.channel, alert.key, alert.attempts)
+            done.add(alert.key)
+            continue
+        if failed:
+            continue
+        alert.attempts += 1
+        try:
+            send_telegram_message(alert.message, alert.channel, alert.silent, alert.plain_text)
+        except TelegramError as e:
+            logger.warning("Outbox retry failed for %s alert %s: %s", alert.channel, alert.key, e)
+            updated[alert.key] = alert
+            failed = True
+            continue
+        done.add(alert.key)
+        delivered += 1
+
+    entries = cache.load_cache_entries(filename, "text")
+    for key in done:
+        entries.pop(_cache_key(key), None)
+    for key, alert in updated.items():
+        entries[_cache_key(key)] = _encode(alert)
+    cache.save_cache_entries(filename, entries, "text")
+
+    logger.info("Outbox: delivered %d of %d pending alerts", delivered, len(alerts))
+    return delivered
+
+
+def main() -> None:
+    """Drain the outbox before a job's monitors run.
+
+    Alerts saved to the monitor cache file (``CACHE_FILENAME``) by earlier
+    versions are drained as well.
+    """
+    for filename in dict.fromkeys((outbox_filename, cache.cache_filename)):
+        retry_undelivered(filename)
+
+
+if __name__ == "__main__":
+    main()
@@ -5,6 +5,7 @@ Uses dpaste.com with configurable expiry (default 7 days).
 
 import requests
 
+from utils.http import get_session
 from utils.logging import get_logger
 
 logger = get_logger("utils.paste")
@@ -35,7 +36,7 @@ def upload_to_paste(content: str, title: str = "", expiry_days: int = DEFAULT_EX
         payload["title"] = title
 
     try:
-        response = requests.post(DPASTE_API_URL, data=payload, timeout=10)
+        response = get_session().post(DPASTE_API_URL, data=payload, timeout=10)
         response.raise_for_status()
         url = response.text.strip().strip('"')
         logger.info("Uploaded paste to %s (expires in %d days)", url, expiry_days)
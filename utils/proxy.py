@@ -2,8 +2,16 @@
 
 Detects proxy upgrade transactions (EIP-1967) and generates diff links
 to compare old vs new implementation source code on Etherscan.
+
+Implementation slot reads are memoized per (chain, proxy) for the process, so
+the alert builder and the AI explainer share one read. Call
+``prefetch_implementations`` with every upgrade target of a run to read them
+in one JSON-RPC batch per chain up front.
 """
 
+from collections import defaultdict
+from collections.abc import Iterable
+
 from eth_utils import to_checksum_address
 
 from utils.calldata.decoder import decode_calldata
@@ -19,6 +27,10 @@ EIP1967_IMPL_SLOT = 0x360894A13BA1A3210667C828492DB98DCA3E2076CC3735A920A3CA505D
 # Selectors that indicate a proxy upgrade
 _UPGRADE_SELECTORS = frozenset({"0x3659cfe6", "0x4f1ef286"})
 
+# (chain_id, lowercase proxy address) -> current implementation, or None if the slot is empty.
+# Failed reads are not cached.
+_implementation_cache: dict[tuple[int, str], str | None] = {}
+
 
 def detect_proxy_upgrade(data_hex: str) -> str | None:
     """Check if calldata is a proxy upgrade and return the new implementation address.
@@ -49,9 +61,24 @@ def detect_proxy_upgrade(data_hex: str) -> str | None:
     return None
 
 
+def _implementation_from_slot(raw: bytes | str) -> str | None:
+    # get_storage_at returns HexBytes (32 bytes), address is last 20 bytes
+    hex_str = raw.hex() if isinstance(raw, bytes) else str(raw)
+    hex_str = hex_str.replace("0x", "").zfill(64)
+    addr = "0x" + hex_str[-40:]
+
+    # Zero address means no implementation set (not a proxy)
+    if int(addr, 16) == 0:
+        return None
+
+    return to_checksum_address(addr)
+
+
 def get_current_implementation(proxy_address: str, chain_id: int) -> str | None:
     """Read the current implementation address from the EIP-1967 storage slot.
 
+    Results are memoized; see ``prefetch_implementations``.
+
     Args:
         proxy_address: The proxy contract address.
         chain_id: Chain ID to query.
@@ -59,6 +86,10 @@ def get_current_implementation(proxy_address: str, chain_id: int) -> str | None:
     Returns:
         Current implementation address (checksummed), or None on failure.
     """
+    key = (chain_id, proxy_address.lower())
+    if key in _implementation_cache:
+        return _implementation_cache[key]
+
     try:
         chain = Chain.from_chain_id(chain_id)
         from utils.web3_wrapper import ChainManager
@@ -67,21 +98,58 @@ def get_current_implementation(proxy_address: str, chain_id: int) -> str | None:
         from web3 import Web3
 
         raw = client.eth.get_storage_at(Web3.to_checksum_address(proxy_address), EIP1967_IMPL_SLOT)
-
-        # get_storage_at returns HexBytes (32 bytes), address is last 20 bytes
-        hex_str = raw.hex() if isinstance(raw, bytes) else str(raw)
-        hex_str = hex_str.replace("0x", "").zfill(64)
-        addr = "0x" + hex_str[-40:]
-
-        # Zero address means no implementation set (not a proxy)
-        if int(addr, 16) == 0:
-            return None
-
-        return to_checksum_address(addr)
+        implementation = _implementation_from_slot(raw)
     except Exception:
         logger.debug("Failed to read implementation slot for %s on chain %s", proxy_address, chain_id, exc_info=True)
         return None
 
+    _implementation_cache[key] = implementation
+    return implementation
+
+
+def upgrade_targets(calls: Iterable[tuple[str, str, int]]) -> list[tuple[str, int]]:
+    """Return the (proxy, chain_id) pairs of the calls that are proxy upgrades.
+
+    Args:
+        calls: (target, calldata, chain_id) triples.
+    """
+    return [
+        (target, chain_id) for target, data, chain_id in calls if target and chain_id and detect_proxy_upgrade(data)
+    ]
+
+
+def prefetch_implementations(proxies: Iterable[tuple[str, int]]) -> None:
+    """Read the EIP-1967 slot of every uncached (proxy, chain_id) pair, one JSON-RPC batch per chain.
+
+    Results land in the cache used by ``get_current_implementation``. A chain
+    whose batch fails is skipped and its proxies fall back to single reads.
+    """
+    by_chain: dict[int, list[str]] = defaultdict(list)
+    for proxy_address, chain_id in proxies:
+        address = proxy_address.lower()
+        if (chain_id, address) not in _implementation_cache and address not in by_chain[chain_id]:
+            by_chain[chain_id].append(address)
+
+    from web3 import Web3
+
+    from utils.web3_wrapper import ChainManager
+
+    for chain_id, addresses in by_chain.items():
+        if not addresses:
+            continue
+        try:
+            client = ChainManager.get_client(Chain.from_chain_id(chain_id))
+            with client.batch_requests() as batch:
+                for address in addresses:
+                    batch.add(client.eth.get_storage_at(Web3.to_checksum_address(address), EIP1967_IMPL_SLOT))
+                responses = client.execute_batch(batch)
+            for address, raw in zip(addresses, responses, strict=True):
+                _implementation_cache[(chain_id, address)] = _implementation_from_slot(raw)
+        except Exception:
+            logger.warning("Batched implementation lookup failed on chain %s", chain_id, exc_info=True)
+            continue
+        logger.debug("Prefetched %s implementation slots on chain %s", len(addresses), chain_id)
+
 
 def build_diff_url(old_impl: str, new_impl: str, chain_id: int) -> str | None:
     """Build an Etherscan contract diff checker URL.
@@ -0,0 +1,61 @@
+"""Opt-in recording of raw monitor inputs for offline replay.
+
+When ``SNAPSHOT_DIR`` is set, monitors append the data they evaluated each run
+(e.g. Morpho vault allocations, Compound market collateral) to
+``{SNAPSHOT_DIR}/{name}.jsonl.gz``. Each run appends one gzip member holding a
+single JSON line ``{"timestamp": ..., "items": [...]}``; readers stream the
+concatenated members back. ``utils.backtest`` replays these files against
+candidate thresholds.
+
+Recording is best-effort: failures are logged and never break the monitor.
+"""
+
+import gzip
+import json
+import os
+import time
+from typing import Any, Iterator
+
+from dotenv import load_dotenv
+
+from utils.logging import get_logger
+
+load_dotenv()
+
+logger = get_logger("utils.snapshots")
+
+
+def snapshot_path(name: str, directory: str | None = None) -> str:
+    """Return the snapshot file path for ``name`` inside ``directory`` (default ``SNAPSHOT_DIR``)."""
+    return os.path.join(directory or os.getenv("SNAPSHOT_DIR", ""), f"{name}.jsonl.gz")
+
+
+def record_snapshot(name: str, items: list[Any], timestamp: float | None = None) -> None:
+    """Append one snapshot of ``items`` if ``SNAPSHOT_DIR`` is configured."""
+    directory = os.getenv("SNAPSHOT_DIR", "")
+    if not directory:
+        return
+    try:
+        line = json.dumps({"timestamp": time.time() if timestamp is None else timestamp, "items": items})
+        os.makedirs(directory, exist_ok=True)
+        with gzip.open(snapshot_path(name, directory), "at", encoding="utf-8") as f:
+            f.write(line + "\n")
+    except (OSError, TypeError, ValueError) as e:
+        logger.warning("Failed to record %s snapshot: %s", name, e)
+
+
+def load_snapshots(path: str) -> Iterator[tuple[float, list[Any]]]:
+    """Yield ``(timestamp, items)`` for every snapshot in a file, oldest first.
+
+    Accepts both gzip (``.gz``) and plain JSONL files. Malformed lines are skipped.
+    """
+    opener = gzip.open if path.endswith(".gz") else open
+    with opener(path, "rt", encoding="utf-8") as f:
+        for line_no, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            try:
+                snapshot = json.loads(line)
+                yield float(snapshot["timestamp"]), snapshot["items"]
+            except (json.JSONDecodeError, KeyError, TypeError, ValueError) as e:
+                logger.warning("Skipping malformed snapshot %s:%d: %s", path, line_no, e)
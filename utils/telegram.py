@@ -3,6 +3,7 @@ import os
 import requests
 from dotenv import load_dotenv
 
+from utils.http import get_session
 from utils.logging import get_logger
 
 load_dotenv()
@@ -25,9 +26,54 @@ def escape_markdown(text: str) -> str:
 
 
 class TelegramError(Exception):
-    """Exception raised for errors in Telegram API interactions."""
+    """Exception raised for errors in Telegram API interactions.
+
+    Attributes:
+        retry_after: Seconds Telegram asked us to wait before retrying (HTTP 429), else None.
+    """
+
+    def __init__(self, message: str, retry_after: float | None = None) -> None:
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+def resolve_telegram_route(protocol: str) -> tuple[str, str, str | None] | None:
+    """Return ``(bot_token, chat_id, topic_id)`` for a protocol, or None if credentials are missing.
+
+    Protocols with ``TELEGRAM_TOPIC_ID_<PROTOCOL>`` go to the shared topics chat using the
+    default bot; everything else uses the legacy per-protocol chat.
+    """
+    # Check if this protocol has a topic ID configured (forum-style group)
+    topic_id = os.getenv(f"TELEGRAM_TOPIC_ID_{protocol.upper()}")
+
+    if topic_id:
+        # Topics always use the default bot and the shared topics chat
+        bot_token = os.getenv("TELEGRAM_BOT_TOKEN_DEFAULT")
+        chat_id = os.getenv("TELEGRAM_CHAT_ID_TOPICS")
+    else:
+        # Legacy per-protocol chat routing
+        bot_token = os.getenv(f"TELEGRAM_BOT_TOKEN_{protocol.upper()}")
+        if not bot_token:
+            bot_token = os.getenv("TELEGRAM_BOT_TOKEN_DEFAULT")
+        chat_id = os.getenv(f"TELEGRAM_CHAT_ID_{protocol.upper()}")
+
+    if not bot_token or not chat_id:
+        return None
+    return bot_token, chat_id, topic_id or None
 
-    pass
+
+def _retry_after(response: requests.Response | None) -> float | None:
+    """Extract the flood-control wait from a 429 response body or Retry-After header."""
+    if response is None or response.status_code != 429:
+        return None
+    try:
+        return float(response.json()["parameters"]["retry_after"])
+    except (ValueError, KeyError, TypeError):
+        pass
+    try:
+        return float(response.headers.get("Retry-After", ""))
+    except ValueError:
+        return None
 
 
 def send_telegram_message(
@@ -35,6 +81,7 @@ def send_telegram_message(
     protocol: str,
     disable_notification: bool = False,
     plain_text: bool = False,
+    session: requests.Session | None = None,
 ) -> None:
     """
     Send a message to a Telegram chat using a bot.
@@ -43,9 +90,10 @@ def send_telegram_message(
         message: The message to send
         protocol: Protocol identifier used to select bot token and chat ID
         disable_notification: If True, sends the message silently
+        session: Session to send through; defaults to the shared pooled session
 
     Raises:
-        TelegramError: If the message fails to send
+        TelegramError: If the message fails to send. ``retry_after`` is set when rate limited.
     """
     logger.debug("Sending telegram message:\n%s", message)
 
@@ -58,23 +106,11 @@ def send_telegram_message(
         message = message[: MAX_MESSAGE_LENGTH - 3] + "..."
         plain_text = True
 
-    # Check if this protocol has a topic ID configured (forum-style group)
-    topic_id = os.getenv(f"TELEGRAM_TOPIC_ID_{protocol.upper()}")
-
-    if topic_id:
-        # Topics always use the default bot and the shared topics chat
-        bot_token = os.getenv("TELEGRAM_BOT_TOKEN_DEFAULT")
-        chat_id = os.getenv("TELEGRAM_CHAT_ID_TOPICS")
-    else:
-        # Legacy per-protocol chat routing
-        bot_token = os.getenv(f"TELEGRAM_BOT_TOKEN_{protocol.upper()}")
-        if not bot_token:
-            bot_token = os.getenv("TELEGRAM_BOT_TOKEN_DEFAULT")
-        chat_id = os.getenv(f"TELEGRAM_CHAT_ID_{protocol.upper()}")
-
-    if not bot_token or not chat_id:
+    route = resolve_telegram_route(protocol)
+    if route is None:
         logger.warning("Missing Telegram credentials for %s", protocol)
         return
+    bot_token, chat_id, topic_id = route
 
     url = f"https://api.telegram.org/bot{bot_token}/sendMessage"
     payload: dict[str, object] = {
@@ -87,15 +123,44 @@ def send_telegram_message(
         payload["message_thread_id"] = int(topic_id)
 
     try:
-        response = requests.post(url, json=payload, timeout=10)
+        response = (session or get_session()).post(url, json=payload, timeout=10)
         response.raise_for_status()
     except requests.RequestException as e:
-        raise TelegramError(f"Failed to send telegram message: {e}")
+        raise TelegramError(f"Failed to send telegram message: {e}", _retry_after(e.response))
 
     if response.status_code != 200:
         raise TelegramError(f"Failed to send telegram message: {response.status_code} - {response.text}")
 
 
+def chunk_messages(
+    messages: list[str],
+    separator: str = "\n\n---\n\n",
+    max_length: int = MAX_MESSAGE_LENGTH,
+) -> list[str]:
+    """Join messages with ``separator`` into as few chunks of at most ``max_length`` as possible.
+
+    Order is preserved. A single message longer than ``max_length`` becomes its own
+    chunk (``send_telegram_message`` truncates it).
+    """
+    chunks: list[str] = []
+    current_parts: list[str] = []
+    current_len = 0
+
+    for msg in messages:
+        added_len = len(msg) + (len(separator) if current_parts else 0)
+        if current_parts and current_len + added_len > max_length:
+            chunks.append(separator.join(current_parts))
+            current_parts = [msg]
+            current_len = len(msg)
+        else:
+            current_parts.append(msg)
+            current_len += added_len
+
+    if current_parts:
+        chunks.append(separator.join(current_parts))
+    return chunks
+
+
 def get_github_run_url() -> str:
     """Build a GitHub Actions run URL from environment variables, if available."""
     run_url = os.getenv("GITHUB_RUN_URL", "")
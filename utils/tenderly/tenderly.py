@@ -10,9 +10,9 @@ import json
 import os
 from pathlib import Path
 
-import requests
 from dotenv import load_dotenv
 
+from utils.http import get_session
 from utils.logging import get_logger
 
 load_dotenv()
@@ -38,7 +38,7 @@ def get_response_hash(data: dict) -> str:
 def fetch_alerts() -> dict:
     """Fetch alerts from Tenderly API."""
     headers = {"Accept": "application/json", "X-Access-Key": TENDERLY_API_KEY}
-    response = requests.get(TENDERLY_API_URL, headers=headers)
+    response = get_session().get(TENDERLY_API_URL, headers=headers)
     if response.status_code != 200:
         raise Exception(f"Failed to get alerts: {response.status_code} - {response.text}")
     return response.json()
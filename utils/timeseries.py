@@ -0,0 +1,263 @@
+"""Append-only time-series store for metric history.
+
+The key:value cache only keeps the last value of each metric, so monitors can
+compare against the previous run and nothing older. This module keeps a rolling
+window of ``(timestamp, value)`` points per metric in a single binary file so
+checks like "value 24h ago" or "max drawdown over the last day" need no
+external service.
+
+File format: a flat sequence of fixed-width little-endian records::
+
+    | metric key (8 bytes, blake2b of name) | timestamp (float64) | value (float64) |
+
+Records are appended in timestamp order, so reads memory-map the file and
+binary-search the time range before scanning it for the wanted metric.
+Records older than the retention window are dropped by ``compact()``, which
+runs automatically once the oldest record is well past the window.
+
+Usage::
+
+    from utils.timeseries import MetricStore
+
+    store = MetricStore()
+    store.append("3JANE_USD3_PPS", pps)
+    point = store.value_ago("3JANE_USD3_PPS", 24 * 3600)
+    drawdown = store.max_drawdown("3JANE_USD3_TVL", 24 * 3600)
+
+    record_metrics([("3JANE_USD3_PPS", pps)])  # best-effort append from a monitor
+"""
+
+import hashlib
+import mmap
+import os
+import struct
+import time
+from dataclasses import dataclass
+from typing import BinaryIO, Iterable, Iterator
+
+from dotenv import load_dotenv
+
+from utils.logging import get_logger
+
+load_dotenv()
+
+logger = get_logger("utils.timeseries")
+
+# format of the data: fixed-width binary records, see module docstring
+timeseries_filename: str = os.getenv("TIMESERIES_FILENAME", "timeseries.bin")
+
+DEFAULT_RETENTION_DAYS = 30
+
+RECORD = struct.Struct("<8sdd")
+RECORD_SIZE = RECORD.size
+_TIMESTAMP = struct.Struct("<d")
+_TIMESTAMP_OFFSET = 8
+
+# Compact once the oldest record is this far (as a fraction of retention) past the window,
+# so appends don't rewrite the file on every run.
+_COMPACT_SLACK = 0.1
+
+
+@dataclass(frozen=True)
+class MetricPoint:
+    """A single recorded metric value."""
+
+    timestamp: float
+    value: float
+
+
+def metric_key(name: str) -> bytes:
+    """Return the fixed-width 8-byte key stored for a metric name."""
+    return hashlib.blake2b(name.encode("utf-8"), digest_size=8).digest()
+
+
+class MetricStore:
+    """Append-only store of metric points with a rolling retention window."""
+
+    def __init__(self, filename: str | None = None, retention_seconds: float | None = None) -> None:
+        self.filename = filename or timeseries_filename
+        if retention_seconds is None:
+            retention_days = float(os.getenv("TIMESERIES_RETENTION_DAYS", DEFAULT_RETENTION_DAYS))
+            retention_seconds = retention_days * 86400
+        self.retention_seconds = retention_seconds
+
+    # --- writes ---
+
+    def append(self, metric: str, value: float, timestamp: float | None = None) -> None:
+        """Append a single metric point (timestamp defaults to now)."""
+        self.append_many([(metric, value)], timestamp)
+
+    def append_many(self, points: Iterable[tuple[str, float]], timestamp: float | None = None) -> None:
+        """Append several metric points sharing one timestamp in a single write.
+
+        Raises:
+            ValueError: If ``timestamp`` is older than the last stored record, since
+                reads rely on records being in timestamp order.
+        """
+        ts = time.time() if timestamp is None else float(timestamp)
+        last_ts = self._last_timestamp()
+        if last_ts is not None and ts < last_ts:
+            raise ValueError(f"Timestamp {ts} is older than last stored record {last_ts}")
+
+        payload = b"".join(RECORD.pack(metric_key(name), ts, float(value)) for name, value in points)
+        if not payload:
+            return
+        with open(self.filename, "ab") as f:
+            f.write(payload)
+
+        first_ts = self._first_timestamp()
+        if first_ts is not None and first_ts < ts - self.retention_seconds * (1 + _COMPACT_SLACK):
+            self.compact(now=ts)
+
+    def compact(self, now: float | None = None) -> int:
+        """Drop records older than the retention window. Returns the number removed."""
+        if not os.path.exists(self.filename):
+            return 0
+        cutoff = (time.time() if now is None else now) - self.retention_seconds
+        with self._mapped() as mm:
+            total = len(mm) // RECORD_SIZE
+            start = _bisect_timestamp(mm, cutoff, 0, total)
+            if start == 0:
+                return 0
+            kept = mm[start * RECORD_SIZE : total * RECORD_SIZE]
+
+        tmp_filename = f"{self.filename}.tmp"
+        with open(tmp_filename, "wb") as f:
+            f.write(kept)
+        os.replace(tmp_filename, self.filename)
+        logger.info("Compacted %s: removed %d records older than %.0f", self.filename, start, cutoff)
+        return start
+
+    # --- reads ---
+
+    def series(self, metric: str, since: float | None = None, until: float | None = None) -> list[MetricPoint]:
+        """Return all points for a metric with ``since <= timestamp <= until``, oldest first."""
+        return list(self._iter_points(metric, since, until))
+
+    def latest(self, metric: str) -> MetricPoint | None:
+        """Return the most recent point for a metric, or None if it has no history."""
+        return self.value_at(metric, float("inf"))
+
+    def value_at(self, metric: str, timestamp: float) -> MetricPoint | None:
+        """Return the latest point recorded at or before ``timestamp``."""
+        key = metric_key(metric)
+        with self._mapped() as mm:
+            total = len(mm) // RECORD_SIZE
+            end = _bisect_timestamp(mm, timestamp, 0, total, right=True)
+            for i in range(end - 1, -1, -1):
+                record_key, ts, value = RECORD.unpack_from(mm, i * RECORD_SIZE)
+                if record_key == key:
+                    return MetricPoint(ts, value)
+        return None
+
+    def value_ago(self, metric: str, seconds: float, now: float | None = None) -> MetricPoint | None:
+        """Return the point that was current ``seconds`` before now."""
+        return self.value_at(metric, (time.time() if now is None else now) - seconds)
+
+    def max_drawdown(self, metric: str, window_seconds: float, now: float | None = None) -> float:
+        """Return the largest peak-to-trough decline within the window as a fraction (0.0 if none)."""
+        since = (time.time() if now is None else now) - window_seconds
+        peak = 0.0
+        drawdown = 0.0
+        for point in self._iter_points(metric, since, None):
+            if point.value > peak:
+                peak = point.value
+            elif peak > 0:
+                drawdown = max(drawdown, (peak - point.value) / peak)
+        return drawdown
+
+    def read_records(self, since: float | None = None) -> bytes:
+        """Return the raw fixed-width records with ``timestamp >= since`` (all records if None).
+
+        Intended for bulk consumers (e.g. ``utils.anomaly``) that decode many metrics at once.
+        """
+        with self._mapped() as mm:
+            total = len(mm) // RECORD_SIZE
+            start = 0 if since is None else _bisect_timestamp(mm, since, 0, total)
+            return bytes(mm[start * RECORD_SIZE : total * RECORD_SIZE])
+
+    def _iter_points(self, metric: str, since: float | None, until: float | None) -> Iterator[MetricPoint]:
+        key = metric_key(metric)
+        with self._mapped() as mm:
+            total = len(mm) // RECORD_SIZE
+            start = 0 if since is None else _bisect_timestamp(mm, since, 0, total)
+            end = total if until is None else _bisect_timestamp(mm, until, start, total, right=True)
+            view = memoryview(mm)[start * RECORD_SIZE : end * RECORD_SIZE]
+            try:
+                points = [
+                    MetricPoint(ts, value) for record_key, ts, value in RECORD.iter_unpack(view) if record_key == key
+                ]
+            finally:
+                view.release()
+        yield from points
+
+    def _first_timestamp(self) -> float | None:
+        with self._mapped() as mm:
+            if len(mm) < RECORD_SIZE:
+                return None
+            return _read_timestamp(mm, 0)
+
+    def _last_timestamp(self) -> float | None:
+        with self._mapped() as mm:
+            total = len(mm) // RECORD_SIZE
+            if total == 0:
+                return None
+            return _read_timestamp(mm, total - 1)
+
+    def _mapped(self) -> "_MappedFile":
+        return _MappedFile(self.filename)
+
+
+def record_metrics(points: Iterable[tuple[str, float]], filename: str | None = None) -> bool:
+    """Append metric points to the history, logging instead of raising on storage errors.
+
+    Monitors call this after their checks: a full disk or an out-of-order clock
+    should cost the history a point, not the run.
+
+    Returns:
+        True if the points were written.
+    """
+    try:
+        MetricStore(filename).append_many(points)
+        return True
+    except (OSError, ValueError) as e:
+        logger.warning("Failed to record metric history: %s", e)
+        return False
+
+
+class _MappedFile:
+    """Context manager yielding a read-only mmap of a file (empty bytes if missing or empty)."""
+
+    def __init__(self, filename: str) -> None:
+        self.filename = filename
+        self._file: BinaryIO | None = None
+        self._mm: mmap.mmap | None = None
+
+    def __enter__(self) -> mmap.mmap | bytes:
+        if not os.path.exists(self.filename) or os.path.getsize(self.filename) == 0:
+            return b""
+        self._file = open(self.filename, "rb")
+        self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        return self._mm
+
+    def __exit__(self, *exc: object) -> None:
+        if self._mm is not None:
+            self._mm.close()
+        if self._file is not None:
+            self._file.close()
+
+
+def _read_timestamp(buf: mmap.mmap | bytes, index: int) -> float:
+    return _TIMESTAMP.unpack_from(buf, index * RECORD_SIZE + _TIMESTAMP_OFFSET)[0]
+
+
+def _bisect_timestamp(buf: mmap.mmap | bytes, ts: float, lo: int, hi: int, right: bool = False) -> int:
+    """Binary search for the first record with timestamp >= ts (or > ts when ``right``)."""
+    while lo < hi:
+        mid = (lo + hi) // 2
+        mid_ts = _read_timestamp(buf, mid)
+        if mid_ts < ts or (right and mid_ts == ts):
+            lo = mid + 1
+        else:
+            hi = mid
+    return lo
@@ -1,20 +1,22 @@
 #!/usr/bin/env python3
 import argparse
-import json
 import logging
 import os
 import sys
 import time
-import urllib.error
-import urllib.request
-from decimal import Decimal, getcontext
+from collections import defaultdict
+from decimal import ROUND_CEILING, Decimal, getcontext
 
+import requests
 from dotenv import load_dotenv
+from web3 import Web3
 
 from utils.abi import load_abi
 from utils.cache import cache_filename, get_last_value_for_key_from_file, write_last_value_to_file
 from utils.chains import EXPLORER_URLS, Chain
 from utils.defillama import fetch_prices
+from utils.envio import EnvioSelection, build_query
+from utils.graphql import get_envio_client
 from utils.telegram import send_telegram_message
 from utils.web3_wrapper import ChainManager
 
@@ -22,13 +24,16 @@ load_dotenv()
 
 getcontext().prec = 40
 
-ENVIO_GRAPHQL_URL = os.getenv("ENVIO_GRAPHQL_URL")
 DEFAULT_LOG_LEVEL = os.getenv("ALERT_LARGE_FLOWS_LOG_LEVEL", "WARNING")
 IGNORED_FROM_ADDRESS = "0x283132390ea87d6ecc20255b59ba94329ee17961"
 PROTOCOL = "yearn"
-CACHE_KEY_LAST_ALERT_TX = f"{PROTOCOL}_LARGE_FLOW_LAST_TX"
+CACHE_KEY_LAST_ALERT_TX = f"{PROTOCOL}_LARGE_FLOW_LAST_TX"  # legacy, only read before a chain has a high-water mark
+CACHE_KEY_HIGH_WATER_MARK = f"{PROTOCOL}_LARGE_FLOW_HWM_{{chain_id}}"  # value: blockNumber+logIndex
 
 FALLBACK_LARGE_FLOW_RATIO = Decimal("0.1")
+DEFAULT_LIMIT = 100  # deposits and withdrawals per page
+DEFAULT_THRESHOLD_USD = Decimal("1000000")
+DEFAULT_SINCE_SECONDS = 7200  # lookback for chains without a high-water mark
 
 ERC20_ABI = load_abi("common-abi/ERC20.json")
 _total_supply_cache: dict[tuple[int, str], Decimal] = {}
@@ -172,44 +177,27 @@ DEFILLAMA_CHAIN = {
 }
 
 STABLES = {"USDC", "USDT", "DAI", "USDS", "CRVUSD"}
+DEFAULT_CHAIN_IDS = sorted({v["chain_id"] for v in VAULTS.values()})
 
 _price_cache: dict[tuple[int, str], tuple[float, Decimal]] = {}
+# (minimum raw assets to alert, USD price or None when using the supply-ratio fallback)
+RawThreshold = tuple[int, Decimal | None]
 _logger = logging.getLogger("alert_large_flows")
 
 
-def http_json(url: str, method: str = "GET", body: dict | None = None, headers: dict | None = None):
-    _logger.info("http_json %s %s", method, url)
-    data = None
-    req_headers = {"Accept": "application/json"}
-    if headers:
-        req_headers.update(headers)
-    if body is not None:
-        data = json.dumps(body).encode("utf-8")
-        req_headers["Content-Type"] = "application/json"
-    req = urllib.request.Request(url, data=data, headers=req_headers, method=method)
-    with urllib.request.urlopen(req, timeout=30) as resp:
-        payload = json.loads(resp.read().decode("utf-8"))
-        _logger.info("http_json status=%s", resp.status)
-        return payload
-
-
 def gql_request(query: str, variables: dict) -> dict | None:
-    if not ENVIO_GRAPHQL_URL:
-        raise RuntimeError(
-            "ENVIO_GRAPHQL_URL is not set. Set it to the Envio GraphQL endpoint, "
-            "e.g. export ENVIO_GRAPHQL_URL='https://.../graphql'."
-        )
-    _logger.info("gql_request")
-    payload = {"query": query, "variables": variables}
-
     try:
-        return http_json(ENVIO_GRAPHQL_URL, method="POST", body=payload)
-    except urllib.error.HTTPError as exc:
+        return get_envio_client().execute(query, variables)
+    except (requests.RequestException, ValueError) as exc:
+        # The exception text includes the request URL, which holds the Envio key; keep it out of Telegram
+        response = getattr(exc, "response", None)
+        reason = f"HTTP {response.status_code}" if response is not None else type(exc).__name__
         send_telegram_message(
-            f"⚠️ {PROTOCOL} Large Flow Alert: Envio GraphQL error (HTTP {exc.code}). Skipping this run.",
+            f"⚠️ {PROTOCOL} Large Flow Alert: Envio GraphQL error ({reason}). Skipping this run.",
             PROTOCOL,
+            plain_text=True,
         )
-        _logger.error("Envio request failed with HTTP %d", exc.code)
+        _logger.error("Envio request failed: %s", exc)
         return None
 
 
@@ -295,66 +283,208 @@ def get_token_price_usd(chain_id: int, token_address: str, symbol: str) -> Decim
     return price
 
 
-def load_events(limit: int, chain_ids: list[int], since_ts: int | None):
+def _event_filter(chain_id: int, after: tuple[int, int] | None, since_ts: int | None) -> dict:
+    """Hasura filter for a chain's events after a (blockNumber, logIndex) position, or since a timestamp."""
+    where: dict = {"chainId": {"_eq": chain_id}}
+    if after is not None:
+        block_number, log_index = after
+        where["_or"] = [
+            {"blockNumber": {"_gt": block_number}},
+            {"blockNumber": {"_eq": block_number}, "logIndex": {"_gt": log_index}},
+        ]
+    elif since_ts:
+        where["blockTimestamp"] = {"_gte": since_ts}
+    return where
+
+
+FLOW_FIELDS = (
+    "id",
+    "assets",
+    "vaultAddress",
+    "chainId",
+    "blockNumber",
+    "blockTimestamp",
+    "logIndex",
+    "transactionHash",
+    "transactionFrom",
+)
+
+
+def event_selections(
+    limit: int, chain_id: int, after: tuple[int, int] | None, since_ts: int | None
+) -> list[EnvioSelection]:
+    """Selections for up to ``limit`` deposits and withdrawals each on ``chain_id``, oldest first.
+
+    Events are those after the ``after`` (blockNumber, logIndex) position, or with
+    ``blockTimestamp >= since_ts`` when there is no position yet.
+    """
+    where = _event_filter(chain_id, after, since_ts)
+    return [
+        EnvioSelection(alias, entity, where, limit, FLOW_FIELDS, order_by=("blockNumber", "logIndex"))
+        for alias, entity in (("deposits", "Deposit"), ("withdrawals", "Withdraw"))
+    ]
+
+
+def load_events(limit: int, chain_id: int, after: tuple[int, int] | None, since_ts: int | None):
+    """Fetch the ``event_selections`` page from the Envio GraphQL API."""
     _logger.info(
-        "load_events limit=%s chain_ids=%s since_ts=%s",
+        "load_events limit=%s chain_id=%s after=%s since_ts=%s",
         limit,
-        chain_ids,
+        chain_id,
+        after,
         since_ts,
     )
-    query = """
-    query GetRecentFlows($limit: Int!, $chainIds: [Int!]!, $sinceTs: Int) {
-      deposits: Deposit(
-        where: { chainId: { _in: $chainIds }, blockTimestamp: { _gte: $sinceTs } }
-        order_by: { blockTimestamp: desc, blockNumber: desc, logIndex: desc }
-        limit: $limit
-      ) {
-        id
-        assets
-        vaultAddress
-        chainId
-        blockNumber
-        blockTimestamp
-        transactionHash
-        transactionFrom
-      }
-      withdrawals: Withdraw(
-        where: { chainId: { _in: $chainIds }, blockTimestamp: { _gte: $sinceTs } }
-        order_by: { blockTimestamp: desc, blockNumber: desc, logIndex: desc }
-        limit: $limit
-      ) {
-        id
-        assets
-        vaultAddress
-        chainId
-        blockNumber
-        blockTimestamp
-        transactionHash
-        transactionFrom
-      }
-    }
+    return gql_request(*build_query(event_selections(limit, chain_id, after, since_ts), "GetFlows"))
+
+
+def event_position(event: dict) -> tuple[int, int]:
+    return int(event["blockNumber"]), int(event["logIndex"])
+
+
+def merge_page(deposits: list[dict], withdrawals: list[dict], limit: int) -> tuple[list[dict], bool]:
+    """Merge a page of deposits and withdrawals in log order.
+
+    When either list is full, events past its last position may still be unfetched
+    for that type, so the merged page is cut at the earliest last position among
+    the full lists.
+
+    Returns:
+        (events, more): events up to the cut, and whether another page is needed.
     """
-    variables = {"limit": limit, "chainIds": chain_ids, "sinceTs": since_ts or 0}
-    return gql_request(query, variables)
+    for event in deposits:
+        event["type"] = "deposit"
+    for event in withdrawals:
+        event["type"] = "withdraw"
+    events = sorted(deposits + withdrawals, key=event_position)
 
+    full = [page for page in (deposits, withdrawals) if len(page) >= limit]
+    if not full:
+        return events, False
+    boundary = min(event_position(page[-1]) for page in full)
+    return [event for event in events if event_position(event) <= boundary], True
 
-def filter_events_since_last_alert(events: list[dict], use_cache: bool) -> list[dict]:
-    if not use_cache:
-        return events
+
+def get_high_water_mark(chain_id: int) -> tuple[int, int] | None:
+    value = str(get_last_value_for_key_from_file(cache_filename, CACHE_KEY_HIGH_WATER_MARK.format(chain_id=chain_id)))
+    if not value or value == "0":
+        return None
+    block_number, log_index = value.split("+")
+    return int(block_number), int(log_index)
+
+
+def set_high_water_mark(chain_id: int, position: tuple[int, int]) -> None:
+    write_last_value_to_file(
+        cache_filename,
+        CACHE_KEY_HIGH_WATER_MARK.format(chain_id=chain_id),
+        f"{position[0]}+{position[1]}",
+    )
+
+
+def filter_events_since_last_alert(events: list[dict]) -> list[dict]:
+    """Drop events up to the tx alerted by versions that only stored the last alerted tx hash.
+
+    Only used for a chain's first page, before it has a high-water mark.
+    """
     last_alerted_tx = str(get_last_value_for_key_from_file(cache_filename, CACHE_KEY_LAST_ALERT_TX))
     if not last_alerted_tx or last_alerted_tx == "0":
         return events
 
-    events_sorted = sorted(
-        events,
-        key=lambda e: int(e.get("blockNumber", 0)),
-        reverse=True,
-    )
-    for idx, event in enumerate(events_sorted):
-        if event.get("transactionHash") == last_alerted_tx:
-            return events_sorted[:idx]
+    for idx in range(len(events) - 1, -1, -1):
+        if events[idx].get("transactionHash") == last_alerted_tx:
+            return events[idx + 1 :]
+
+    return events
+
+
+def since_timestamp(since_seconds: int) -> int | None:
+    return int(time.time()) - since_seconds if since_seconds else None
+
+
+def process_chain(
+    chain_id: int,
+    limit: int,
+    threshold_usd: Decimal,
+    since_ts: int | None,
+    use_cache: bool,
+    first_page: dict | None = None,
+) -> int:
+    """Page through a chain's unseen deposits and withdrawals and alert on large ones.
+
+    The chain's high-water mark is committed after every page, including pages
+    without alerts, so each run only evaluates events it has not seen.
+    ``first_page`` is an already fetched response for ``event_selections`` at the
+    chain's starting position, e.g. from a combined Envio query.
+
+    Returns:
+        Number of events evaluated.
+    """
+    after = get_high_water_mark(chain_id) if use_cache else None
+    first_run = after is None
+    evaluated = 0
+    thresholds: dict[str, RawThreshold | None] = {}
+    while True:
+        response = first_page if first_page is not None else load_events(limit, chain_id, after, since_ts)
+        first_page = None
+        if response is None or "errors" in response:
+            _logger.warning("no response from load_events or gql errors: %s", (response or {}).get("errors"))
+            return evaluated
+
+        data = response.get("data") or {}
+        events, more = merge_page(data.get("deposits", []), data.get("withdrawals", []), limit)
+        _logger.info("chain %s: fetched %s unseen events", chain_id, len(events))
+        if not events:
+            return evaluated
+
+        to_alert = filter_events_since_last_alert(events) if use_cache and first_run else events
+        first_run = False
+        alert_on_large_flows(to_alert, threshold_usd, thresholds)
+        evaluated += len(to_alert)
+
+        after = event_position(events[-1])
+        if use_cache:
+            set_high_water_mark(chain_id, after)
+        if not more:
+            return evaluated
+
+
+def prefetch_total_supplies(events: list[dict]) -> None:
+    """Pre-fetch totalSupply for every vault that will need the fallback ratio, one batch per chain.
+
+    A vault needs it when it is not a stable and has no fresh price after
+    ``prefetch_prices``. Results populate _total_supply_cache so the event loop
+    doesn't block on RPC; a chain whose batch fails falls back to single calls.
+
+    Args:
+        events: List of deposit/withdraw event dicts.
+    """
+    by_chain: dict[int, dict[str, dict]] = defaultdict(dict)
+    now = time.time()
+    for event in events:
+        vault_address = event["vaultAddress"].lower()
+        vault = VAULTS.get(vault_address)
+        if not vault or vault["symbol"] in STABLES:
+            continue
+        chain_id = vault["chain_id"]
+        cached_price = _price_cache.get((chain_id, vault["token_address"].lower()))
+        if cached_price and now - cached_price[0] < 60:
+            continue
+        if (chain_id, vault_address) not in _total_supply_cache:
+            by_chain[chain_id][vault_address] = vault
 
-    return events_sorted
+    for chain_id, vaults in by_chain.items():
+        try:
+            client = ChainManager.get_client(Chain.from_chain_id(chain_id))
+            with client.batch_requests() as batch:
+                for vault_address in vaults:
+                    contract = client.get_contract(Web3.to_checksum_address(vault_address), ERC20_ABI)
+                    batch.add(contract.functions.totalSupply())
+                responses = client.execute_batch(batch)
+            for (vault_address, vault), total_supply_raw in zip(vaults.items(), responses, strict=True):
+                _total_supply_cache[(chain_id, vault_address)] = format_units(str(total_supply_raw), vault["decimals"])
+        except Exception as exc:
+            _logger.warning("batched totalSupply failed on chain %s: %s", chain_id, exc)
+            continue
+        _logger.info("prefetched %d totalSupply values on chain %s", len(vaults), chain_id)
 
 
 def get_vault_total_supply(chain_id: int, vault_address: str, decimals: int) -> Decimal | None:
@@ -409,68 +539,89 @@ def send_large_flow_alert(
     return tx_hash
 
 
-def alert_on_large_flows(events: list[dict], threshold_usd: Decimal, use_cache: bool):
+def _ceil_units(value: Decimal, decimals: int) -> int:
+    """Smallest raw integer amount whose value in token units is >= ``value``."""
+    return int((value * Decimal(10) ** decimals).to_integral_value(rounding=ROUND_CEILING))
+
+
+def get_raw_threshold(vault_address: str, vault: dict, threshold_usd: Decimal) -> RawThreshold | None:
+    """Raw-unit alert threshold for a vault, derived once from its price or, without one, its total supply.
+
+    Returns:
+        (minimum raw assets, USD price or None for the supply-ratio fallback), or None if
+        neither a price nor a non-zero total supply is available.
+    """
+    decimals = vault["decimals"]
+    price = None
+    if vault["symbol"] in STABLES:
+        price = Decimal("1")
+    else:
+        try:
+            price = get_token_price_usd(vault["chain_id"], vault["token_address"], vault["symbol"])
+        except Exception as exc:
+            _logger.warning("price unavailable for %s on %s: %s", vault["symbol"], vault["chain_id"], exc)
+
+    if price is not None and price > 0:
+        return _ceil_units(threshold_usd / price, decimals), price
+
+    total_supply = get_vault_total_supply(vault["chain_id"], vault_address, decimals)
+    if total_supply is None or total_supply == 0:
+        return None
+    return _ceil_units(total_supply * FALLBACK_LARGE_FLOW_RATIO, decimals), None
+
+
+def alert_on_large_flows(
+    events: list[dict],
+    threshold_usd: Decimal,
+    thresholds: dict[str, RawThreshold | None] | None = None,
+) -> None:
+    """Alert on events worth at least ``threshold_usd`` (or ``FALLBACK_LARGE_FLOW_RATIO`` of supply if unpriced).
+
+    Each vault's threshold is converted to raw asset units once, so events are
+    compared as integers and only alerting events are formatted as Decimal.
+
+    Args:
+        events: Deposit/withdraw events in log order.
+        threshold_usd: Alert threshold in USD.
+        thresholds: Raw thresholds by lowercase vault address, filled as vaults are
+            first seen. Pass the same dict for every page of a run.
+    """
     _logger.info("evaluating %s events", len(events))
-    prefetch_prices(events)
-    events_to_alert = filter_events_since_last_alert(events, use_cache)
-    events_sorted = sorted(
-        events_to_alert,
-        key=lambda e: int(e.get("blockNumber", 0)),
-    )
-    cached_tx_to_write = None
-    for event in events_sorted:
+    if thresholds is None:
+        thresholds = {}
+    unseen = [event for event in events if event["vaultAddress"].lower() not in thresholds]
+    prefetch_prices(unseen)
+    prefetch_total_supplies(unseen)
+    for event in events:
         tx_from = event.get("transactionFrom") or ""
         tx_from = tx_from.lower()
         if tx_from == IGNORED_FROM_ADDRESS:
             _logger.info("skip ignored tx.from %s", tx_from)
             continue
-        vault = VAULTS.get(event["vaultAddress"].lower())
+        vault_address = event["vaultAddress"].lower()
+        vault = VAULTS.get(vault_address)
         if not vault:
             _logger.warning("skip unknown vault %s", event["vaultAddress"])
             continue
-        amount = format_units(event["assets"], vault["decimals"])
-        if vault["symbol"] in STABLES:
-            value = amount
-            if value >= threshold_usd:
-                cached_tx_to_write = send_large_flow_alert(event, vault, amount, value)
-            continue
-
-        price = None
-        try:
-            price = get_token_price_usd(vault["chain_id"], vault["token_address"], vault["symbol"])
-        except Exception as exc:
-            _logger.warning("price unavailable for %s on %s: %s", vault["symbol"], vault["chain_id"], exc)
-
-        if price is not None:
-            value = amount * price
-            if value >= threshold_usd:
-                cached_tx_to_write = send_large_flow_alert(event, vault, amount, value)
+        if vault_address not in thresholds:
+            thresholds[vault_address] = get_raw_threshold(vault_address, vault, threshold_usd)
+        threshold = thresholds[vault_address]
+        if threshold is None:
             continue
 
-        total_supply = get_vault_total_supply(vault["chain_id"], event["vaultAddress"], vault["decimals"])
-        if total_supply is None or total_supply == 0:
-            continue
-        ratio = amount / total_supply
-        ratio_threshold = FALLBACK_LARGE_FLOW_RATIO
-        if ratio >= ratio_threshold:
-            cached_tx_to_write = send_large_flow_alert(
-                event,
-                vault,
-                amount,
-                None,
-            )
-    if use_cache and cached_tx_to_write:
-        write_last_value_to_file(cache_filename, CACHE_KEY_LAST_ALERT_TX, cached_tx_to_write)
+        min_raw, price = threshold
+        if int(event["assets"]) >= min_raw:
+            amount = format_units(event["assets"], vault["decimals"])
+            send_large_flow_alert(event, vault, amount, amount * price if price is not None else None)
 
 
 def main():
     parser = argparse.ArgumentParser(description="Alert on large deposit/withdraw events.")
-    parser.add_argument("--limit", type=int, default=100)
-    parser.add_argument("--threshold-usd", type=Decimal, default=Decimal("1000000"))  # 1M USD
-    parser.add_argument("--since-seconds", type=int, default=7200)  # 2 hours is default
-    default_chain_ids = ",".join(str(c) for c in sorted({v["chain_id"] for v in VAULTS.values()}))
-    parser.add_argument("--chain-ids", type=str, default=default_chain_ids)
-    parser.add_argument("--no-cache", action="store_true", help="Disable caching of last alerted tx")
+    parser.add_argument("--limit", type=int, default=DEFAULT_LIMIT, help="Deposits and withdrawals fetched per page")
+    parser.add_argument("--threshold-usd", type=Decimal, default=DEFAULT_THRESHOLD_USD)
+    parser.add_argument("--since-seconds", type=int, default=DEFAULT_SINCE_SECONDS)
+    parser.add_argument("--chain-ids", type=str, default=",".join(str(c) for c in DEFAULT_CHAIN_IDS))
+    parser.add_argument("--no-cache", action="store_true", help="Disable the per-chain high-water mark")
     parser.add_argument(
         "--log-level",
         type=str,
@@ -491,32 +642,11 @@ def main():
         args.chain_ids,
     )
 
-    since_ts = None
-    if args.since_seconds:
-        since_ts = int(time.time()) - args.since_seconds
-
+    since_ts = since_timestamp(args.since_seconds)
     chain_ids = [int(x.strip()) for x in args.chain_ids.split(",") if x.strip()]
 
-    response = load_events(args.limit, chain_ids, since_ts)
-    if response is None or "errors" in response:
-        _logger.warning("no response from load_events or gql errors: %s", response.get("errors"))
-        return
-
-    data = response.get("data", {})
-    deposits = data.get("deposits", [])
-    withdrawals = data.get("withdrawals", [])
-    _logger.info(
-        "fetched deposits=%s withdrawals=%s",
-        len(deposits),
-        len(withdrawals),
-    )
-
-    for event in deposits:
-        event["type"] = "deposit"
-    for event in withdrawals:
-        event["type"] = "withdraw"
-
-    alert_on_large_flows(deposits + withdrawals, args.threshold_usd, not args.no_cache)
+    for chain_id in chain_ids:
+        process_chain(chain_id, args.limit, args.threshold_usd, since_ts, not args.no_cache)
 
 
 if __name__ == "__main__":
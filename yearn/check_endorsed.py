@@ -13,6 +13,7 @@ from dotenv import load_dotenv
 from web3 import Web3
 
 from utils.chains import Chain
+from utils.http import YDAEMON_CACHE_TTL, cached_get_json
 from utils.logging import get_logger
 from utils.telegram import send_telegram_message_with_fallback
 from utils.web3_wrapper import ChainManager
@@ -50,9 +51,7 @@ def fetch_ydaemon_vaults(chain: Chain) -> List[str]:
         List of vault addresses.
     """
     url = f"{YDAEMON_BASE_URL}?{YDAEMON_PARAMS}&chainIDs={chain.chain_id}"
-    response = requests.get(url, timeout=30)
-    response.raise_for_status()
-    vaults = response.json()
+    vaults = cached_get_json(url, YDAEMON_CACHE_TTL, timeout=30)
     return [vault["address"].lower() for vault in vaults if "address" in vault]
 
 
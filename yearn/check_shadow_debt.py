@@ -23,6 +23,7 @@ from web3 import Web3
 
 from utils.abi import load_abi
 from utils.chains import Chain
+from utils.http import YDAEMON_CACHE_TTL, cached_get_json
 from utils.logging import get_logger
 from utils.telegram import send_telegram_message_with_fallback
 from utils.web3_wrapper import ChainManager
@@ -96,9 +97,7 @@ def fetch_ydaemon_vaults(chain: Chain) -> List[Dict]:
     """
     url = f"{YDAEMON_BASE_URL}?{YDAEMON_PARAMS}&chainIDs={chain.chain_id}"
     logger.info("Fetching vaults from yDaemon for %s", chain.name)
-    response = requests.get(url, timeout=30)
-    response.raise_for_status()
-    vaults = response.json()
+    vaults = cached_get_json(url, YDAEMON_CACHE_TTL, timeout=30)
 
     result = []
     for vault in vaults:
@@ -8,17 +8,17 @@ while keeping visibility into long-running issues.
 """
 
 import argparse
-import json
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
-from pathlib import Path
 from typing import Dict, List, Optional
 
 import requests
 from dotenv import load_dotenv
 from web3 import Web3
 
+from utils.cache import StateStore
 from utils.chains import Chain
+from utils.http import YDAEMON_CACHE_TTL, cached_get_json
 from utils.logging import get_logger
 from utils.telegram import send_telegram_message_with_fallback
 from utils.web3_wrapper import ChainManager
@@ -86,7 +86,6 @@ class TriggerState:
 
     triggered: bool
     first_seen: datetime
-    last_checked: datetime
     alerted_thresholds: List[int] = field(default_factory=list)
 
     def to_dict(self) -> dict:
@@ -94,7 +93,6 @@ class TriggerState:
         return {
             "triggered": self.triggered,
             "first_seen": self.first_seen.isoformat(),
-            "last_checked": self.last_checked.isoformat(),
             "alerted_thresholds": self.alerted_thresholds,
         }
 
@@ -104,7 +102,6 @@ class TriggerState:
         return cls(
             triggered=data["triggered"],
             first_seen=datetime.fromisoformat(data["first_seen"]),
-            last_checked=datetime.fromisoformat(data["last_checked"]),
             alerted_thresholds=data.get("alerted_thresholds", []),
         )
 
@@ -132,9 +129,7 @@ def fetch_ydaemon_vaults(chain: Chain) -> List[dict]:
         List of vault objects with addresses and strategies.
     """
     url = f"{YDAEMON_BASE_URL}?{YDAEMON_PARAMS}&chainIDs={chain.chain_id}"
-    response = requests.get(url, timeout=30)
-    response.raise_for_status()
-    return response.json()
+    return cached_get_json(url, YDAEMON_CACHE_TTL, timeout=30)
 
 
 def extract_strategies_from_vaults(vaults: List[dict]) -> List[str]:
@@ -220,36 +215,44 @@ def check_triggers_for_chain(
     return results
 
 
-def load_trigger_cache(cache_file: Path) -> Dict[str, TriggerState]:
-    """Load trigger state cache from JSON file.
+def load_trigger_cache(store: StateStore) -> Dict[str, TriggerState]:
+    """Load trigger states from the state store.
 
     Args:
-        cache_file: Path to the cache file.
+        store: State store backed by the trigger cache file.
 
     Returns:
         Dictionary mapping "{chain_id}_{trigger_key}" to TriggerState.
     """
-    if not cache_file.exists():
-        return {}
+    cache = {}
+    for key, value in store.items():
+        try:
+            cache[key] = TriggerState.from_dict(value)
+        except (KeyError, TypeError, ValueError) as e:
+            logger.warning("Dropping unreadable trigger state %s: %s", key, e)
+            store.delete(key)
+    return cache
 
-    try:
-        with open(cache_file, "r") as f:
-            data = json.load(f)
-            return {key: TriggerState.from_dict(value) for key, value in data.items()}
-    except (json.JSONDecodeError, KeyError, ValueError) as e:
-        logger.warning("Failed to load cache file: %s. Starting fresh.", e)
-        return {}
 
+def save_trigger_cache(store: StateStore, cache: Dict[str, TriggerState]) -> int:
+    """Write changed trigger states to the state store.
 
-def save_trigger_cache(cache_file: Path, cache: Dict[str, TriggerState]) -> None:
-    """Save trigger state cache to JSON file.
+    Only keys whose state changed since load (new, updated or cleared triggers)
+    are written; unchanged triggers are not re-serialized to disk.
 
     Args:
-        cache_file: Path to the cache file.
+        store: State store backed by the trigger cache file.
         cache: Dictionary mapping trigger keys to TriggerState.
+
+    Returns:
+        Number of trigger keys written.
     """
-    with open(cache_file, "w") as f:
-        json.dump({key: value.to_dict() for key, value in cache.items()}, f, indent=2)
+    for key in store.keys():
+        if key not in cache:
+            store.delete(key)
+    for key, state in cache.items():
+        store.set_record(key, state)
+    return store.flush()
 
 
 def update_cache_with_current_state(
@@ -270,13 +273,10 @@ def update_cache_with_current_state(
         cache_key = f"{chain.chain_id}_{trigger_key}"
 
         if triggered:
-            # Trigger is true
-            if cache_key in cache and cache[cache_key].triggered:
-                # Already was triggered, just update last_checked
-                cache[cache_key].last_checked = now
-            else:
+            # Trigger is true; an already triggered key is left as is so its record stays clean
+            if cache_key not in cache or not cache[cache_key].triggered:
                 # Newly triggered, record first_seen
-                cache[cache_key] = TriggerState(triggered=True, first_seen=now, last_checked=now)
+                cache[cache_key] = TriggerState(triggered=True, first_seen=now)
         else:
             # Trigger is false, remove from cache if it exists
             if cache_key in cache:
@@ -472,14 +472,14 @@ def main() -> None:
     if args.include_strategies:
         standalone_strategies = [addr.strip().lower() for addr in args.include_strategies.split(",")]
 
-    cache_file = Path(args.cache_file)
     now = datetime.now(timezone.utc)
 
     thresholds_str = ", ".join(format_threshold_label(t) for t in ESCALATION_THRESHOLDS_HOURS)
     logger.info("Starting TKS trigger monitoring (escalation thresholds: %s)", thresholds_str)
 
     # Load existing cache
-    cache = load_trigger_cache(cache_file)
+    store = StateStore(args.cache_file)
+    cache = load_trigger_cache(store)
     logger.info("Loaded %d cached trigger states", len(cache))
 
     # Check each chain
@@ -526,8 +526,8 @@ def main() -> None:
     logger.info("Found %d triggers crossing new thresholds", len(stuck_triggers))
 
     # Save updated cache (includes newly marked alerted_thresholds)
-    save_trigger_cache(cache_file, cache)
-    logger.info("Saved %d trigger states to cache", len(cache))
+    written = save_trigger_cache(store, cache)
+    logger.info("Saved %d trigger states to cache (%d changed)", len(cache), written)
 
     if not stuck_triggers:
         logger.info("No new threshold crossings, no alert needed")